@@ -16,7 +16,10 @@
 import time
 
 from tempest import clients
+from tempest.common import cleanup
+from tempest.common import server_pool
 from tempest.common.utils import data_utils
+from tempest.common import waiters
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import log as logging
@@ -49,6 +52,7 @@ class BaseComputeTest(tempest.test.BaseTestCase):
         cls.image_ssh_user = CONF.compute.image_ssh_user
         cls.image_ssh_password = CONF.compute.image_ssh_password
         cls.servers = []
+        cls.leased_servers = []
         cls.images = []
         cls.multi_user = cls.get_multi_user()
 
@@ -76,18 +80,35 @@ class BaseComputeTest(tempest.test.BaseTestCase):
         return multi_user
 
     @classmethod
-    def clear_servers(cls):
+    def delete_servers(cls):
+        """
+        Deletes the servers of the class and returns a cleanup step waiting
+        for them to be gone.
+        """
         for server in cls.servers:
             try:
                 cls.servers_client.delete_server(server['id'])
             except Exception:
                 pass
+        return cleanup.wait_for_deletions(
+            cls.servers_client.wait_for_server_termination,
+            [server['id'] for server in cls.servers], 'server')
 
-        for server in cls.servers:
+    @classmethod
+    def clear_servers(cls):
+        return cls.delete_servers()()
+
+    @classmethod
+    def release_servers(cls):
+        if not cls.leased_servers:
+            return
+        pool = server_pool.get_pool(cls.servers_client)
+        for server_id in cls.leased_servers:
             try:
-                cls.servers_client.wait_for_server_termination(server['id'])
+                pool.release(server_id)
             except Exception:
-                pass
+                LOG.exception('Failed to release server %s' % server_id)
+        cls.leased_servers = []
 
     @classmethod
     def clear_images(cls):
@@ -104,13 +125,40 @@ class BaseComputeTest(tempest.test.BaseTestCase):
     @classmethod
     def tearDownClass(cls):
         cls.clear_images()
-        cls.clear_servers()
-        cls.clear_isolated_creds()
+        cls.release_servers()
+        # NOTE: the isolated network can only be deleted once the servers
+        # are gone
+        cleanup.submit(cls.__name__, cls.delete_servers(),
+                       cls.clear_isolated_creds)
         super(BaseComputeTest, cls).tearDownClass()
 
     @classmethod
-    def create_test_server(cls, **kwargs):
-        """Wrapper utility that returns a test server."""
+    def _can_lease_server(cls, kwargs):
+        # NOTE: isolated tenants only live as long as their class, so their
+        # servers can not be pooled
+        if (CONF.compute.server_pool_size <= 0 or
+                CONF.compute.allow_tenant_isolation or
+                cls.force_tenant_isolation):
+            return False
+        if kwargs.get('wait_until', 'ACTIVE') != 'ACTIVE':
+            return False
+        return set(kwargs) <= set(['flavor', 'image_id', 'wait_until'])
+
+    @classmethod
+    def create_test_server(cls, readonly=False, **kwargs):
+        """
+        Wrapper utility that returns a test server.
+
+        Tests which only read the server may pass readonly=True to lease an
+        ACTIVE server from the server pool instead of booting one.
+        """
+        if readonly and cls._can_lease_server(kwargs):
+            pool = server_pool.get_pool(cls.servers_client)
+            leased = pool.lease(kwargs.get('flavor', cls.flavor_ref),
+                                kwargs.get('image_id', cls.image_ref))
+            if leased is not None:
+                cls.leased_servers.append(leased[1]['id'])
+                return leased
         name = data_utils.rand_name(cls.__name__ + "-instance")
         if 'name' in kwargs:
             name = kwargs.pop('name')
@@ -146,6 +194,39 @@ class BaseComputeTest(tempest.test.BaseTestCase):
 
         return resp, body
 
+    @classmethod
+    def create_test_servers(cls, count, **kwargs):
+        """
+        Creates count servers with a single multi-create request and returns
+        them sorted by name. If wait_until is given, the servers are waited
+        for as a group.
+        """
+        name = kwargs.pop('name',
+                          data_utils.rand_name(cls.__name__ + "-instance"))
+        flavor = kwargs.pop('flavor', cls.flavor_ref)
+        image_id = kwargs.pop('image_id', cls.image_ref)
+        wait_until = kwargs.pop('wait_until', None)
+
+        cls.servers_client.create_server(name, image_id, flavor,
+                                         min_count=count, max_count=count,
+                                         **kwargs)
+        # NOTE: nova derives the name of every server from the requested
+        # one, and filters the servers on a regular expression of the name
+        resp, body = cls.servers_client.list_servers({'name': name})
+        servers = sorted(body['servers'], key=lambda s: s['name'])
+        cls.servers.extend(servers)
+        if len(servers) != count:
+            raise exceptions.TempestException(
+                "Found %d servers named %s instead of the %d requested" %
+                (len(servers), name, count))
+
+        server_ids = [s['id'] for s in servers]
+        if wait_until:
+            waiters.wait_for_servers_status(cls.servers_client, server_ids,
+                                            wait_until)
+        return [cls.servers_client.get_server(server_id)[1]
+                for server_id in server_ids]
+
     def wait_for(self, condition):
         """Repeatedly calls condition() until a timeout."""
         start_time = int(time.time())
@@ -37,11 +37,8 @@ class ListImageFiltersTestJSON(base.BaseV2ComputeTest):
         cls.image_ids = []
 
         try:
-            resp, cls.server1 = cls.create_test_server()
-            resp, cls.server2 = cls.create_test_server(wait_until='ACTIVE')
-            # NOTE(sdague) this is faster than doing the sync wait_util on both
-            cls.servers_client.wait_for_server_status(cls.server1['id'],
-                                                      'ACTIVE')
+            cls.server1, cls.server2 = cls.create_test_servers(
+                2, wait_until='ACTIVE')
 
             # Create images to be used in the filter tests
             resp, cls.image1 = cls.create_image_from_server(
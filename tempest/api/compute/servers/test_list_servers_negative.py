@@ -33,12 +33,9 @@ class ListServersNegativeTestJSON(base.BaseV2ComputeTest):
         # by the test methods in this class. These
         # servers are cleaned up automatically in the
         # tearDownClass method of the super-class.
-        cls.existing_fixtures = []
         cls.deleted_fixtures = []
         cls.start_time = datetime.datetime.utcnow()
-        for x in xrange(2):
-            resp, srv = cls.create_test_server()
-            cls.existing_fixtures.append(srv)
+        cls.existing_fixtures = cls.create_test_servers(2)
 
         resp, srv = cls.create_test_server()
         cls.client.delete_server(srv['id'])
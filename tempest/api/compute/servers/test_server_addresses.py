@@ -27,7 +27,8 @@ class ServerAddressesTestJSON(base.BaseV2ComputeTest):
         super(ServerAddressesTestJSON, cls).setUpClass()
         cls.client = cls.servers_client
 
-        resp, cls.server = cls.create_test_server(wait_until='ACTIVE')
+        resp, cls.server = cls.create_test_server(readonly=True,
+                                                  wait_until='ACTIVE')
 
     @test.attr(type='smoke')
     def test_list_server_addresses(self):
@@ -27,7 +27,8 @@ class ServerAddressesNegativeTestJSON(base.BaseV2ComputeTest):
         super(ServerAddressesNegativeTestJSON, cls).setUpClass()
         cls.client = cls.servers_client
 
-        resp, cls.server = cls.create_test_server(wait_until='ACTIVE')
+        resp, cls.server = cls.create_test_server(readonly=True,
+                                                  wait_until='ACTIVE')
 
     @test.attr(type=['negative', 'gate'])
     def test_list_server_addresses_invalid_server_id(self):
@@ -31,7 +31,8 @@ class VirtualInterfacesTestJSON(base.BaseV2ComputeTest):
         cls.set_network_resources(network=True, subnet=True)
         super(VirtualInterfacesTestJSON, cls).setUpClass()
         cls.client = cls.servers_client
-        resp, server = cls.create_test_server(wait_until='ACTIVE')
+        resp, server = cls.create_test_server(readonly=True,
+                                              wait_until='ACTIVE')
         cls.server_id = server['id']
 
     @test.skip_because(bug="1183436",
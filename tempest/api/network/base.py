@@ -16,6 +16,7 @@
 import netaddr
 
 from tempest import clients
+from tempest.common import cleanup
 from tempest.common.utils import data_utils
 from tempest import config
 from tempest import exceptions
@@ -78,6 +79,12 @@ class BaseNetworkTest(tempest.test.BaseTestCase):
 
     @classmethod
     def tearDownClass(cls):
+        cleanup.submit(cls.__name__, cls.clear_network_resources,
+                       cls.clear_isolated_creds)
+        super(BaseNetworkTest, cls).tearDownClass()
+
+    @classmethod
+    def clear_network_resources(cls):
         # Clean up ike policies
         for ikepolicy in cls.ikepolicies:
             cls.client.delete_ikepolicy(ikepolicy['id'])
@@ -116,8 +123,6 @@ class BaseNetworkTest(tempest.test.BaseTestCase):
         # Clean up networks
         for network in cls.networks:
             cls.client.delete_network(network['id'])
-        cls.clear_isolated_creds()
-        super(BaseNetworkTest, cls).tearDownClass()
 
     @classmethod
     def create_network(cls, network_name=None):
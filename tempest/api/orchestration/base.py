@@ -11,6 +11,7 @@
 #    under the License.
 
 from tempest import clients
+from tempest.common import cleanup
 from tempest.common.utils import data_utils
 from tempest import config
 from tempest.openstack.common import log as logging
@@ -69,19 +70,25 @@ class BaseOrchestrationTest(tempest.test.BaseTestCase):
         return stack_identifier
 
     @classmethod
-    def clear_stacks(cls):
+    def delete_stacks(cls):
+        """
+        Deletes the stacks of the class and returns a cleanup step waiting
+        for their deletion to complete.
+        """
         for stack_identifier in cls.stacks:
             try:
                 cls.orchestration_client.delete_stack(stack_identifier)
             except Exception:
                 pass
 
-        for stack_identifier in cls.stacks:
-            try:
-                cls.orchestration_client.wait_for_stack_status(
-                    stack_identifier, 'DELETE_COMPLETE')
-            except Exception:
-                pass
+        def wait(stack_identifier):
+            cls.orchestration_client.wait_for_stack_events(
+                stack_identifier, 'DELETE_COMPLETE')
+        return cleanup.wait_for_deletions(wait, cls.stacks, 'stack')
+
+    @classmethod
+    def clear_stacks(cls):
+        return cls.delete_stacks()()
 
     @classmethod
     def _create_keypair(cls, name_start='keypair-heat-'):
@@ -100,8 +107,8 @@ class BaseOrchestrationTest(tempest.test.BaseTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.clear_stacks()
-        cls.clear_keypairs()
+        # NOTE: the keypairs are used by the servers of the stacks
+        cleanup.submit(cls.__name__, cls.delete_stacks(), cls.clear_keypairs)
         super(BaseOrchestrationTest, cls).tearDownClass()
 
     @staticmethod
@@ -116,7 +116,8 @@ Resources:
                 'ExternalRouterId': cls.external_router_id
             })
         cls.stack_id = cls.stack_identifier.split('/')[1]
-        cls.client.wait_for_stack_status(cls.stack_id, 'CREATE_COMPLETE')
+        cls.client.wait_for_stack_events(cls.stack_identifier,
+                                         'CREATE_COMPLETE')
         _, resources = cls.client.list_resources(cls.stack_identifier)
         cls.test_resources = {}
         for resource in resources:
@@ -74,7 +74,8 @@ Outputs:
         cls.stack_id = cls.stack_identifier.split('/')[1]
         cls.resource_name = 'fluffy'
         cls.resource_type = 'AWS::AutoScaling::LaunchConfiguration'
-        cls.client.wait_for_stack_status(cls.stack_id, 'CREATE_COMPLETE')
+        cls.client.wait_for_stack_events(cls.stack_identifier,
+                                         'CREATE_COMPLETE')
 
     def assert_fields_in_dict(self, obj, *fields):
         for field in fields:
@@ -112,14 +113,16 @@ Outputs:
     @attr(type='gate')
     def test_suspend_resume_stack(self):
         """suspend and resume a stack."""
+        watcher = self.client.watch_stack_events(self.stack_identifier)
         resp, suspend_stack = self.client.suspend_stack(self.stack_identifier)
         self.assertEqual('200', resp['status'])
-        self.client.wait_for_stack_status(self.stack_identifier,
-                                          'SUSPEND_COMPLETE')
+        self.client.wait_for_stack_events(self.stack_identifier,
+                                          'SUSPEND_COMPLETE', watcher=watcher)
+        watcher = self.client.watch_stack_events(self.stack_identifier)
         resp, resume_stack = self.client.resume_stack(self.stack_identifier)
         self.assertEqual('200', resp['status'])
-        self.client.wait_for_stack_status(self.stack_identifier,
-                                          'RESUME_COMPLETE')
+        self.client.wait_for_stack_events(self.stack_identifier,
+                                          'RESUME_COMPLETE', watcher=watcher)
 
     @attr(type='gate')
     def test_list_resources(self):
@@ -176,7 +176,7 @@ Outputs:
         sid = self.stack_identifier
 
         # wait for create to complete.
-        self.client.wait_for_stack_status(sid, 'CREATE_COMPLETE')
+        self.client.wait_for_stack_events(sid, 'CREATE_COMPLETE')
 
         # fetch the stack
         resp, body = self.client.get_stack(sid)
@@ -45,7 +45,7 @@ class StacksTestJSON(base.BaseOrchestrationTest):
         stack_id = stack_identifier.split('/')[1]
 
         # wait for create complete (with no resources it should be instant)
-        self.client.wait_for_stack_status(stack_identifier, 'CREATE_COMPLETE')
+        self.client.wait_for_stack_events(stack_identifier, 'CREATE_COMPLETE')
 
         # check for stack in list
         resp, stacks = self.client.list_stacks()
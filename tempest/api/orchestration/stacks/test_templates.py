@@ -35,7 +35,7 @@ Resources:
         cls.client = cls.orchestration_client
         cls.stack_name = data_utils.rand_name('heat')
         cls.stack_identifier = cls.create_stack(cls.stack_name, cls.template)
-        cls.client.wait_for_stack_status(cls.stack_identifier,
+        cls.client.wait_for_stack_events(cls.stack_identifier,
                                          'CREATE_COMPLETE')
         cls.stack_id = cls.stack_identifier.split('/')[1]
         cls.parameters = {}
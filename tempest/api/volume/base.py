@@ -14,6 +14,7 @@
 #    under the License.
 
 from tempest import clients
+from tempest.common import cleanup
 from tempest.common.utils import data_utils
 from tempest import config
 from tempest.openstack.common import log as logging
@@ -49,9 +50,9 @@ class BaseVolumeTest(tempest.test.BaseTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.clear_snapshots()
-        cls.clear_volumes()
-        cls.clear_isolated_creds()
+        # NOTE: volumes can only be deleted once their snapshots are gone
+        cleanup.submit(cls.__name__, cls.delete_snapshots(),
+                       cls.clear_volumes, cls.clear_isolated_creds)
         super(BaseVolumeTest, cls).tearDownClass()
 
     @classmethod
@@ -87,26 +88,28 @@ class BaseVolumeTest(tempest.test.BaseTestCase):
                 cls.volumes_client.delete_volume(volume['id'])
             except Exception:
                 pass
-
-        for volume in cls.volumes:
-            try:
-                cls.volumes_client.wait_for_resource_deletion(volume['id'])
-            except Exception:
-                pass
+        return cleanup.wait_for_deletions(
+            cls.volumes_client.wait_for_resource_deletion,
+            [volume['id'] for volume in cls.volumes], 'volume')()
 
     @classmethod
-    def clear_snapshots(cls):
+    def delete_snapshots(cls):
+        """
+        Deletes the snapshots of the class and returns a cleanup step
+        waiting for them to be gone.
+        """
         for snapshot in cls.snapshots:
             try:
                 cls.snapshots_client.delete_snapshot(snapshot['id'])
             except Exception:
                 pass
+        return cleanup.wait_for_deletions(
+            cls.snapshots_client.wait_for_resource_deletion,
+            [snapshot['id'] for snapshot in cls.snapshots], 'snapshot')
 
-        for snapshot in cls.snapshots:
-            try:
-                cls.snapshots_client.wait_for_resource_deletion(snapshot['id'])
-            except Exception:
-                pass
+    @classmethod
+    def clear_snapshots(cls):
+        return cls.delete_snapshots()()
 
 
 class BaseVolumeV1Test(BaseVolumeTest):
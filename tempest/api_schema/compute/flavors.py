@@ -0,0 +1,76 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+from tempest.api_schema.compute import parameter_types
+
+flavor_detail = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': ['integer', 'string']},
+        'name': {'type': 'string'},
+        'ram': {'type': 'integer'},
+        'vcpus': {'type': 'integer'},
+        'disk': {'type': 'integer'},
+        # NOTE: swap is an empty string if the flavor has no swap
+        'swap': {'type': ['integer', 'string']},
+        'rxtx_factor': {'type': 'number'},
+        'links': parameter_types.links
+    },
+    'required': ['id', 'name', 'ram', 'vcpus', 'disk', 'links']
+}
+
+list_flavors = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'flavors': {
+                'type': 'array',
+                'items': parameter_types.list_item
+            },
+            'flavors_links': parameter_types.links
+        },
+        'required': ['flavors']
+    }
+}
+
+list_flavors_details = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'flavors': {
+                'type': 'array',
+                'items': flavor_detail
+            },
+            'flavors_links': parameter_types.links
+        },
+        'required': ['flavors']
+    }
+}
+
+get_flavor = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'flavor': flavor_detail
+        },
+        'required': ['flavor']
+    }
+}
+
+create_flavor = get_flavor
@@ -0,0 +1,97 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+from tempest.api_schema.compute import parameter_types
+
+# NOTE: glance allows images without a name, which nova returns as null
+image_name = {'type': ['string', 'null']}
+
+image_list_item = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string'},
+        'name': image_name,
+        'links': parameter_types.links
+    },
+    'required': ['id', 'name', 'links']
+}
+
+image_detail = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string'},
+        'name': image_name,
+        'status': {'type': 'string'},
+        'progress': {'type': 'integer'},
+        'minDisk': {'type': 'integer'},
+        'minRam': {'type': 'integer'},
+        'metadata': {'type': 'object'},
+        'created': {'type': 'string'},
+        'updated': {'type': 'string'},
+        'links': parameter_types.links
+    },
+    'required': ['id', 'name', 'status', 'minDisk', 'minRam', 'metadata',
+                 'created', 'updated', 'links']
+}
+
+list_images = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'images': {
+                'type': 'array',
+                'items': image_list_item
+            },
+            'images_links': parameter_types.links
+        },
+        'required': ['images']
+    }
+}
+
+list_images_details = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'images': {
+                'type': 'array',
+                'items': image_detail
+            },
+            'images_links': parameter_types.links
+        },
+        'required': ['images']
+    }
+}
+
+get_image = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'image': image_detail
+        },
+        'required': ['image']
+    }
+}
+
+create_image = {
+    'status_code': [202]
+}
+
+delete_image = {
+    'status_code': [204]
+}
@@ -0,0 +1,48 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+links = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'href': {'type': 'string'},
+            'rel': {'type': 'string'}
+        },
+        'required': ['href', 'rel']
+    }
+}
+
+# A resource reference with an id and links, e.g. the flavor of a server
+resource_ref = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': ['integer', 'string']},
+        'links': links
+    },
+    'required': ['id', 'links']
+}
+
+# The minimal representation of a resource in a list
+list_item = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': ['integer', 'string']},
+        'name': {'type': 'string'},
+        'links': links
+    },
+    'required': ['id', 'name', 'links']
+}
@@ -0,0 +1,105 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+from tempest.api_schema.compute import parameter_types
+
+server_detail = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string'},
+        'name': {'type': 'string'},
+        'status': {'type': 'string'},
+        # NOTE: image is an empty string for servers booted from volume
+        'image': {'type': ['object', 'string']},
+        'flavor': parameter_types.resource_ref,
+        'addresses': {'type': 'object'},
+        'metadata': {'type': 'object'},
+        'links': parameter_types.links,
+        'tenant_id': {'type': 'string'},
+        'user_id': {'type': 'string'},
+        'hostId': {'type': 'string'},
+        'created': {'type': 'string'},
+        'updated': {'type': 'string'}
+    },
+    'required': ['id', 'name', 'status', 'image', 'flavor', 'addresses',
+                 'metadata', 'links', 'tenant_id', 'user_id', 'hostId',
+                 'created', 'updated']
+}
+
+create_server = {
+    'status_code': [202],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'server': {
+                'type': 'object',
+                'properties': {
+                    'id': {'type': 'string'},
+                    'links': parameter_types.links
+                },
+                'required': ['id', 'links']
+            },
+            # NOTE: returned instead of server if return_reservation_id
+            # was requested
+            'reservation_id': {'type': 'string'}
+        }
+    }
+}
+
+get_server = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'server': server_detail
+        },
+        'required': ['server']
+    }
+}
+
+list_servers = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'servers': {
+                'type': 'array',
+                'items': parameter_types.list_item
+            },
+            'servers_links': parameter_types.links
+        },
+        'required': ['servers']
+    }
+}
+
+list_servers_detail = {
+    'status_code': [200],
+    'response_body': {
+        'type': 'object',
+        'properties': {
+            'servers': {
+                'type': 'array',
+                'items': server_detail
+            },
+            'servers_links': parameter_types.links
+        },
+        'required': ['servers']
+    }
+}
+
+delete_server = {
+    'status_code': [204]
+}
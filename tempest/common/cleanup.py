@@ -0,0 +1,138 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Cleanup of the resources of finished test classes. The deletions are issued
+at class teardown, and waiting for them can be left to background threads
+so that the worker starts the next class meanwhile.
+"""
+
+import atexit
+from multiprocessing import pool
+import threading
+
+from tempest import config
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+
+def wait_for_deletions(wait, resource_ids, resource_type):
+    """
+    Returns a cleanup step calling wait(resource_id) for every resource.
+    The resources for which wait raises are returned as leaked.
+    """
+    resource_ids = list(resource_ids)
+
+    def step():
+        leaks = []
+        for resource_id in resource_ids:
+            try:
+                wait(resource_id)
+            except Exception:
+                LOG.exception("Failed to confirm the deletion of %s %s" %
+                              (resource_type, resource_id))
+                leaks.append("%s %s" % (resource_type, resource_id))
+        return leaks
+    return step
+
+
+class CleanupService(object):
+    """
+    Runs cleanup jobs, each a sequence of steps called one after the other.
+    A step returns the list of the resources it leaked, or None.
+
+    In background mode the jobs run on a pool of concurrency threads and the
+    exceptions of their steps are reported as leaks. Otherwise they run when
+    submitted and the exceptions propagate to the caller.
+    """
+
+    def __init__(self, background=False, concurrency=4):
+        self.background = background
+        self.concurrency = concurrency
+        self.workers = None
+        self.jobs = []
+        # (job name, resource) tuples
+        self.leaks = []
+        self.lock = threading.Lock()
+
+    def _record(self, name, leaks):
+        with self.lock:
+            self.leaks.extend((name, leak) for leak in leaks or [])
+
+    def _run(self, name, steps):
+        for step in steps:
+            try:
+                self._record(name, step())
+            except Exception as exc:
+                LOG.exception("Cleanup step of %s failed" % name)
+                self._record(name, ["%s: %s" % (type(exc).__name__, exc)])
+
+    def submit(self, name, *steps):
+        """Runs the steps of a job, in the background if enabled."""
+        if not self.background:
+            for step in steps:
+                self._record(name, step())
+            return
+        with self.lock:
+            if self.workers is None:
+                self.workers = pool.ThreadPool(self.concurrency)
+            self.jobs.append(self.workers.apply_async(self._run,
+                                                      (name, steps)))
+
+    def join(self):
+        """Waits for all submitted jobs and returns the leaks."""
+        with self.lock:
+            workers = self.workers
+            self.workers = None
+            self.jobs = []
+        if workers is not None:
+            workers.close()
+            workers.join()
+        return list(self.leaks)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    """Returns the cleanup service of this process."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CleanupService(CONF.cleanup.background,
+                                      CONF.cleanup.concurrency)
+        return _service
+
+
+def submit(name, *steps):
+    """Submits a cleanup job to the service of this process."""
+    get_service().submit(name, *steps)
+
+
+def report():
+    """Waits for the pending cleanup jobs and logs the leaked resources."""
+    if _service is None:
+        return
+    leaks = _service.join()
+    for (name, leak) in leaks:
+        LOG.warning("%s leaked %s" % (name, leak))
+    if leaks:
+        LOG.warning("%d resources leaked by the test classes" % len(leaks))
+
+
+atexit.register(report)
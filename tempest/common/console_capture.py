@@ -0,0 +1,71 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Capture of the console output of servers for the results of failing tests.
+
+The output is limited to its last lines and kept gzip compressed until the
+test result is reported. It is fetched one server after the other while
+the test fails, before its cleanups delete the servers, as the servers
+share a client which is not thread safe.
+"""
+
+import gzip
+import StringIO
+
+from testtools import content
+from testtools import content_type
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+GZIP_TYPE = content_type.ContentType('application', 'x-gzip')
+
+
+def compress(text):
+    """Returns the gzip compressed utf-8 encoding of text."""
+    if isinstance(text, unicode):
+        text = text.encode('utf-8')
+    buf = StringIO.StringIO()
+    f = gzip.GzipFile(fileobj=buf, mode='wb')
+    try:
+        f.write(text)
+    finally:
+        f.close()
+    return buf.getvalue()
+
+
+def _fetch(server, lines):
+    try:
+        output = server.get_console_output(length=lines or None)
+    except Exception as exc:
+        output = "Failed to get the console output: %s" % exc
+    LOG.debug('Console output for %s', server.id)
+    LOG.debug(output)
+    return compress(output)
+
+
+def capture(servers, lines=None):
+    """
+    Fetches the last lines of the console output of every server. Returns
+    a list of (server, compressed output) tuples.
+    """
+    return [(server, _fetch(server, lines)) for server in servers]
+
+
+def as_content(data):
+    """Returns a testtools content of a compressed output."""
+    return content.Content(GZIP_TYPE, lambda: [data])
@@ -12,6 +12,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import difflib
+import gzip
+import json
+from multiprocessing import pool
+import os
+import re
+import time
+import uuid
+
 from tempest.common import commands
 from tempest import config
 
@@ -23,18 +33,117 @@ LOG = logging.getLogger(__name__)
 tables = ['filter', 'nat', 'mangle']
 
 
-def log_ip_ns():
+def _snapshot_commands(ns_list):
+    """Returns the (name, function, args) of every command to run."""
+    cmds = [("Host Addr", commands.ip_addr_raw, ()),
+            ("Host Route", commands.ip_route_raw, ())]
+    cmds.extend(('Host %s table' % table, commands.iptables_raw, (table,))
+                for table in tables)
+    for ns in ns_list:
+        cmds.append(("ns(%s) Addr" % ns, commands.ip_ns_addr, (ns,)))
+        cmds.append(("ns(%s) Route" % ns, commands.ip_ns_route, (ns,)))
+        cmds.extend(('ns(%s) table(%s)' % (ns, table), commands.iptables_ns,
+                     (ns, table)) for table in tables)
+    return cmds
+
+
+def collect_snapshot(concurrency=None):
+    """
+    Runs the ip and iptables commands on the host and in every network
+    namespace, at most concurrency of them at a time. Returns an ordered
+    dict mapping the name of every command to its output.
+    """
+    if concurrency is None:
+        concurrency = CONF.debug.snapshot_concurrency
+    ns_list = commands.ip_ns_list()
+    cmds = _snapshot_commands(ns_list)
+    workers = pool.ThreadPool(max(1, min(concurrency, len(cmds))))
+    try:
+        outputs = workers.map(lambda cmd: cmd[1](*cmd[2]) or '', cmds)
+    finally:
+        workers.close()
+        workers.join()
+    snapshot = collections.OrderedDict()
+    snapshot["Host ns list"] = str(ns_list)
+    snapshot.update(zip([name for (name, _, _) in cmds], outputs))
+    return snapshot
+
+
+def write_snapshot(snapshot, path):
+    """Writes a snapshot to path as gzip compressed JSON."""
+    f = gzip.open(path, 'wb')
+    try:
+        json.dump(snapshot, f)
+    finally:
+        f.close()
+
+
+def read_snapshot(path):
+    """Reads a snapshot written by write_snapshot."""
+    f = gzip.open(path, 'rb')
+    try:
+        return json.load(f, object_pairs_hook=collections.OrderedDict)
+    finally:
+        f.close()
+
+
+def diff_snapshots(baseline, snapshot):
+    """
+    Returns an ordered dict mapping the name of every command whose output
+    differs between the snapshots to the unified diff of its outputs.
+    """
+    diffs = collections.OrderedDict()
+    names = list(baseline) + [n for n in snapshot if n not in baseline]
+    for name in names:
+        old = baseline.get(name, '')
+        new = snapshot.get(name, '')
+        if old == new:
+            continue
+        diffs[name] = ''.join(difflib.unified_diff(
+            old.splitlines(True), new.splitlines(True), 'baseline',
+            'current'))
+    return diffs
+
+
+def _snapshot_name(test_id=None):
+    """Returns a snapshot file name unique across the test workers."""
+    parts = ['ip-ns']
+    if test_id:
+        parts.append(re.sub(r'[^\w.-]', '_', test_id))
+    # NOTE: several snapshots can be taken by one worker in the same second,
+    # so the time and pid are not enough to tell them apart
+    parts.extend([time.strftime('%Y%m%d%H%M%S'), str(os.getpid()),
+                  uuid.uuid4().hex[:8]])
+    return '-'.join(parts) + '.json.gz'
+
+
+def log_ip_ns(test_id=None):
     if not CONF.debug.enable:
         return
-    LOG.info("Host Addr:\n" + commands.ip_addr_raw())
-    LOG.info("Host Route:\n" + commands.ip_route_raw())
-    for table in ['filter', 'nat', 'mangle']:
-        LOG.info('Host %s table:\n%s', table, commands.iptables_raw(table))
-    ns_list = commands.ip_ns_list()
-    LOG.info("Host ns list" + str(ns_list))
-    for ns in ns_list:
-        LOG.info("ns(%s) Addr:\n%s", ns, commands.ip_ns_addr(ns))
-        LOG.info("ns(%s) Route:\n%s", ns, commands.ip_ns_route(ns))
-        for table in ['filter', 'nat', 'mangle']:
-            LOG.info('ns(%s) table(%s):\n%s', ns, table,
-                     commands.iptables_ns(ns, table))
+    snapshot = collect_snapshot()
+    # NOTE: this runs while handling a test failure, so failing to write or
+    # read a snapshot must not replace the original error
+    if CONF.debug.snapshot_dir:
+        path = os.path.join(CONF.debug.snapshot_dir,
+                            _snapshot_name(test_id))
+        try:
+            if not os.path.isdir(CONF.debug.snapshot_dir):
+                os.makedirs(CONF.debug.snapshot_dir)
+            write_snapshot(snapshot, path)
+        except Exception:
+            LOG.exception("Failed to write the network snapshot to %s", path)
+        else:
+            LOG.info("Network snapshot written to %s", path)
+    if CONF.debug.baseline_snapshot:
+        try:
+            baseline = read_snapshot(CONF.debug.baseline_snapshot)
+        except Exception:
+            LOG.exception("Failed to read the baseline network snapshot %s",
+                          CONF.debug.baseline_snapshot)
+        else:
+            diffs = diff_snapshots(baseline, snapshot)
+            for (name, diff) in diffs.items():
+                LOG.info("%s changes since the baseline:\n%s", name, diff)
+            return
+    for (name, output) in snapshot.items():
+        LOG.info("%s:\n%s", name, output)
@@ -0,0 +1,160 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Discovery of the API extensions enabled in the cloud under test, for the
+services whose extension list option is set to the special entry discover.
+"""
+
+import json
+import os
+import time
+
+from tempest import clients
+from tempest import config
+from tempest.openstack.common import lockutils
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+DISCOVER = 'discover'
+
+# The extensions discovered by this process, service -> list of names
+_extensions = None
+
+
+def _extension_options():
+    return {
+        'compute': CONF.compute_feature_enabled.api_extensions,
+        'compute_v3': CONF.compute_feature_enabled.api_v3_extensions,
+        'volume': CONF.volume_feature_enabled.api_extensions,
+        'network': CONF.network_feature_enabled.api_extensions,
+        'object': CONF.object_storage_feature_enabled.discoverable_apis,
+    }
+
+
+def _names(extensions):
+    # NOTE: tests refer to extensions by name or by alias
+    names = set()
+    for extension in extensions:
+        names.add(extension['name'])
+        if 'alias' in extension:
+            names.add(extension['alias'])
+    return sorted(names)
+
+
+def _list_extensions(manager, service):
+    if service == 'compute':
+        __, extensions = manager.extensions_client.list_extensions()
+    elif service == 'compute_v3':
+        __, extensions = manager.extensions_v3_client.list_extensions()
+    elif service == 'volume':
+        __, extensions = manager.volumes_extension_client.list_extensions()
+    elif service == 'network':
+        __, body = manager.network_client.list_extensions()
+        extensions = body['extensions']
+    elif service == 'object':
+        # Swift lists its optional apis as the keys of /info
+        __, body = manager.account_client.list_extensions()
+        return sorted(body)
+    return _names(extensions)
+
+
+def _service_available(service):
+    return {
+        'compute': CONF.service_available.nova,
+        'compute_v3': (CONF.service_available.nova and
+                       CONF.compute_feature_enabled.api_v3),
+        'volume': CONF.service_available.cinder,
+        'network': CONF.service_available.neutron,
+        'object': CONF.service_available.swift,
+    }[service]
+
+
+def discover():
+    """
+    Queries the extensions of every available service set to discover.
+    Returns a dict mapping the service to the list of its extension names
+    and aliases, or to None if the extensions could not be listed.
+    """
+    manager = clients.Manager()
+    extensions = {}
+    for (service, option) in sorted(_extension_options().iteritems()):
+        if option[0] != DISCOVER or not _service_available(service):
+            continue
+        try:
+            extensions[service] = _list_extensions(manager, service)
+        except Exception:
+            LOG.exception("Failed to discover the %s extensions, assuming "
+                          "all of them are enabled" % service)
+            extensions[service] = None
+    return extensions
+
+
+def _read_cache(path):
+    ttl = CONF.discovery.extensions_cache_ttl
+    try:
+        if ttl and time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_cache(path, extensions):
+    # NOTE: rename is atomic, so other workers never read a partially
+    # written cache file
+    tmp_path = '%s.%d' % (path, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(extensions, f)
+    os.rename(tmp_path, path)
+
+
+def get_extensions():
+    """
+    Returns the discovered extensions, querying the APIs only once per run.
+
+    If [discovery] extensions_cache_file is set, the first worker writes
+    the results there and all other workers read them from the file.
+    """
+    global _extensions
+    if _extensions is not None:
+        return _extensions
+    path = CONF.discovery.extensions_cache_file
+    if not path:
+        _extensions = discover()
+        return _extensions
+    _extensions = _read_cache(path)
+    if _extensions is None:
+        lock_path = os.path.dirname(os.path.abspath(path))
+        with lockutils.lock('extension-discovery', 'tempest-',
+                            external=True, lock_path=lock_path):
+            # Another worker may have written it while we waited
+            _extensions = _read_cache(path)
+            if _extensions is None:
+                _extensions = discover()
+                _write_cache(path, _extensions)
+    return _extensions
+
+
+def is_extension_discovered(extension_name, service):
+    """
+    Returns whether a discovered service has the extension. Services whose
+    extensions could not be listed have all extensions enabled.
+    """
+    extensions = get_extensions().get(service)
+    return extensions is None or extension_name in extensions
@@ -0,0 +1,208 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Combinatorial fuzzing of an API based on the json-schema of a negative test
+description, using the invalid values of generate_json as field mutations.
+"""
+
+import collections
+import itertools
+import json
+import random
+import re
+import urllib
+
+from tempest.common import generate_json
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+FuzzCase = collections.namedtuple('FuzzCase', ['name', 'payload', 'mutations'])
+
+# Values echoed back in error messages, which would make every signature
+# unique otherwise
+_VOLATILE_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\d+")
+
+
+def field_mutations(schema):
+    """
+    Returns the invalid values generate_json creates for each property of
+    an object schema as a dict mapping the property name to a list of
+    (mutation name, value) tuples. Schemas of other types are treated as a
+    single field named None.
+    """
+    if schema.get("type") != "object":
+        fields = {None: schema}
+    else:
+        fields = schema.get("properties", {})
+    mutations = {}
+    for (field, field_schema) in sorted(fields.iteritems()):
+        names = collections.Counter()
+        values = []
+        for (name, value, _) in generate_json.generate_invalid(field_schema):
+            if field is not None:
+                name = "prop_%s_%s" % (field, name)
+            names[name] += 1
+            if names[name] > 1:
+                name = "%s_%d" % (name, names[name])
+            values.append((name, value))
+        if values:
+            mutations[field] = values
+    return mutations
+
+
+def generate_cases(schema, strength):
+    """
+    Yields a FuzzCase for every combination of mutations of exactly
+    strength different fields, all other fields keeping their valid value.
+    """
+    mutations = field_mutations(schema)
+    if None in mutations:
+        if strength == 1:
+            for (name, value) in mutations[None]:
+                yield FuzzCase(name, value, (name,))
+        return
+    valid = generate_json.generate_valid(schema)
+    for fields in itertools.combinations(sorted(mutations), strength):
+        for combination in itertools.product(*[mutations[f] for f in fields]):
+            payload = dict(valid)
+            for (field, (_, value)) in zip(fields, combination):
+                payload[field] = value
+            names = tuple(name for (name, _) in combination)
+            yield FuzzCase("+".join(names), payload, names)
+
+
+def http_arguments(payload, url, method):
+    """Returns the url and body to send a payload with."""
+    if not payload:
+        return url, None
+    elif method in ["GET", "HEAD", "PUT", "DELETE"]:
+        return "%s?%s" % (url, urllib.urlencode(payload)), None
+    else:
+        return url, json.dumps(payload)
+
+
+def signature(response):
+    """
+    Returns the (status, error) signature of a response as returned by
+    NegativeRestClient.send_requests, with quoted values and numbers
+    removed from the error message.
+    """
+    if isinstance(response, Exception):
+        return ("exception", type(response).__name__)
+    resp, body = response
+    message = body
+    try:
+        body = json.loads(body)
+    except (TypeError, ValueError):
+        pass
+    # Fault bodies look like {"badRequest": {"message": ..., "code": 400}}
+    while isinstance(body, dict) and body:
+        if "message" in body:
+            message = body["message"]
+            break
+        body = body.values()[0] if len(body) == 1 else None
+    return (resp.status, _VOLATILE_RE.sub("_", "%s" % message))
+
+
+class Fuzzer(object):
+    """
+    Sends the payloads of generate_cases for strength 1 up to the given
+    strength and groups them by the signature of their responses.
+
+    The cases of each strength are shuffled with the seed, so a run is
+    repeatable. Whenever a batch reaches a new signature, the remaining
+    cases are reordered so that the ones combining the most mutations
+    which reached new signatures are sent first. Cases are sent in batches
+    through NegativeRestClient.send_requests.
+    """
+
+    def __init__(self, client, description, resources=(), strength=2,
+                 seed=0, concurrency=10, batch_size=100):
+        self.client = client
+        self.description = description
+        self.resources = list(resources)
+        self.strength = strength
+        self.seed = seed
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        # signature -> list of the cases answered with it
+        self.signatures = collections.OrderedDict()
+        # mutation name -> number of new signatures it was part of
+        self.novelty = collections.Counter()
+        self.sent = 0
+
+    def _request(self, case):
+        url, body = http_arguments(case.payload, self.description["url"],
+                                   self.description["http-method"])
+        return (self.description["http-method"], url, self.resources, body)
+
+    def _record(self, case, response):
+        """Returns True if the response has a new signature."""
+        key = signature(response)
+        new = key not in self.signatures
+        if new:
+            LOG.debug("New signature %s from %s" % (key, case.name))
+            self.signatures[key] = []
+            for mutation in case.mutations:
+                self.novelty[mutation] += 1
+        self.signatures[key].append(case)
+        return new
+
+    def _score(self, case):
+        return sum(self.novelty[m] for m in case.mutations)
+
+    def run(self, max_cases=None):
+        """
+        Sends up to max_cases cases and returns the signatures dict, which
+        maps every (status, error) signature to the cases answered with it,
+        the first one being the case which found it.
+        """
+        schema = self.description.get("json-schema")
+        if schema is None:
+            return self.signatures
+        rand = random.Random(self.seed)
+        for strength in range(1, self.strength + 1):
+            cases = list(generate_cases(schema, strength))
+            rand.shuffle(cases)
+            start = 0
+            reorder = True
+            while (start < len(cases) and
+                   (max_cases is None or self.sent < max_cases)):
+                if reorder:
+                    # sort is stable, so equally scored cases keep the
+                    # seeded order
+                    cases[start:] = sorted(cases[start:], key=self._score,
+                                           reverse=True)
+                size = self.batch_size
+                if max_cases is not None:
+                    size = min(size, max_cases - self.sent)
+                batch = cases[start:start + size]
+                start += size
+                responses = self.client.send_requests(
+                    [self._request(case) for case in batch],
+                    concurrency=self.concurrency)
+                reorder = False
+                for (case, response) in zip(batch, responses):
+                    reorder = self._record(case, response) or reorder
+                self.sent += len(batch)
+        LOG.info("Sent %d cases of %s, got %d signatures" %
+                 (self.sent, self.description["name"], len(self.signatures)))
+        return self.signatures
+
+    def unique_cases(self):
+        """Returns the first case answered with each signature."""
+        return [cases[0] for cases in self.signatures.values()]
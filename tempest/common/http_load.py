@@ -0,0 +1,183 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+A small HTTP load generator, sending many GET requests to a URL from
+concurrent workers which each keep their connection alive, and a check of
+how a load balancer spread the responses across its members.
+"""
+
+import collections
+import httplib
+import itertools
+import math
+from multiprocessing import pool
+import socket
+import threading
+import time
+import urlparse
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class LoadResult(object):
+    """The responses and latencies of a load run."""
+
+    def __init__(self):
+        # response body -> number of responses
+        self.responses = collections.Counter()
+        self.statuses = collections.Counter()
+        self.latencies = []
+        self.errors = collections.Counter()
+        self.duration = 0.0
+        self.lock = threading.Lock()
+
+    def add_response(self, status, body, latency):
+        with self.lock:
+            self.statuses[status] += 1
+            self.responses[body] += 1
+            self.latencies.append(latency)
+
+    def add_error(self, exc):
+        with self.lock:
+            self.errors[exc.__class__.__name__] += 1
+
+    @property
+    def requests(self):
+        return sum(self.statuses.values()) + sum(self.errors.values())
+
+    def percentile(self, percent):
+        """
+        Returns the latency in seconds below which percent of the
+        responses were received, or None without responses.
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        index = int(math.ceil(percent / 100.0 * len(latencies))) - 1
+        return latencies[max(0, index)]
+
+    def __str__(self):
+        rate = self.requests / self.duration if self.duration else 0.0
+        return ("%d requests in %.1fs (%.1f/s), %d errors, latency p50 %s "
+                "p95 %s p99 %s" %
+                (self.requests, self.duration, rate,
+                 sum(self.errors.values()), self.percentile(50),
+                 self.percentile(95), self.percentile(99)))
+
+
+def _connect(url, timeout):
+    parsed = urlparse.urlparse(url)
+    if parsed.scheme == 'https':
+        connection_class = httplib.HTTPSConnection
+    else:
+        connection_class = httplib.HTTPConnection
+    path = parsed.path or '/'
+    if parsed.query:
+        path += '?' + parsed.query
+    return connection_class(parsed.netloc, timeout=timeout), path
+
+
+def generate_load(url, requests=10, concurrency=1, timeout=10, retries=3):
+    """
+    Sends requests GET requests to url from concurrency workers, each
+    reusing its connection as long as the server keeps it alive.
+
+    Requests failing to connect or to get a response are retried up to
+    retries times on a new connection before being counted as errors.
+
+    :returns: a LoadResult
+    """
+    result = LoadResult()
+    counter = itertools.count()
+    counter_lock = threading.Lock()
+
+    def take():
+        with counter_lock:
+            return next(counter) < requests
+
+    def work(_):
+        connection, path = _connect(url, timeout)
+        try:
+            while take():
+                for attempt in range(retries + 1):
+                    start = time.time()
+                    try:
+                        connection.request('GET', path)
+                        response = connection.getresponse()
+                        body = response.read()
+                    except (socket.error, httplib.HTTPException) as exc:
+                        # httplib reconnects on the next request
+                        connection.close()
+                        if attempt == retries:
+                            result.add_error(exc)
+                        continue
+                    result.add_response(response.status, body,
+                                        time.time() - start)
+                    if response.will_close:
+                        connection.close()
+                    break
+        finally:
+            connection.close()
+
+    workers = pool.ThreadPool(max(1, min(concurrency, requests)))
+    start = time.time()
+    try:
+        workers.map(work, range(concurrency))
+    finally:
+        workers.close()
+        workers.join()
+    result.duration = time.time() - start
+    LOG.debug("Load on %s: %s" % (url, result))
+    return result
+
+
+def distribution_errors(responses, members, lb_method, tolerance=0.1):
+    """
+    Checks the spread of the responses across the members of a pool.
+
+    :param responses: dict mapping every response body to its count.
+    :param members: the response bodies of the members.
+    :param lb_method: ROUND_ROBIN, where every member must get its equal
+                      share of the responses give or take tolerance times
+                      that share, LEAST_CONNECTIONS, where every member
+                      must get responses, or SOURCE_IP, where a single
+                      client must always get the same member.
+    :returns: a list of messages describing the problems, empty if none.
+    """
+    errors = ['Unexpected response %r' % body
+              for body in responses if body not in members]
+    total = sum(responses.values())
+    counts = dict((member, responses.get(member, 0)) for member in members)
+    if lb_method == 'ROUND_ROBIN':
+        share = float(total) / len(members)
+        for (member, count) in sorted(counts.items()):
+            if abs(count - share) > tolerance * share:
+                errors.append("Member %r got %d of %d responses instead of "
+                              "%.0f" % (member, count, total, share))
+    elif lb_method == 'LEAST_CONNECTIONS':
+        errors.extend("Member %r got no responses" % member
+                      for (member, count) in sorted(counts.items())
+                      if not count)
+    elif lb_method == 'SOURCE_IP':
+        served = [member for (member, count) in counts.items() if count]
+        if len(served) > 1:
+            errors.append("Responses of a single source spread across "
+                          "members %s" % sorted(served))
+    else:
+        errors.append("Unknown lb_method %s" % lb_method)
+    return errors
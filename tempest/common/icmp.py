@@ -0,0 +1,270 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+In-process ICMP echo probing of many IPv4 addresses over a single socket,
+instead of running a ping subprocess per address and attempt.
+
+A raw socket is used if the process may open one, else an unprivileged
+datagram ICMP socket (see the net.ipv4.ping_group_range sysctl on Linux).
+If neither is allowed, or for IPv6 addresses, the ping command is run.
+"""
+
+import errno
+import itertools
+import os
+import select
+import socket
+import struct
+import subprocess
+import time
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+PAYLOAD = 'tempest-icmp-probe'
+
+# NOTE: raw sockets get the echo replies of every prober of the process,
+# which all use the pid as identifier, so the probers share the sequence
+# numbers to never take the replies of another one for their own
+_sequences = itertools.count(1)
+
+
+def checksum(data):
+    """Returns the internet checksum of data."""
+    if len(data) % 2:
+        data += '\0'
+    total = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def echo_request(identifier, sequence, payload=PAYLOAD):
+    """Returns an ICMP echo request packet."""
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, identifier,
+                         sequence)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0,
+                       checksum(header + payload), identifier,
+                       sequence) + payload
+
+
+def parse_echo_reply(packet, raw):
+    """
+    Returns the (identifier, sequence) of an ICMP echo reply, or None for
+    other packets. Packets read from raw sockets start with the IP header.
+    """
+    if raw:
+        packet = packet[(ord(packet[0]) & 0x0f) * 4:]
+    if len(packet) < 8:
+        return None
+    icmp_type, code, _, identifier, sequence = struct.unpack('!BBHHH',
+                                                             packet[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return identifier, sequence
+
+
+def open_socket():
+    """
+    Returns a (socket, raw) tuple for sending ICMP echo requests. Raises
+    socket.error if neither raw nor datagram ICMP sockets are allowed.
+    """
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW,
+                             socket.IPPROTO_ICMP), True
+    except socket.error as exc:
+        if exc.errno not in (errno.EPERM, errno.EACCES):
+            raise
+    return socket.socket(socket.AF_INET, socket.SOCK_DGRAM,
+                         socket.IPPROTO_ICMP), False
+
+
+def _is_ipv4(address):
+    try:
+        socket.inet_pton(socket.AF_INET, address)
+    except socket.error:
+        return False
+    return True
+
+
+class Prober(object):
+    """
+    Probes addresses with ICMP echo requests sent over one socket, matching
+    the replies to the requests by their sequence number, which is unique
+    across the probers of the process.
+    """
+
+    def __init__(self, sock=None, raw=False):
+        if sock is None:
+            sock, raw = open_socket()
+        self.sock = sock
+        self.raw = raw
+        # NOTE: the kernel sets the identifier of datagram sockets itself
+        # and only hands them their own replies
+        self.identifier = os.getpid() & 0xffff
+        # sequence -> address
+        self.sent = {}
+
+    def close(self):
+        self.sock.close()
+
+    def send(self, address):
+        sequence = next(_sequences) & 0xffff
+        self.sent[sequence] = address
+        try:
+            self.sock.sendto(echo_request(self.identifier, sequence),
+                             (address, 0))
+        except socket.error as exc:
+            # e.g. no route to the address yet
+            LOG.debug("Failed to send an echo request to %s: %s" %
+                      (address, exc))
+
+    def receive(self, timeout, expected=()):
+        """
+        Returns a dict mapping the addresses which answered within timeout
+        to the time of their first reply. Returns early once all expected
+        addresses answered.
+        """
+        deadline = time.time() + timeout
+        answered = {}
+        expected = set(expected)
+        while not expected or not expected <= set(answered):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                break
+            packet, (source, _) = self.sock.recvfrom(65535)
+            reply = parse_echo_reply(packet, self.raw)
+            if reply is None:
+                continue
+            identifier, sequence = reply
+            if self.raw and identifier != self.identifier:
+                continue
+            if self.sent.get(sequence) == source:
+                answered.setdefault(source, time.time())
+        return answered
+
+    def wait(self, addresses, reachable=True, timeout=60, interval=1):
+        """
+        Probes the addresses every interval seconds until all of them are
+        reachable, or unreachable if reachable is False, or until timeout.
+        Returns a dict mapping every address to the seconds it took to get
+        there, or to None if it did not within timeout.
+        """
+        start = time.time()
+        results = dict((address, None) for address in addresses)
+        pending = set(addresses)
+        while pending:
+            for address in sorted(pending):
+                self.send(address)
+            expected = pending if reachable else ()
+            answered = self.receive(interval, expected)
+            for address in list(pending):
+                if reachable and address in answered:
+                    results[address] = answered[address] - start
+                elif not reachable and address not in answered:
+                    results[address] = time.time() - start
+                else:
+                    continue
+                pending.discard(address)
+            # NOTE: receive only returns early once all pending addresses
+            # answered, so every round lasts interval seconds
+            if pending and time.time() - start >= timeout:
+                break
+        return results
+
+
+def _ping(address):
+    cmd = ['ping' if _is_ipv4(address) else 'ping6', '-c1', '-w1', address]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE)
+    proc.wait()
+    return proc.returncode == 0
+
+
+class CommandProber(object):
+    """Prober running the ping command, one address after the other."""
+
+    def close(self):
+        pass
+
+    def wait(self, addresses, reachable=True, timeout=60, interval=1):
+        start = time.time()
+        results = dict((address, None) for address in addresses)
+        pending = set(addresses)
+        while pending:
+            round_start = time.time()
+            for address in sorted(pending):
+                if _ping(address) == reachable:
+                    results[address] = time.time() - start
+                    pending.discard(address)
+            if pending and time.time() - start >= timeout:
+                break
+            time.sleep(max(0, interval - (time.time() - round_start)))
+        return results
+
+
+def get_prober(addresses=()):
+    """
+    Returns a Prober, or a CommandProber if ICMP sockets are not allowed
+    or some of the addresses are not IPv4 ones.
+    """
+    if all(_is_ipv4(address) for address in addresses):
+        try:
+            return Prober()
+        except socket.error as exc:
+            LOG.info("ICMP sockets not allowed (%s), running ping" % exc)
+    return CommandProber()
+
+
+def wait(addresses, reachable=True, timeout=60, interval=1):
+    """See Prober.wait."""
+    prober = get_prober(addresses)
+    try:
+        return prober.wait(addresses, reachable, timeout, interval)
+    finally:
+        prober.close()
+
+
+def wait_for_reachable(addresses, timeout=60, interval=1):
+    """
+    Waits for all addresses to answer ICMP echo requests. Returns a dict
+    mapping every address to the seconds it took to first answer, or to
+    None if it did not within timeout.
+    """
+    return wait(addresses, True, timeout, interval)
+
+
+def wait_for_unreachable(addresses, timeout=60, interval=1):
+    """
+    Waits for all addresses to stop answering ICMP echo requests. Returns
+    a dict mapping every address to the seconds it took to first miss an
+    answer, or to None if it kept answering for timeout seconds.
+    """
+    return wait(addresses, False, timeout, interval)
+
+
+def ping_ip_address(address, should_succeed=True, timeout=60):
+    """
+    Returns whether the address became reachable, or unreachable if
+    should_succeed is False, within timeout seconds.
+    """
+    return wait([address], should_succeed, timeout)[address] is not None
@@ -0,0 +1,292 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Reuse of the public Glance images uploaded from local files, so the same
+file is uploaded once instead of once per test.
+
+Images are looked up by the md5 checksum Glance computes for their data
+and by a tag property derived from the checksum, the formats and the other
+properties of the image. Images are reference counted within a process.
+
+The test workers share the images through files under lock_path: every
+worker using an image leaves a marker named after its pid, and the image
+is deleted at exit by the last worker using it, under an external lock,
+if it was uploaded during the run. Without lock_path, the workers cannot
+know whether the others still use an image, so the uploaded images are
+never deleted and have to be cleaned up out of band.
+"""
+
+import atexit
+import collections
+import errno
+import hashlib
+import os
+import shutil
+import threading
+
+from tempest.common.utils import data_utils
+from tempest import config
+from tempest import exceptions
+from tempest.openstack.common import lockutils
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+TAG_PROPERTY = 'tempest_image_cache'
+CHUNK_SIZE = 65536
+# marker of the images uploaded during the run, next to the worker markers
+UPLOADED_MARKER = 'uploaded'
+
+# path -> (mtime, size, checksum)
+_checksums = {}
+_checksums_lock = threading.Lock()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def enabled():
+    # NOTE: images uploaded with isolated credentials could not be deleted
+    # at exit anymore, their tenant being gone
+    return (CONF.scenario.image_cache and
+            not CONF.compute.allow_tenant_isolation)
+
+
+def file_checksum(path):
+    """
+    Returns the md5 hex digest of a file, only reading the file again if
+    its modification time or size changed since the last call.
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    with _checksums_lock:
+        cached = _checksums.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime, stat.st_size):
+        return cached[2]
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+            md5.update(chunk)
+    checksum = md5.hexdigest()
+    with _checksums_lock:
+        _checksums[path] = (stat.st_mtime, stat.st_size, checksum)
+    return checksum
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as exc:
+        return exc.errno != errno.ESRCH
+    return True
+
+
+def image_tag(checksum, fmt, properties):
+    """Returns the tag of an image with the data checksum and metadata."""
+    key = [checksum, fmt] + ['%s=%s' % item
+                             for item in sorted(properties.items())]
+    return hashlib.md5('\n'.join(key)).hexdigest()
+
+
+class ImageCache(object):
+    """
+    Hands out the id of a public image with the data of a file, uploading
+    the file only if no such image exists yet.
+
+    :param lock_path: directory shared by the test workers to coordinate
+                      the deletion of the images, which are never deleted
+                      if it is None.
+    """
+
+    def __init__(self, lock_path=None):
+        self.lock_path = lock_path
+        # tag -> image id
+        self.images = {}
+        # image id -> client, for all images used by this process
+        self.clients = {}
+        # ids of the images uploaded by this process
+        self.uploaded = set()
+        self.refcounts = collections.Counter()
+        self.stats = collections.Counter()
+        self.lock = threading.Lock()
+
+    def _shared_lock(self):
+        return lockutils.lock('image-cache', 'tempest-', external=True,
+                              lock_path=self.lock_path)
+
+    def _markers_dir(self, image_id):
+        return os.path.join(self.lock_path, 'tempest-image-cache-users',
+                            image_id)
+
+    def _add_marker(self, image_id, name):
+        markers_dir = self._markers_dir(image_id)
+        if not os.path.isdir(markers_dir):
+            os.makedirs(markers_dir)
+        open(os.path.join(markers_dir, name), 'w').close()
+
+    def _other_users(self, image_id):
+        """
+        Removes the marker of this process from an image and returns the
+        pids of the other live processes using it.
+        """
+        markers_dir = self._markers_dir(image_id)
+        pids = []
+        for name in os.listdir(markers_dir):
+            if not name.isdigit():
+                continue
+            pid = int(name)
+            if pid == os.getpid() or not _pid_alive(pid):
+                # the markers of the workers which died are stale
+                os.remove(os.path.join(markers_dir, name))
+            else:
+                pids.append(pid)
+        return pids
+
+    def _find(self, client, checksum, tag):
+        filters = {'checksum': checksum, 'status': 'active',
+                   'property-%s' % TAG_PROPERTY: tag}
+        for image in client.images.list(filters=filters):
+            # NOTE: older Glance APIs ignore the filters they do not know
+            if (image.checksum == checksum and image.is_public and
+                    image.properties.get(TAG_PROPERTY) == tag):
+                return image
+        return None
+
+    def _upload(self, client, name, fmt, path, checksum, properties):
+        properties = dict(properties, **{TAG_PROPERTY: image_tag(
+            checksum, fmt, properties)})
+        with open(path, 'rb') as image_file:
+            # the file object is sent in chunks instead of read in memory
+            image = client.images.create(
+                name=data_utils.rand_name('%s-' % name),
+                container_format=fmt, disk_format=fmt, is_public=True,
+                properties=properties, data=image_file)
+        if image.checksum != checksum:
+            self._delete(client, image.id)
+            raise exceptions.ImageFault(
+                "Checksum of the image uploaded from %s is %s instead of "
+                "%s" % (path, image.checksum, checksum))
+        return image
+
+    def _delete(self, client, image_id):
+        try:
+            client.images.delete(image_id)
+        except Exception as exc:
+            if exc.__class__.__name__ != 'NotFound':
+                LOG.exception("Failed to delete cached image %s" % image_id)
+
+    def get_image(self, client, name, fmt, path, properties=None):
+        """
+        Returns the id of a public image of the file at path with the
+        container and disk format fmt and the properties, and takes a
+        reference to it which is given back with release().
+        """
+        properties = properties or {}
+        checksum = file_checksum(path)
+        tag = image_tag(checksum, fmt, properties)
+        with self.lock:
+            image_id = self.images.get(tag)
+            if image_id is not None:
+                self.stats['hits'] += 1
+            elif self.lock_path is None:
+                image_id = self._find_or_upload(client, name, fmt, path,
+                                                checksum, tag, properties)
+            else:
+                # NOTE: no other worker may delete the image between the
+                # time it is found and the time its marker is written
+                with self._shared_lock():
+                    image_id = self._find_or_upload(client, name, fmt, path,
+                                                    checksum, tag, properties)
+                    self._add_marker(image_id, str(os.getpid()))
+                    if image_id in self.uploaded:
+                        self._add_marker(image_id, UPLOADED_MARKER)
+            self.refcounts[image_id] += 1
+            return image_id
+
+    def _find_or_upload(self, client, name, fmt, path, checksum, tag,
+                        properties):
+        image = self._find(client, checksum, tag)
+        if image is not None:
+            LOG.debug("Reusing image %s for %s" % (image.id, path))
+            self.stats['found'] += 1
+        else:
+            image = self._upload(client, name, fmt, path, checksum,
+                                 properties)
+            LOG.debug("Uploaded image %s from %s" % (image.id, path))
+            self.uploaded.add(image.id)
+            self.stats['uploaded'] += 1
+        self.images[tag] = image.id
+        self.clients[image.id] = client
+        return image.id
+
+    def release(self, image_id):
+        """Gives back a reference taken by get_image()."""
+        with self.lock:
+            self.refcounts[image_id] -= 1
+
+    def delete_all(self, keep=False):
+        """
+        Deletes the images uploaded during the run which no other worker
+        uses anymore, unless keep is True or they are still referenced.
+        """
+        with self.lock:
+            clients = self.clients.items()
+            self.clients.clear()
+            self.images.clear()
+        for (image_id, client) in clients:
+            if self.refcounts[image_id] > 0:
+                LOG.warning("Not deleting cached image %s, still referenced "
+                            "%d times" % (image_id,
+                                          self.refcounts[image_id]))
+            elif self.lock_path is None:
+                if image_id in self.uploaded and not keep:
+                    LOG.info("Not deleting cached image %s, other workers "
+                             "may use it as lock_path is not set" % image_id)
+            else:
+                with self._shared_lock():
+                    if self._other_users(image_id):
+                        continue
+                    markers_dir = self._markers_dir(image_id)
+                    uploaded = os.path.exists(
+                        os.path.join(markers_dir, UPLOADED_MARKER))
+                    shutil.rmtree(markers_dir, ignore_errors=True)
+                    if uploaded and not keep:
+                        self._delete(client, image_id)
+
+
+def get_cache():
+    """Returns the image cache of this process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ImageCache(lock_path=CONF.lock_path)
+        return _cache
+
+
+def delete_all():
+    """Logs the statistics of the cache and deletes its uploaded images."""
+    with _cache_lock:
+        cache = _cache
+    if cache is None:
+        return
+    stats = cache.stats
+    LOG.info("Image cache: %d hits, %d found, %d uploaded" %
+             (stats['hits'], stats['found'], stats['uploaded']))
+    cache.delete_all(keep=CONF.scenario.keep_cached_images)
+
+
+atexit.register(delete_all)
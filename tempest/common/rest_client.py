@@ -15,10 +15,15 @@
 #    under the License.
 
 import collections
+import copy
 import hashlib
+import itertools
 import json
+import jsonschema
 from lxml import etree
+from multiprocessing import pool
 import re
+import threading
 import time
 
 from tempest.common import http
@@ -36,6 +41,31 @@ TOKEN_CHARS_RE = re.compile('^[-A-Za-z0-9+/=]*$')
 # All the successful HTTP status codes from RFC 2616
 HTTP_SUCCESS = (200, 201, 202, 203, 204, 205, 206)
 
+RESPONSE_VALIDATION_MODES = ('off', 'sampled', 'full')
+
+# Compiled response body validators keyed by id() of the schema; the schema
+# is kept alongside so the id can not be reused while the entry exists
+_validators = {}
+_validators_lock = threading.Lock()
+_response_counter = itertools.count()
+
+
+def get_response_validator(schema):
+    """
+    Returns a validator for a response body schema, checking and compiling
+    the schema on first use only.
+    """
+    try:
+        return _validators[id(schema)][1]
+    except KeyError:
+        pass
+    with _validators_lock:
+        if id(schema) not in _validators:
+            jsonschema.Draft4Validator.check_schema(schema)
+            _validators[id(schema)] = (schema,
+                                       jsonschema.Draft4Validator(schema))
+        return _validators[id(schema)][1]
+
 
 class RestClient(object):
 
@@ -70,6 +100,9 @@ class RestClient(object):
                         'Accept': 'application/%s' % self.TYPE}
         self.build_interval = CONF.compute.build_interval
         self.build_timeout = CONF.compute.build_timeout
+        self.response_validation = CONF.compute.response_validation
+        self.response_validation_sample_rate = (
+            CONF.compute.response_validation_sample_rate)
         self.general_header_lc = set(('cache-control', 'connection',
                                       'date', 'pragma', 'trailer',
                                       'transfer-encoding', 'via',
@@ -82,6 +115,17 @@ class RestClient(object):
         self.http_obj = http.ClosingHttp(
             disable_ssl_certificate_validation=dscv)
 
+    def clone(self):
+        """
+        Returns a shallow copy of the client with its own http object, as
+        httplib2.Http objects can not be shared between threads.
+        """
+        client = copy.copy(self)
+        dscv = CONF.identity.disable_ssl_certificate_validation
+        client.http_obj = http.ClosingHttp(
+            disable_ssl_certificate_validation=dscv)
+        return client
+
     def _get_type(self):
         return self.TYPE
 
@@ -180,6 +224,36 @@ class RestClient(object):
                 details = pattern.format(read_code, expected_code)
                 raise exceptions.InvalidHttpSuccessCode(details)
 
+    def validate_response(self, schema, resp, body):
+        """
+        Checks the status code and the decoded body of a response against
+        a schema from tempest.api_schema, which is a dict with the allowed
+        'status_code' list and an optional 'response_body' JSON schema.
+        """
+        mode = self.response_validation
+        if mode == 'off':
+            return
+        if mode == 'sampled':
+            rate = max(self.response_validation_sample_rate, 1)
+            if next(_response_counter) % rate:
+                return
+        elif mode != 'full':
+            raise exceptions.InvalidConfiguration(
+                "Unknown response validation mode %s, expected one of %s" %
+                (mode, ', '.join(RESPONSE_VALIDATION_MODES)))
+
+        if resp.status not in schema['status_code']:
+            msg = ("The status code(%s) is different than the expected "
+                   "one(%s)") % (resp.status, schema['status_code'])
+            raise exceptions.InvalidHttpSuccessCode(msg)
+        body_schema = schema.get('response_body')
+        if body_schema:
+            try:
+                get_response_validator(body_schema).validate(body)
+            except jsonschema.ValidationError as ex:
+                msg = "HTTP response body is invalid (%s)" % ex
+                raise exceptions.InvalidHTTPResponseBody(msg)
+
     def post(self, url, body, headers=None):
         return self.request('POST', url, headers, body)
 
@@ -534,3 +608,30 @@ class NegativeRestClient(RestClient):
             assert False
 
         return resp, body
+
+    def send_requests(self, requests, concurrency=10):
+        """
+        Sends many requests concurrently over a bounded pool of threads.
+
+        :param requests: a list of (method, url_template, resources, body)
+                         tuples as taken by send_request.
+        :param concurrency: maximum number of requests in flight.
+        :returns: a list holding the (resp, body) tuple of each request, or
+                  the exception it raised, in the order of the requests.
+        """
+        def send(request):
+            try:
+                return self.clone().send_request(*request)
+            except Exception as exc:
+                return exc
+
+        if not requests:
+            return []
+        # Authenticate once before the requests fan out
+        self.auth_provider.get_token()
+        workers = pool.ThreadPool(max(1, min(concurrency, len(requests))))
+        try:
+            return workers.map(send, requests)
+        finally:
+            workers.close()
+            workers.join()
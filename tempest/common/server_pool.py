@@ -0,0 +1,201 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+A per-process pool of ACTIVE servers leased to tests which only read the
+server, so they do not have to wait for a server to boot.
+"""
+
+import atexit
+import collections
+import threading
+
+from tempest.common.utils import data_utils
+from tempest import config
+from tempest import exceptions
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+# The pools of this process, keyed by _pool_key()
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ServerPool(object):
+    """
+    Boots size servers per (flavor, image) the first time one is leased and
+    hands them out until they are all leased, after which lease() misses.
+
+    Released servers which are still ACTIVE with their original name and
+    metadata go back into the pool as they are, the others are rebuilt.
+    """
+
+    def __init__(self, client, size):
+        self.client = client
+        self.size = size
+        # (flavor, image) -> list of free servers
+        self.free = {}
+        # server id -> ((flavor, image), server)
+        self.leased = {}
+        # server ids being rebuilt, waited for on their next lease
+        self.rebuilding = set()
+        self.stats = collections.Counter()
+        self.lock = threading.Lock()
+
+    def _delete(self, server_id):
+        try:
+            self.client.delete_server(server_id)
+        except exceptions.NotFound:
+            pass
+        except Exception:
+            LOG.exception("Failed to delete pooled server %s" % server_id)
+
+    def fill(self, flavor, image):
+        """Boots the servers of a (flavor, image) and waits for them."""
+        servers = []
+        for _ in range(self.size):
+            name = data_utils.rand_name('tempest-pool-instance')
+            try:
+                resp, server = self.client.create_server(name, image, flavor)
+            except Exception:
+                LOG.exception("Failed to boot a pooled server")
+                break
+            servers.append(server)
+        # NOTE: every create request is sent before waiting, so nova
+        # builds the servers in parallel
+        free = []
+        for server in servers:
+            try:
+                self.client.wait_for_server_status(server['id'], 'ACTIVE')
+                resp, server = self.client.get_server(server['id'])
+            except Exception:
+                LOG.exception("Pooled server %s failed to boot" %
+                              server['id'])
+                self._delete(server['id'])
+                continue
+            free.append(server)
+        self.stats['booted'] += len(free)
+        self.free[(flavor, image)] = free
+
+    def lease(self, flavor, image):
+        """
+        Returns a (resp, server) tuple of an ACTIVE server booted with the
+        flavor and image, or None if all of them are leased.
+        """
+        with self.lock:
+            key = (flavor, image)
+            if key not in self.free:
+                self.fill(flavor, image)
+            while self.free[key]:
+                server = self.free[key].pop()
+                try:
+                    if server['id'] in self.rebuilding:
+                        self.rebuilding.discard(server['id'])
+                        self.client.wait_for_server_status(server['id'],
+                                                           'ACTIVE')
+                    resp, body = self.client.get_server(server['id'])
+                except Exception:
+                    LOG.exception("Dropping pooled server %s" % server['id'])
+                    self._delete(server['id'])
+                    continue
+                self.leased[server['id']] = (key, server)
+                self.stats['hits'] += 1
+                return resp, body
+            self.stats['misses'] += 1
+            return None
+
+    def _is_unchanged(self, original, server):
+        return (server['status'] == 'ACTIVE' and
+                server['name'] == original['name'] and
+                server.get('metadata') == original.get('metadata'))
+
+    def release(self, server_id):
+        """Puts a leased server back in the pool, rebuilding it if needed."""
+        with self.lock:
+            key, original = self.leased.pop(server_id)
+            try:
+                resp, server = self.client.get_server(server_id)
+            except exceptions.NotFound:
+                self.stats['lost'] += 1
+                return
+            if self._is_unchanged(original, server):
+                self.stats['recycled'] += 1
+                self.free[key].append(original)
+                return
+            try:
+                self.client.rebuild(server_id, key[1], name=original['name'],
+                                    metadata={})
+            except Exception:
+                LOG.exception("Failed to rebuild pooled server %s" %
+                              server_id)
+                self._delete(server_id)
+                self.stats['lost'] += 1
+                return
+            self.stats['rebuilt'] += 1
+            self.rebuilding.add(server_id)
+            self.free[key].append(original)
+
+    def delete_all(self):
+        """Deletes every server of the pool and waits for them to be gone."""
+        with self.lock:
+            server_ids = [s['id'] for servers in self.free.values()
+                          for s in servers]
+            server_ids.extend(self.leased)
+            self.free.clear()
+            self.leased.clear()
+            self.rebuilding.clear()
+        for server_id in server_ids:
+            self._delete(server_id)
+        for server_id in server_ids:
+            try:
+                self.client.wait_for_server_termination(server_id)
+            except Exception:
+                pass
+
+
+def _pool_key(client):
+    return (client.__class__.__name__, client.user, client.tenant_name)
+
+
+def get_pool(client):
+    """Returns the pool of the client's user, tenant and interface."""
+    with _pools_lock:
+        key = _pool_key(client)
+        if key not in _pools:
+            # NOTE: the pool outlives the class which created it, whose
+            # client may still be used by its background cleanup
+            _pools[key] = ServerPool(client.clone(),
+                                     CONF.compute.server_pool_size)
+        return _pools[key]
+
+
+def delete_all():
+    """Logs the statistics of every pool and deletes their servers."""
+    with _pools_lock:
+        pools = _pools.values()
+        _pools.clear()
+    for pool in pools:
+        stats = pool.stats
+        LOG.info("Server pool of %s/%s: %d hits, %d misses, %d recycled, "
+                 "%d rebuilt, %d lost" %
+                 (pool.client.user, pool.client.tenant_name, stats['hits'],
+                  stats['misses'], stats['recycled'], stats['rebuilt'],
+                  stats['lost']))
+        pool.delete_all()
+
+
+atexit.register(delete_all)
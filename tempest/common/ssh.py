@@ -14,9 +14,14 @@
 #    under the License.
 
 
+import atexit
+import collections
 import cStringIO
+import os
+import re
 import select
 import socket
+import threading
 import time
 import warnings
 
@@ -31,6 +36,47 @@ with warnings.catch_warnings():
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: authenticated connections shared by all clients of this process,
+# keyed by Client._connection_key(). Every command gets its own channel on
+# the cached transport, so the TCP, key exchange and auth costs are paid once.
+_connections = {}
+_connections_lock = threading.Lock()
+
+# Default read size of exec_command_stream
+STREAM_BUF_SIZE = 64 * 1024
+
+
+def _is_alive(ssh):
+    transport = ssh.get_transport()
+    if transport is None or not transport.is_active():
+        return False
+    try:
+        transport.send_ignore()
+    except (socket.error, EOFError, paramiko.SSHException):
+        return False
+    return True
+
+
+def close_all():
+    """Closes all cached ssh connections."""
+    with _connections_lock:
+        connections = _connections.values()
+        _connections.clear()
+    for ssh in connections:
+        ssh.close()
+
+
+atexit.register(close_all)
+
+
+def _forward(consumer, chunk):
+    if consumer is None:
+        return
+    if hasattr(consumer, 'write'):
+        consumer.write(chunk)
+    else:
+        consumer(chunk)
+
 
 class Client(object):
 
@@ -92,37 +138,90 @@ class Client(object):
                             self.username, self.host, e, attempts, bsleep)
                 time.sleep(bsleep)
 
+    def _connection_key(self):
+        # NOTE: the pid is part of the key so that forked processes (e.g.
+        # stress workers) never share a transport with their parent.
+        pkey = self.pkey.get_fingerprint() if self.pkey is not None else None
+        return (os.getpid(), self.host, self.username, self.password,
+                self.key_filename, pkey)
+
+    def _get_cached_connection(self):
+        """Returns a live cached ssh connection, creating it if needed."""
+        key = self._connection_key()
+        with _connections_lock:
+            ssh = _connections.get(key)
+        if ssh is not None:
+            if _is_alive(ssh):
+                return ssh
+            LOG.info("Cached ssh connection to %s@%s is dead, reconnecting",
+                     self.username, self.host)
+            with _connections_lock:
+                if _connections.get(key) is ssh:
+                    del _connections[key]
+            ssh.close()
+        ssh = self._get_ssh_connection()
+        with _connections_lock:
+            cached = _connections.setdefault(key, ssh)
+        if cached is not ssh:
+            # Another thread connected meanwhile, use its connection
+            ssh.close()
+        return cached
+
+    def _open_channel(self, ssh):
+        transport = ssh.get_transport()
+        try:
+            # NOTE: without a timeout a blackholed cached transport would
+            # wait forever for the channel
+            return transport.open_session(timeout=self.channel_timeout)
+        except TypeError:
+            # older paramiko releases have no open_session timeout
+            return transport.open_session()
+
+    def _open_session(self):
+        ssh = self._get_cached_connection()
+        try:
+            return self._open_channel(ssh)
+        except (socket.error, EOFError, paramiko.SSHException):
+            LOG.info("Failed to open a channel to %s@%s, reconnecting",
+                     self.username, self.host)
+            self.close()
+            ssh = self._get_cached_connection()
+            return self._open_channel(ssh)
+
+    def close(self):
+        """Closes the cached ssh connection used by this client."""
+        with _connections_lock:
+            ssh = _connections.pop(self._connection_key(), None)
+        if ssh is not None:
+            ssh.close()
+
     def _is_timed_out(self, start_time):
         return (time.time() - self.timeout) > start_time
 
-    def exec_command(self, cmd):
+    def _run(self, cmd, on_out, on_err, buf_size, until=None):
         """
-        Execute the specified command on the server.
-
-        Note that this method is reading whole command outputs to memory, thus
-        shouldn't be used for large outputs.
+        Runs cmd in a new channel, passing output chunks of up to buf_size
+        bytes to on_out and on_err as they arrive.
 
-        :returns: data read from standard output of the command.
-        :raises: SSHExecCommandFailed if command returns nonzero
-                 status. The exception contains command status stderr content.
+        :returns: tuple of the exit status and the match of the until
+                  pattern. The exit status is None if the command was
+                  abandoned because its standard output matched until.
         """
-        ssh = self._get_ssh_connection()
-        transport = ssh.get_transport()
-        channel = transport.open_session()
+        channel = self._open_session()
         channel.fileno()  # Register event pipe
         channel.exec_command(cmd)
         channel.shutdown_write()
-        out_data = []
-        err_data = []
         poll = select.poll()
         poll.register(channel, select.POLLIN)
         start_time = time.time()
+        tail = ''
 
         while True:
             ready = poll.poll(self.channel_timeout)
             if not any(ready):
                 if not self._is_timed_out(start_time):
                     continue
+                channel.close()
                 raise exceptions.TimeoutException(
                     "Command: '{0}' executed on host '{1}'.".format(
                         cmd, self.host))
@@ -130,21 +229,95 @@ class Client(object):
                 continue
             out_chunk = err_chunk = None
             if channel.recv_ready():
-                out_chunk = channel.recv(self.buf_size)
-                out_data += out_chunk,
+                out_chunk = channel.recv(buf_size)
+                on_out(out_chunk)
+                if until is not None:
+                    # NOTE: keep the previous chunk so that matches
+                    # spanning two chunks are found as well
+                    window = tail + out_chunk
+                    match = until.search(window)
+                    if match is not None:
+                        channel.close()
+                        return None, match
+                    tail = window[-buf_size:]
             if channel.recv_stderr_ready():
-                err_chunk = channel.recv_stderr(self.buf_size)
-                err_data += err_chunk,
+                err_chunk = channel.recv_stderr(buf_size)
+                on_err(err_chunk)
             if channel.closed and not err_chunk and not out_chunk:
                 break
         exit_status = channel.recv_exit_status()
+        channel.close()
+        return exit_status, None
+
+    def exec_command(self, cmd):
+        """
+        Execute the specified command on the server.
+
+        The command runs in a new channel of the cached connection to the
+        host. Note that this method is reading whole command outputs to
+        memory, thus shouldn't be used for large outputs, see
+        exec_command_stream for those.
+
+        :returns: data read from standard output of the command.
+        :raises: SSHExecCommandFailed if command returns nonzero
+                 status. The exception contains command status stderr content.
+        """
+        out_data = []
+        err_data = []
+        exit_status, _ = self._run(cmd, out_data.append, err_data.append,
+                                   self.buf_size)
         if 0 != exit_status:
             raise exceptions.SSHExecCommandFailed(
                 command=cmd, exit_status=exit_status,
                 strerror=''.join(err_data))
         return ''.join(out_data)
 
+    def exec_command_stream(self, cmd, stdout=None, stderr=None,
+                            buf_size=STREAM_BUF_SIZE, until=None):
+        """
+        Execute the specified command on the server, streaming its output.
+
+        Output is forwarded in chunks of up to buf_size bytes as it arrives
+        instead of being collected in memory. stdout and stderr may each be
+        a callable taking a chunk or a file-like object; output without a
+        consumer is discarded.
+
+        :param until: optional regular expression (string or compiled). The
+                      command is abandoned as soon as its standard output
+                      matches it.
+        :returns: the match object of until, or None if the command exited.
+        :raises: SSHExecCommandFailed if command returns nonzero
+                 status. The exception contains the last buf_size bytes of
+                 stderr content.
+        """
+        if isinstance(until, basestring):
+            until = re.compile(until)
+        err_tail = collections.deque(maxlen=2)
+
+        def on_err(chunk):
+            err_tail.append(chunk)
+            _forward(stderr, chunk)
+
+        exit_status, match = self._run(cmd,
+                                       lambda chunk: _forward(stdout, chunk),
+                                       on_err, buf_size, until)
+        if exit_status:
+            raise exceptions.SSHExecCommandFailed(
+                command=cmd, exit_status=exit_status,
+                strerror=''.join(err_tail)[-buf_size:])
+        return match
+
     def test_connection_auth(self):
-        """Raises an exception when we can not connect to server via ssh."""
-        connection = self._get_ssh_connection()
-        connection.close()
+        """Raises an exception when we can not connect to server via ssh.
+
+        A new connection is always authenticated, as a cached one may date
+        from before the server was rebuilt or rebooted, and then replaces
+        the cached one.
+        """
+        ssh = self._get_ssh_connection()
+        key = self._connection_key()
+        with _connections_lock:
+            cached = _connections.get(key)
+            _connections[key] = ssh
+        if cached is not None:
+            cached.close()
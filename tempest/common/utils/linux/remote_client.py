@@ -10,15 +10,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+from multiprocessing import pool
+import operator
 import re
 import time
 
 from tempest.common.ssh import Client
 from tempest import config
 from tempest.exceptions import ServerUnreachable
+from tempest.exceptions import TimeoutException
 
 CONF = config.CONF
 
+FanOutResult = collections.namedtuple('FanOutResult',
+                                      ['host', 'value', 'error', 'duration'])
+
 
 class RemoteClient():
 
@@ -90,6 +97,73 @@ class RemoteClient():
         cmd = 'ping -c1 -w1 %s' % host
         return self.ssh_client.exec_command(cmd)
 
+    def ping_hosts(self, hosts):
+        """
+        Pings all hosts at once with a single remote command and returns a
+        dict mapping each host to whether it answered.
+        """
+        cmd = ('for host in %s; do '
+               '(ping -c1 -w1 $host >/dev/null 2>&1 && echo "$host ok" || '
+               'echo "$host failed") & done; wait' % ' '.join(hosts))
+        output = self.ssh_client.exec_command(cmd)
+        results = dict((host, False) for host in hosts)
+        for line in output.splitlines():
+            host, _, status = line.strip().partition(' ')
+            if host in results:
+                results[host] = status == 'ok'
+        return results
+
     def get_mac_address(self):
         cmd = "/sbin/ifconfig | awk '/HWaddr/ {print $5}'"
         return self.ssh_client.exec_command(cmd)
+
+
+def fan_out(clients, check, timeout=None, concurrency=32):
+    """Run the same check on many RemoteClients concurrently.
+
+    :param check: a callable taking a RemoteClient, or the name of a
+                  RemoteClient method such as 'get_partitions'.
+    :param timeout: seconds each host gets, counted from the start of its
+                    check, before it is reported as timed out.
+    :param concurrency: maximum number of checks running at the same time.
+    :returns: list of the FanOutResult of every client, in the order of
+              clients, holding its host, the value returned by the check or
+              the exception it raised, and the duration of the check in
+              seconds.
+    """
+    if isinstance(check, basestring):
+        check = operator.methodcaller(check)
+    # index of the client -> start time of its check
+    started = {}
+
+    def run(index, client):
+        started[index] = time.time()
+        try:
+            value, error = check(client), None
+        except Exception as exc:
+            value, error = None, exc
+        return FanOutResult(client.ssh_client.host, value, error,
+                            time.time() - started[index])
+
+    workers = pool.ThreadPool(max(1, min(concurrency, len(clients))))
+    pending = [workers.apply_async(run, (index, client))
+               for (index, client) in enumerate(clients)]
+    # NOTE: the pool is not joined, so a hung check only keeps its own
+    # worker thread busy until the ssh timeout of its client expires
+    workers.close()
+    results = []
+    for (index, (client, async_result)) in enumerate(zip(clients, pending)):
+        if timeout is None:
+            async_result.wait()
+        else:
+            while index not in started and not async_result.ready():
+                async_result.wait(0.1)
+            async_result.wait(max(0, started[index] + timeout - time.time()))
+        if async_result.ready():
+            results.append(async_result.get())
+        else:
+            host = client.ssh_client.host
+            error = TimeoutException("Check on host '%s' did not finish "
+                                     "within %s seconds." % (host, timeout))
+            results.append(FanOutResult(host, None, error, timeout))
+    return results
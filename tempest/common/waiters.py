@@ -21,23 +21,24 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
+def _get_task_state(client, body):
+    if client.service == CONF.compute.catalog_v3_type:
+        task_state = body.get("os-extended-status:task_state", None)
+    else:
+        task_state = body.get('OS-EXT-STS:task_state', None)
+    return task_state
+
+
 # NOTE(afazekas): This function needs to know a token and a subject.
 def wait_for_server_status(client, server_id, status, ready_wait=True,
                            extra_timeout=0, raise_on_error=True):
     """Waits for a server to reach a given status."""
 
-    def _get_task_state(body):
-        if client.service == CONF.compute.catalog_v3_type:
-            task_state = body.get("os-extended-status:task_state", None)
-        else:
-            task_state = body.get('OS-EXT-STS:task_state', None)
-        return task_state
-
     # NOTE(afazekas): UNKNOWN status possible on ERROR
     # or in a very early stage.
     resp, body = client.get_server(server_id)
     old_status = server_status = body['status']
-    old_task_state = task_state = _get_task_state(body)
+    old_task_state = task_state = _get_task_state(client, body)
     start_time = int(time.time())
     timeout = client.build_timeout + extra_timeout
     while True:
@@ -64,7 +65,7 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
         time.sleep(client.build_interval)
         resp, body = client.get_server(server_id)
         server_status = body['status']
-        task_state = _get_task_state(body)
+        task_state = _get_task_state(client, body)
         if (server_status != old_status) or (task_state != old_task_state):
             LOG.info('State transition "%s" ==> "%s" after %d second wait',
                      '/'.join((old_status, str(old_task_state))),
@@ -91,6 +92,51 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
         old_task_state = task_state
 
 
+def wait_for_servers_status(client, server_ids, status):
+    """Waits for a group of servers to reach a given status.
+
+    The servers are polled together with one detailed server list per
+    build_interval instead of one get_server call per server. Like
+    wait_for_server_status, it fails as soon as one of the servers goes
+    to ERROR or disappears.
+    """
+    pending = set(server_ids)
+    start_time = int(time.time())
+    waited = False
+    while True:
+        resp, body = client.list_servers_with_detail()
+        listed = set()
+        for server in body['servers']:
+            if server['id'] not in pending:
+                continue
+            listed.add(server['id'])
+            if server['status'] == 'ERROR':
+                raise exceptions.BuildErrorException(server_id=server['id'])
+            # NOTE: same "ready for action" check as wait_for_server_status
+            if (server['status'] == status and
+                    str(_get_task_state(client, server)) == "None"):
+                pending.discard(server['id'])
+        missing = pending - listed
+        if missing:
+            raise exceptions.NotFound('Servers %s disappeared while waiting '
+                                      'for them to reach %s status' %
+                                      (', '.join(sorted(missing)), status))
+        if not pending:
+            if waited:
+                # without state api extension 3 sec usually enough
+                time.sleep(CONF.compute.ready_wait)
+            return
+        if int(time.time()) - start_time >= client.build_timeout:
+            message = ('Servers %(server_ids)s failed to reach %(status)s '
+                       'status within the required time (%(timeout)s s).' %
+                       {'server_ids': ', '.join(sorted(pending)),
+                        'status': status,
+                        'timeout': client.build_timeout})
+            raise exceptions.TimeoutException(message)
+        time.sleep(client.build_interval)
+        waited = True
+
+
 def wait_for_image_status(client, image_id, status):
     """Waits for an image to reach a given status.
 
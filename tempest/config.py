@@ -204,7 +204,25 @@ ComputeGroup = [
                     'for removing from a host.  -1 never offload, 0 offload '
                     'when shelved. This time should be the same as the time '
                     'of nova.conf, and some tests will run for as long as the '
-                    'time.')
+                    'time.'),
+    cfg.StrOpt('response_validation',
+               default='off',
+               help="How the compute clients validate responses against "
+                    "their schemas: off, sampled (validate one in "
+                    "response_validation_sample_rate responses) or full. "
+                    "Set it to full in the gate jobs which check the API "
+                    "responses, or to sampled to check some of them at a "
+                    "fraction of the cost."),
+    cfg.IntOpt('response_validation_sample_rate',
+               default=10,
+               help="Validate one in this many compute responses when "
+                    "response_validation is sampled."),
+    cfg.IntOpt('server_pool_size',
+               default=0,
+               help="Number of servers booted ahead of time per flavor and "
+                    "image for the tests which only read their server. "
+                    "The pool is disabled if 0 or if tenant isolation is "
+                    "used."),
 ]
 
 compute_features_group = cfg.OptGroup(name='compute-feature-enabled',
@@ -283,7 +301,12 @@ ImageGroup = [
     cfg.StrOpt('http_image',
                default='http://download.cirros-cloud.net/0.3.1/'
                'cirros-0.3.1-x86_64-uec.tar.gz',
-               help='http accessible image')
+               help='http accessible image'),
+    cfg.StrOpt('schema_cache_dir',
+               default=None,
+               help='Directory used to persist the image API v2 schemas '
+                    'across runs. Schemas are only cached in memory if not '
+                    'set.')
 ]
 
 image_feature_group = cfg.OptGroup(name='image-feature-enabled',
@@ -584,9 +607,21 @@ StressGroup = [
     cfg.IntOpt('log_check_interval',
                default=60,
                help='time (in seconds) between log file error checks.'),
+    cfg.StrOpt('target_log_whitelist',
+               default=None,
+               help='Path to a YAML whitelist of known log errors, in the '
+                    'format used by etc/whitelist.yaml.'),
     cfg.IntOpt('default_thread_number_per_action',
                default=4,
                help='The number of threads created while stress test.'),
+    cfg.IntOpt('metrics_port',
+               default=None,
+               help='Port of the HTTP endpoint serving the statistics of '
+                    'running stress actions in the Prometheus text format. '
+                    'The endpoint is disabled if not set.'),
+    cfg.StrOpt('metrics_host',
+               default='127.0.0.1',
+               help='Address the stress metrics endpoint listens on.'),
     cfg.BoolOpt('leave_dirty_stack',
                 default=False,
                 help='Prevent the cleaning (tearDownClass()) between'
@@ -618,7 +653,39 @@ ScenarioGroup = [
         'large_ops_number',
         default=0,
         help="specifies how many resources to request at once. Used "
-        "for large operations testing.")
+        "for large operations testing."),
+    cfg.BoolOpt('image_cache',
+                default=False,
+                help="Share the images uploaded from img_dir between the "
+                     "tests, and reuse the public images of earlier runs "
+                     "with the same data and properties. Disabled if "
+                     "tenant isolation is used."),
+    cfg.BoolOpt('keep_cached_images',
+                default=False,
+                help="Leave the images uploaded by the image cache after "
+                     "the run, for later runs to reuse them. The workers "
+                     "coordinate the deletion of the images under "
+                     "lock_path, if it is not set the images are always "
+                     "left and have to be deleted out of band."),
+    cfg.IntOpt('lb_load_requests',
+               default=10,
+               help="Number of HTTP requests the load balancer scenario "
+                    "sends to the VIP."),
+    cfg.IntOpt('lb_load_concurrency',
+               default=1,
+               help="Number of concurrent connections the load balancer "
+                    "scenario sends its requests over. The backends it "
+                    "starts serve one connection at a time, only raise it "
+                    "with images whose backends handle more."),
+    cfg.FloatOpt('lb_load_max_p95',
+                 default=0.0,
+                 help="Maximum 95th percentile latency in seconds of the "
+                      "requests to the VIP, not checked if 0."),
+    cfg.IntOpt('console_output_lines',
+               default=200,
+               help="Number of lines at the end of the console output of "
+                    "the servers of a failed scenario which are logged and "
+                    "attached to its result, all of them if 0."),
 ]
 
 
@@ -665,6 +732,20 @@ DebugGroup = [
     cfg.BoolOpt('enable',
                 default=True,
                 help="Enable diagnostic commands"),
+    cfg.IntOpt('snapshot_concurrency',
+               default=16,
+               help="Number of diagnostic commands run at the same time "
+                    "when collecting a network snapshot."),
+    cfg.StrOpt('snapshot_dir',
+               default=None,
+               help="Directory to write the network snapshot of every "
+                    "failure to, as compressed JSON. Not written if "
+                    "unset."),
+    cfg.StrOpt('baseline_snapshot',
+               default=None,
+               help="Network snapshot written to snapshot_dir by an "
+                    "earlier run, if set only the differences with it "
+                    "are logged."),
 ]
 
 input_scenario_group = cfg.OptGroup(name="input-scenario",
@@ -698,6 +779,55 @@ BaremetalGroup = [
                help="Catalog type of the baremetal provisioning service."),
 ]
 
+discovery_group = cfg.OptGroup(name='discovery',
+                               title="Extension Discovery Options")
+
+DiscoveryGroup = [
+    cfg.StrOpt('extensions_cache_file',
+               default=None,
+               help="File shared by all test workers to store the "
+                    "extensions discovered for the services whose "
+                    "extension list is set to the special entry discover. "
+                    "Every worker queries the APIs itself if not set."),
+    cfg.IntOpt('extensions_cache_ttl',
+               default=3600,
+               help="Seconds after which the extensions cache file is "
+                    "discovered again, 0 to keep it forever."),
+]
+
+negative_group = cfg.OptGroup(name='negative',
+                              title="Negative Test Options")
+
+NegativeGroup = [
+    cfg.StrOpt('cache_dir',
+               default=None,
+               help="Directory used to persist the parsed negative test "
+                    "descriptions and their generated payloads across "
+                    "runs. They are only cached in memory if not set."),
+    cfg.IntOpt('batch_concurrency',
+               default=0,
+               help="If greater than 0, the first negative auto test of a "
+                    "class sends the requests of all its scenarios with "
+                    "this many concurrent requests, and every test only "
+                    "checks its own response."),
+]
+
+cleanup_group = cfg.OptGroup(name='cleanup',
+                             title="Test Resource Cleanup Options")
+
+CleanupGroup = [
+    cfg.BoolOpt('background',
+                default=False,
+                help="Wait for the deletion of the resources of finished "
+                     "test classes in background threads while the next "
+                     "class runs. The resources whose deletion fails are "
+                     "reported when the worker exits."),
+    cfg.IntOpt('concurrency',
+               default=4,
+               help="Number of threads waiting for deletions in the "
+                    "background."),
+]
+
 cli_group = cfg.OptGroup(name='cli', title="cli Configuration Options")
 
 CLIGroup = [
@@ -780,6 +910,9 @@ class TempestConfigPrivate(object):
         register_opt_group(cfg.CONF, debug_group, DebugGroup)
         register_opt_group(cfg.CONF, baremetal_group, BaremetalGroup)
         register_opt_group(cfg.CONF, input_scenario_group, InputScenarioGroup)
+        register_opt_group(cfg.CONF, discovery_group, DiscoveryGroup)
+        register_opt_group(cfg.CONF, cleanup_group, CleanupGroup)
+        register_opt_group(cfg.CONF, negative_group, NegativeGroup)
         register_opt_group(cfg.CONF, cli_group, CLIGroup)
         self.compute = cfg.CONF.compute
         self.compute_feature_enabled = cfg.CONF['compute-feature-enabled']
@@ -806,6 +939,9 @@ class TempestConfigPrivate(object):
         self.debug = cfg.CONF.debug
         self.baremetal = cfg.CONF.baremetal
         self.input_scenario = cfg.CONF['input-scenario']
+        self.discovery = cfg.CONF.discovery
+        self.cleanup = cfg.CONF.cleanup
+        self.negative = cfg.CONF.negative
         self.cli = cfg.CONF.cli
         if not self.compute_admin.username:
             self.compute_admin.username = self.identity.admin_username
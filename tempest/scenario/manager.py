@@ -14,9 +14,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import logging
+import multiprocessing.pool
 import os
-import subprocess
+import sys
+import time
 
 # Default client libs
 import cinderclient.client
@@ -32,6 +35,9 @@ from novaclient import exceptions as nova_exceptions
 import swiftclient
 
 from tempest.api.network import common as net_common
+from tempest.common import console_capture
+from tempest.common import icmp
+from tempest.common import image_cache
 from tempest.common import isolated_creds
 from tempest.common.utils import data_utils
 from tempest.common.utils.linux.remote_client import RemoteClient
@@ -52,6 +58,13 @@ LOG_nova_client.addHandler(log.NullHandler())
 LOG_cinder_client = logging.getLogger('cinderclient.client')
 LOG_cinder_client.addHandler(log.NullHandler())
 
+# The outcome of a (source, destination, expected) connectivity check. The
+# source is None for checks from the test host and duration is the number
+# of seconds it took the check to pass, or None if it did not pass.
+ConnectivityResult = collections.namedtuple(
+    'ConnectivityResult',
+    ['source', 'destination', 'expected', 'passed', 'duration'])
+
 
 class OfficialClientManager(tempest.manager.Manager):
     """
@@ -276,47 +289,163 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         return cls._get_credentials(cls.isolated_creds.get_admin_creds,
                                     'admin_')
 
+    @staticmethod
+    def _is_not_found(exc):
+        # add status code as workaround for bug 1247568
+        return (exc.__class__.__name__ == 'NotFound' or
+                getattr(exc, 'status_code', None) == 404)
+
+    @staticmethod
+    def _resource_client(thing):
+        # The client a resource is deleted through: neutron resources keep
+        # it as client, the official client objects get it from their
+        # manager
+        client = getattr(thing, 'client', None)
+        if client is None:
+            client = getattr(getattr(thing, 'manager', None), 'api', None)
+        return client
+
     @classmethod
-    def tearDownClass(cls):
-        # NOTE(jaypipes): Because scenario tests are typically run in a
-        # specific order, and because test methods in scenario tests
-        # generally create resources in a particular order, we destroy
-        # resources in the reverse order in which resources are added to
-        # the scenario test class object
-        while cls.os_resources:
-            thing = cls.os_resources.pop()
+    def _deletion_waves(cls, resources):
+        """
+        Splits the resources, in reverse creation order, into waves of
+        consecutive resources of the same type. Those never depend on each
+        other, while a resource may depend on any resource created before
+        it, so each wave is only deleted once the previous one is gone.
+        """
+        waves = []
+        for thing in reversed(resources):
+            if waves and type(waves[-1][0]) is type(thing):
+                waves[-1].append(thing)
+            else:
+                waves.append([thing])
+        return waves
+
+    @classmethod
+    def _delete_wave(cls, wave, concurrency=8):
+        """
+        Deletes the resources of a wave concurrently. The network client is
+        not thread safe, so the neutron resources of the network client are
+        spread across workers which each get a network client of their own,
+        like in _map_network_calls. The other clients cannot be cloned, so
+        their resources are deleted one after the other per client.
+        """
+        network = []
+        by_client = collections.OrderedDict()
+        for thing in wave:
+            client = cls._resource_client(thing)
+            if client is not None and client is cls.network_client:
+                network.append(thing)
+            else:
+                by_client.setdefault(id(client), []).append(thing)
+        # (client to delete through or None for their own, resources)
+        groups = [(None, things) for things in by_client.values()]
+        if network:
+            workers = max(1, min(concurrency, len(network)))
+            clients = [None]
+            clients.extend(cls.manager._get_network_client()
+                           for _ in range(workers - 1))
+            groups.extend(zip(clients, [network[i::workers]
+                                        for i in range(workers)]))
+
+        def delete(thing):
             LOG.debug("Deleting %r from shared resources of %s" %
                       (thing, cls.__name__))
-
             try:
                 # OpenStack resources are assumed to have a delete()
                 # method which destroys the resource...
                 thing.delete()
             except Exception as e:
-                # If the resource is already missing, mission accomplished.
-                # add status code as workaround for bug 1247568
-                if (e.__class__.__name__ == 'NotFound' or
-                    hasattr(e, 'status_code') and e.status_code == 404):
-                    continue
-                raise
+                # If the resource is already missing, mission
+                # accomplished.
+                if not cls._is_not_found(e):
+                    return e
+
+        def work(args):
+            client, things = args
+            for thing in things:
+                if client is None:
+                    error = delete(thing)
+                else:
+                    own_client = thing.client
+                    thing.client = client
+                    try:
+                        error = delete(thing)
+                    finally:
+                        thing.client = own_client
+                if error is not None:
+                    return error
+
+        workers = multiprocessing.pool.ThreadPool(len(groups))
+        try:
+            errors = workers.map(work, groups)
+        finally:
+            workers.close()
+            workers.join()
+        for error in errors:
+            if error is not None:
+                raise error
 
-            def is_deletion_complete():
-                # Deletion testing is only required for objects whose
-                # existence cannot be checked via retrieval.
-                if isinstance(thing, dict):
+    @classmethod
+    def _wait_for_wave_deletion(cls, wave, timeout=10):
+        """
+        Waits up to timeout seconds for the deletion of a wave, checking
+        all resources of a manager with a single list call per attempt.
+        """
+        # Deletion testing is only required for objects whose existence
+        # cannot be checked via retrieval.
+        pending = [thing for thing in wave if not isinstance(thing, dict)]
+
+        def is_deleted(thing):
+            try:
+                thing.get()
+            except Exception as e:
+                # Clients are expected to return an exception called
+                # 'NotFound' if retrieval fails.
+                if e.__class__.__name__ == 'NotFound':
                     return True
+                raise
+            return False
+
+        def is_deletion_complete():
+            by_manager = collections.OrderedDict()
+            for thing in pending:
+                manager = getattr(thing, 'manager', None)
+                by_manager.setdefault(id(manager), (manager, []))[1].append(
+                    thing)
+            remaining = []
+            for (manager, things) in by_manager.values():
                 try:
-                    thing.get()
-                except Exception as e:
-                    # Clients are expected to return an exception
-                    # called 'NotFound' if retrieval fails.
-                    if e.__class__.__name__ == 'NotFound':
-                        return True
-                    raise
-                return False
+                    existing = set(r.id for r in manager.list())
+                except Exception:
+                    existing = None
+                for thing in things:
+                    if existing is None:
+                        deleted = is_deleted(thing)
+                    else:
+                        deleted = thing.id not in existing
+                    if not deleted:
+                        remaining.append(thing)
+            pending[:] = remaining
+            return not pending
+
+        if pending:
+            tempest.test.call_until_true(is_deletion_complete, timeout, 1)
 
-            # Block until resource deletion has completed or timed-out
-            tempest.test.call_until_true(is_deletion_complete, 10, 1)
+    @classmethod
+    def tearDownClass(cls):
+        # NOTE(jaypipes): Because scenario tests are typically run in a
+        # specific order, and because test methods in scenario tests
+        # generally create resources in a particular order, we destroy
+        # resources in the reverse order in which resources are added to
+        # the scenario test class object
+        for wave in cls._deletion_waves(cls.os_resources):
+            cls._delete_wave(wave)
+            # Block until the deletion of the wave has completed or
+            # timed-out
+            cls._wait_for_wave_deletion(wave)
+            for thing in wave:
+                cls.os_resources.remove(thing)
         cls.isolated_creds.clear_isolated_creds()
         super(OfficialClientTest, cls).tearDownClass()
 
@@ -519,6 +648,20 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         self.set_resource(name, keypair)
         return keypair
 
+    def _image_create_cached(self, name, fmt, path, properties=None):
+        """
+        Returns the id of a shared image of the file at path from the image
+        cache, released when the test ends, or None if the cache is
+        disabled and the test has to upload the image itself.
+        """
+        if not image_cache.enabled():
+            return None
+        cache = image_cache.get_cache()
+        image_id = cache.get_image(self.image_client, name, fmt, path,
+                                   properties)
+        self.addCleanup(cache.release, image_id)
+        return image_id
+
     def get_remote_client(self, server_or_ip, username=None, private_key=None):
         if isinstance(server_or_ip, basestring):
             ip = server_or_ip
@@ -532,11 +675,18 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         return RemoteClient(ip, username, pkey=private_key)
 
     def _log_console_output(self, servers=None):
+        """
+        Logs the tail of the console output of the servers and attaches it
+        compressed to the test result. The outputs are fetched right away,
+        as the cleanups of the test delete the servers.
+        """
         if not servers:
             servers = self.compute_client.servers.list()
-        for server in servers:
-            LOG.debug('Console output for %s', server.id)
-            LOG.debug(server.get_console_output())
+        captures = console_capture.capture(
+            servers, CONF.scenario.console_output_lines)
+        for (server, data) in captures:
+            self.addDetail('console-output-%s.gz' % server.id,
+                           console_capture.as_content(data))
 
 
 class NetworkScenarioTest(OfficialClientTest):
@@ -705,18 +855,166 @@ class NetworkScenarioTest(OfficialClientTest):
         self.assertEqual(None, floating_ip.port_id)
         return floating_ip
 
-    def _ping_ip_address(self, ip_address, should_succeed=True):
-        cmd = ['ping', '-c1', '-w1', ip_address]
+    def _map_network_calls(self, func, items, concurrency=8,
+                           on_result=None):
+        """
+        Returns [func(client, item) for item in items], running the calls
+        concurrently. The network client is not thread safe, so every
+        worker gets a client of its own.
+
+        All calls are made even if some fail, on_result(item, result) is
+        called for every call which succeeded, e.g. to register the
+        resources it created for cleanup, and then the first error is
+        raised.
+        """
+        workers = max(1, min(concurrency, len(items)))
+        clients = [self.network_client]
+        clients.extend(self.manager._get_network_client()
+                       for _ in range(workers - 1))
+        chunks = [items[i::workers] for i in range(workers)]
+
+        def call(client, item):
+            try:
+                return func(client, item), None
+            except Exception:
+                return None, sys.exc_info()
+
+        def work(args):
+            client, chunk = args
+            return [call(client, item) for item in chunk]
+
+        pool = multiprocessing.pool.ThreadPool(workers)
+        try:
+            results = pool.map(work, zip(clients, chunks))
+        finally:
+            pool.close()
+            pool.join()
+        # undo the striping of items across the workers
+        ordered = [None] * len(items)
+        for (i, chunk_results) in enumerate(results):
+            ordered[i::workers] = chunk_results
+        errors = [error for (_, error) in ordered if error is not None]
+        if on_result is not None:
+            for (item, (result, error)) in zip(items, ordered):
+                if error is None:
+                    on_result(item, result)
+        if errors:
+            raise errors[0][0], errors[0][1], errors[0][2]
+        return [result for (result, _) in ordered]
+
+    def _get_server_port_ids(self, servers):
+        """Returns the id of the port of every server, with one call."""
+        result = self.network_client.list_ports(
+            device_id=[server.id for server in servers])
+        ports = collections.defaultdict(list)
+        for port in result.get('ports', []):
+            ports[port['device_id']].append(port['id'])
+        for server in servers:
+            self.assertEqual(len(ports[server.id]), 1,
+                             "Unable to determine which port to target "
+                             "for server %s." % server.id)
+        return [ports[server.id][0] for server in servers]
+
+    def _create_floating_ips(self, servers, external_network_id,
+                             wait=True):
+        """
+        Creates a floating ip associated with the port of every server,
+        concurrently, and waits for all of them to become ACTIVE.
+        Returns the floating ips in the order of servers.
+        """
+        port_ids = self._get_server_port_ids(servers)
+
+        def create(client, args):
+            server, port_id = args
+            body = dict(
+                floatingip=dict(
+                    floating_network_id=external_network_id,
+                    port_id=port_id,
+                    tenant_id=server.tenant_id,
+                )
+            )
+            return client.create_floatingip(body=body)['floatingip']
+
+        floating_ips = []
+
+        def register(item, result):
+            # NOTE: registered even if other creations failed, so that
+            # the floating ips created do not leak
+            floating_ip = net_common.DeletableFloatingIp(
+                client=self.network_client, **result)
+            self.set_resource(data_utils.rand_name('floatingip-'),
+                              floating_ip)
+            floating_ips.append(floating_ip)
+
+        self._map_network_calls(create, zip(servers, port_ids),
+                                on_result=register)
+        if wait:
+            self._wait_for_floating_ips_status(floating_ips, 'ACTIVE')
+        return floating_ips
+
+    def _associate_floating_ips(self, floating_ips, servers, wait=True):
+        """
+        Associates every floating ip with the port of the server at the
+        same position, concurrently, and waits for all of them to become
+        ACTIVE.
+        """
+        port_ids = self._get_server_port_ids(servers)
+
+        def associate(client, args):
+            floating_ip, port_id = args
+            body = dict(floatingip=dict(port_id=port_id))
+            return client.update_floatingip(floating_ip.id,
+                                            body=body)['floatingip']
+
+        results = self._map_network_calls(associate,
+                                          zip(floating_ips, port_ids))
+        for (floating_ip, port_id, result) in zip(floating_ips, port_ids,
+                                                  results):
+            # NOTE: DeletableFloatingIp.update() would update it again
+            dict.update(floating_ip, result)
+            self.assertEqual(port_id, floating_ip.port_id)
+        if wait:
+            self._wait_for_floating_ips_status(floating_ips, 'ACTIVE')
+        return floating_ips
+
+    def _wait_for_floating_ips_status(self, floating_ips, status):
+        """
+        Waits for all floating ips to reach status, polling them with a
+        single list call per attempt. Floating ips without a status, as
+        reported by older plugins, are considered to have reached it.
+        """
+        ids = [floating_ip.id for floating_ip in floating_ips]
+        pending = set(ids)
+
+        def check_statuses():
+            result = self.network_client.list_floatingips(id=ids)
+            for floating_ip in result['floatingips']:
+                if floating_ip.get('status', status) == status:
+                    pending.discard(floating_ip['id'])
+            return not pending
+
+        if not tempest.test.call_until_true(check_statuses,
+                                            CONF.compute.build_timeout,
+                                            CONF.compute.build_interval):
+            self.fail("Floating ips %s did not become %s within %d seconds"
+                      % (sorted(pending), status,
+                         CONF.compute.build_timeout))
 
-        def ping():
-            proc = subprocess.Popen(cmd,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-            proc.wait()
-            return (proc.returncode == 0) == should_succeed
+    def _ping_ip_address(self, ip_address, should_succeed=True):
+        return icmp.ping_ip_address(ip_address, should_succeed,
+                                    CONF.compute.ping_timeout)
 
-        return tempest.test.call_until_true(
-            ping, CONF.compute.ping_timeout, 1)
+    def _ping_ip_addresses(self, ip_addresses, should_succeed=True):
+        """
+        Probes the addresses concurrently and returns a dict mapping every
+        address to the seconds it took to become reachable, or unreachable
+        if should_succeed is False, or to None if it did not in time.
+        """
+        if should_succeed:
+            return icmp.wait_for_reachable(ip_addresses,
+                                           CONF.compute.ping_timeout)
+        return icmp.wait_for_unreachable(ip_addresses,
+                                         CONF.compute.ping_timeout)
 
     def _create_pool(self, lb_method, protocol, subnet_id):
         """Wrapper utility that returns a test pool."""
@@ -798,6 +1096,107 @@ class NetworkScenarioTest(OfficialClientTest):
                                                   private_key)
             linux_client.validate_authentication()
 
+    def _poll_local_connectivity(self, expected, timeout):
+        durations = {}
+        for should_succeed in (True, False):
+            destinations = [d for (d, s) in expected.iteritems()
+                            if s == should_succeed]
+            if not destinations:
+                continue
+            if should_succeed:
+                results = icmp.wait_for_reachable(destinations, timeout)
+            else:
+                results = icmp.wait_for_unreachable(destinations, timeout)
+            durations.update((d, t) for (d, t) in results.iteritems()
+                             if t is not None)
+        return durations
+
+    def _poll_remote_connectivity(self, source, expected, timeout):
+        durations = {}
+        pending = dict(expected)
+        start = time.time()
+        while pending:
+            try:
+                reached = source.ping_hosts(sorted(pending))
+            except exceptions.SSHExecCommandFailed as exc:
+                LOG.debug(exc)
+                reached = {}
+            except Exception:
+                LOG.exception("Failed to ping from %s" %
+                              source.ssh_client.host)
+                break
+            for (destination, should_succeed) in pending.items():
+                if reached.get(destination, False) == should_succeed:
+                    durations[destination] = time.time() - start
+                    del pending[destination]
+            if not pending or time.time() - start >= timeout:
+                break
+            time.sleep(1)
+        return durations
+
+    def _check_connectivity_matrix(self, checks, timeout=None):
+        """
+        Runs connectivity checks given as (source, destination,
+        should_succeed) tuples, where source is a RemoteClient, or None to
+        ping from the test host.
+
+        All pending destinations of a source are pinged at once, by a
+        single command over its ssh connection, every second until its
+        checks pass or timeout. The sources are checked in parallel.
+        Returns a dict mapping every (source host, destination) to its
+        ConnectivityResult.
+        """
+        if timeout is None:
+            timeout = CONF.compute.ping_timeout
+        # source host -> (source, {destination: should_succeed})
+        groups = collections.OrderedDict()
+        for (source, destination, should_succeed) in checks:
+            host = source.ssh_client.host if source is not None else None
+            groups.setdefault(host, (source, {}))[1][destination] = (
+                should_succeed)
+
+        def poll(group):
+            source, expected = group
+            if source is None:
+                return self._poll_local_connectivity(expected, timeout)
+            return self._poll_remote_connectivity(source, expected, timeout)
+
+        workers = multiprocessing.pool.ThreadPool(max(1, len(groups)))
+        try:
+            durations = workers.map(poll, groups.values())
+        finally:
+            workers.close()
+            workers.join()
+        matrix = {}
+        for ((host, (_, expected)), group_durations) in zip(groups.items(),
+                                                            durations):
+            for (destination, should_succeed) in expected.iteritems():
+                duration = group_durations.get(destination)
+                matrix[(host, destination)] = ConnectivityResult(
+                    host, destination, should_succeed, duration is not None,
+                    duration)
+        return matrix
+
+    def _assert_connectivity_matrix(self, checks, timeout=None):
+        """
+        Runs _check_connectivity_matrix and fails with the list of the
+        checks which did not pass. Returns the result matrix.
+        """
+        matrix = self._check_connectivity_matrix(checks, timeout)
+        failures = []
+        for result in sorted(matrix.values()):
+            LOG.debug("Connectivity %s -> %s expected %s: %s in %s s" %
+                      (result.source or 'test host', result.destination,
+                       result.expected, result.passed, result.duration))
+            if not result.passed:
+                failures.append("%s %s reach %s" %
+                                (result.source or 'test host',
+                                 'could not' if result.expected else 'could',
+                                 result.destination))
+        if failures:
+            self.fail("Connectivity checks failed: %s" % ", ".join(failures))
+        return matrix
+
     def _create_security_group_nova(self, client=None,
                                     namestart='secgroup-smoke-',
                                     tenant_id=None):
@@ -371,7 +371,7 @@ class TestNetworkCrossTenant(manager.NetworkScenarioTest):
                                                            should_succeed),
                             msg)
         except Exception:
-            debug.log_ip_ns()
+            debug.log_ip_ns(self.id())
             raise
 
     def _test_in_tenant_block(self, tenant):
@@ -392,9 +392,13 @@ class TestNetworkCrossTenant(manager.NetworkScenarioTest):
             **ruleset
         )
         access_point_ssh = self._connect_to_access_point(tenant)
-        for server in tenant.servers:
-            self._check_connectivity(access_point=access_point_ssh,
-                                     ip=self._get_server_ip(server))
+        try:
+            self._assert_connectivity_matrix(
+                [(access_point_ssh, self._get_server_ip(server), True)
+                 for server in tenant.servers])
+        except Exception:
+            debug.log_ip_ns(self.id())
+            raise
         rule.delete()
 
     def _test_cross_tenant_block(self, source_tenant, dest_tenant):
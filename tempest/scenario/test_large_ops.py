@@ -14,6 +14,7 @@
 #    under the License.
 
 from tempest.common.utils import data_utils
+from tempest.common.utils.linux import remote_client
 from tempest import config
 from tempest.openstack.common import log as logging
 from tempest.scenario import manager
@@ -53,6 +54,10 @@ class TestLargeOpsScenario(manager.NetworkScenarioTest):
             self.volume_client.volumes, volume_id, status)
 
     def _image_create(self, name, fmt, path, properties={}):
+        image_id = self._image_create_cached(name, fmt, path,
+                                             properties.get('properties'))
+        if image_id is not None:
+            return image_id
         name = data_utils.rand_name('%s-' % name)
         image_file = open(path, 'rb')
         self.addCleanup(image_file.close)
@@ -89,20 +94,39 @@ class TestLargeOpsScenario(manager.NetworkScenarioTest):
         client = self.compute_client
         flavor_id = CONF.compute.flavor_ref
         secgroup = self._create_security_group_nova()
+        create_kwargs = {}
+        if CONF.compute.run_ssh:
+            self.keypair = self.create_keypair()
+            create_kwargs['key_name'] = self.keypair.name
         self.servers = client.servers.create(
             name=name, image=self.image,
             flavor=flavor_id,
             min_count=CONF.scenario.large_ops_number,
-            security_groups=[secgroup.name])
+            security_groups=[secgroup.name],
+            **create_kwargs)
         # needed because of bug 1199788
         self.servers = [x for x in client.servers.list() if name in x.name]
         for server in self.servers:
             self.set_resource(server.name, server)
         self._wait_for_server_status('ACTIVE')
 
+    def check_servers_ssh(self):
+        """Logs into all servers at once, each within the ssh timeout."""
+        # the servers listed before they were ACTIVE have no address yet
+        servers = [self.compute_client.servers.get(server.id)
+                   for server in self.servers]
+        clients = [self.get_remote_client(server) for server in servers]
+        results = remote_client.fan_out(clients, 'validate_authentication',
+                                        timeout=CONF.compute.ssh_timeout)
+        failures = ['%s: %s' % (result.host, result.error)
+                    for result in results if result.error is not None]
+        self.assertEqual([], failures)
+
     @services('compute', 'image')
     def test_large_ops_scenario(self):
         if CONF.scenario.large_ops_number < 1:
             return
         self.glance_image_create()
         self.nova_boot()
+        if CONF.compute.run_ssh:
+            self.check_servers_ssh()
@@ -17,6 +17,7 @@ import time
 import urllib
 
 from tempest.api.network import common as net_common
+from tempest.common import http_load
 from tempest.common import ssh
 from tempest.common.utils import data_utils
 from tempest import config
@@ -37,9 +38,9 @@ class TestLoadBalancerBasic(manager.NetworkScenarioTest):
     2. SSH to the instance and start two servers
     3. Create a load balancer with two members and with ROUND_ROBIN algorithm
        associate the VIP with a floating ip
-    4. Send 10 requests to the floating ip and check that they are shared
-       between the two servers and that both of them get equal portions
-    of the requests
+    4. Send many concurrent requests to the floating ip and check that they
+       are shared between the two servers and that both of them get equal
+       portions of the requests
     """
 
     @classmethod
@@ -70,6 +71,7 @@ class TestLoadBalancerBasic(manager.NetworkScenarioTest):
         cls.floating_ips = {}
         cls.port1 = 80
         cls.port2 = 88
+        cls.lb_method = 'ROUND_ROBIN'
 
     def _create_security_groups(self):
         self.security_groups[self.tenant_id] =\
@@ -137,13 +139,13 @@ class TestLoadBalancerBasic(manager.NetworkScenarioTest):
                 raise exceptions.TimeoutException(message)
 
     def _create_pool(self):
-        """Create a pool with ROUND_ROBIN algorithm."""
+        """Create a pool with the lb_method algorithm."""
         subnets = self.network_client.list_subnets()
         for subnet in subnets['subnets']:
             if subnet['tenant_id'] == self.tenant_id:
                 self.subnets.append(subnet)
                 pool = super(TestLoadBalancerBasic, self)._create_pool(
-                    'ROUND_ROBIN',
+                    self.lb_method,
                     'HTTP',
                     subnet['id'])
                 self.pools.append(pool)
@@ -199,24 +201,26 @@ class TestLoadBalancerBasic(manager.NetworkScenarioTest):
 
     def _check_load_balancing(self):
         """
-        1. Send 10 requests on the floating ip associated with the VIP
-        2. Check that the requests are shared between
-           the two servers and that both of them get equal portions
-           of the requests
+        1. Send lb_load_requests requests over lb_load_concurrency
+           connections to the floating ip associated with the VIP
+        2. Check that the requests are shared between the two servers
+           as lb_method shares them, and their latency
         """
 
         vip = self.vips[0]
         floating_ip_vip = self.floating_ips[
             vip['id']][0]['floating_ip_address']
         self._check_connection(floating_ip_vip)
-        resp = []
-        for count in range(10):
-            resp.append(
-                urllib.urlopen(
-                    "http://{0}/".format(floating_ip_vip)).read())
-        self.assertEqual(set(["server1\n", "server2\n"]), set(resp))
-        self.assertEqual(5, resp.count("server1\n"))
-        self.assertEqual(5, resp.count("server2\n"))
+        result = http_load.generate_load(
+            "http://{0}/".format(floating_ip_vip),
+            requests=config.scenario.lb_load_requests,
+            concurrency=config.scenario.lb_load_concurrency)
+        self.assertFalse(result.errors, str(result))
+        self.assertEqual([], http_load.distribution_errors(
+            result.responses, ["server1\n", "server2\n"], self.lb_method))
+        max_p95 = config.scenario.lb_load_max_p95
+        if max_p95:
+            self.assertTrue(result.percentile(95) <= max_p95, str(result))
 
     @test.skip_because(bug="1277381")
     @test.attr(type='smoke')
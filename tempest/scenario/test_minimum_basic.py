@@ -48,6 +48,10 @@ class TestMinimumBasicScenario(manager.OfficialClientTest):
             self.volume_client.volumes, volume_id, status)
 
     def _image_create(self, name, fmt, path, properties={}):
+        image_id = self._image_create_cached(name, fmt, path,
+                                             properties.get('properties'))
+        if image_id is not None:
+            return image_id
         name = data_utils.rand_name('%s-' % name)
         image_file = open(path, 'rb')
         self.addCleanup(image_file.close)
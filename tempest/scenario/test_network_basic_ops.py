@@ -181,22 +181,27 @@ class TestNetworkBasicOps(manager.NetworkScenarioTest):
         # key-based authentication by cloud-init.
         ssh_login = CONF.compute.image_ssh_user
         try:
-            for server, key in self.servers.items():
-                for net_name, ip_addresses in server.networks.iteritems():
-                    for ip_address in ip_addresses:
-                        self._check_vm_connectivity(ip_address, ssh_login,
-                                                    key.private_key)
+            addresses = [(ip_address, key)
+                         for (server, key) in self.servers.items()
+                         for ip_addresses in server.networks.itervalues()
+                         for ip_address in ip_addresses]
+            self._assert_connectivity_matrix(
+                [(None, ip_address, True) for (ip_address, _) in addresses])
+            for (ip_address, key) in addresses:
+                linux_client = self.get_remote_client(ip_address, ssh_login,
+                                                      key.private_key)
+                linux_client.validate_authentication()
         except Exception:
             LOG.exception('Tenant connectivity check failed')
             self._log_console_output(servers=self.servers.keys())
-            debug.log_ip_ns()
+            debug.log_ip_ns(self.id())
             raise
 
     def _create_and_associate_floating_ips(self):
         public_network_id = CONF.network.public_network_id
-        for server in self.servers.keys():
-            floating_ip = self._create_floating_ip(server, public_network_id)
-            self.floating_ips[floating_ip] = server
+        servers = self.servers.keys()
+        floating_ips = self._create_floating_ips(servers, public_network_id)
+        self.floating_ips.update(zip(floating_ips, servers))
 
     def _check_public_network_connectivity(self, should_connect=True,
                                            msg=None):
@@ -205,22 +210,23 @@ class TestNetworkBasicOps(manager.NetworkScenarioTest):
         ssh_login = CONF.compute.image_ssh_user
         LOG.debug('checking network connections')
         try:
-            for floating_ip, server in self.floating_ips.iteritems():
-                ip_address = floating_ip.floating_ip_address
-                private_key = None
-                if should_connect:
-                    private_key = self.servers[server].private_key
-                self._check_vm_connectivity(ip_address,
-                                            ssh_login,
-                                            private_key,
-                                            should_connect=should_connect)
+            self._assert_connectivity_matrix(
+                [(None, floating_ip.floating_ip_address, should_connect)
+                 for floating_ip in self.floating_ips])
+            # no need to check ssh for negative connectivity
+            if should_connect:
+                for floating_ip, server in self.floating_ips.iteritems():
+                    linux_client = self.get_remote_client(
+                        floating_ip.floating_ip_address, ssh_login,
+                        self.servers[server].private_key)
+                    linux_client.validate_authentication()
         except Exception:
             ex_msg = 'Public network connectivity check failed'
             if msg:
                 ex_msg += ": " + msg
             LOG.exception(ex_msg)
             self._log_console_output(servers=self.servers.keys())
-            debug.log_ip_ns()
+            debug.log_ip_ns(self.id())
             raise
 
     def _disassociate_floating_ips(self):
@@ -230,12 +236,14 @@ class TestNetworkBasicOps(manager.NetworkScenarioTest):
 
     def _reassociate_floating_ips(self):
         network = self.networks[0]
-        for floating_ip in self.floating_ips.keys():
+        floating_ips = self.floating_ips.keys()
+        servers = []
+        for floating_ip in floating_ips:
             name = data_utils.rand_name('new_server-smoke-')
             # create a new server for the floating ip
-            server = self._create_server(name, network)
-            self._associate_floating_ip(floating_ip, server)
-            self.floating_ips[floating_ip] = server
+            servers.append(self._create_server(name, network))
+        self._associate_floating_ips(floating_ips, servers)
+        self.floating_ips.update(zip(floating_ips, servers))
 
     @test.attr(type='smoke')
     @test.services('compute', 'network')
@@ -16,6 +16,7 @@
 import json
 import urllib
 
+from tempest.api_schema.compute import flavors as schema
 from tempest.common.rest_client import RestClient
 from tempest import config
 
@@ -35,6 +36,7 @@ class FlavorsClientJSON(RestClient):
 
         resp, body = self.get(url)
         body = json.loads(body)
+        self.validate_response(schema.list_flavors, resp, body)
         return resp, body['flavors']
 
     def list_flavors_with_detail(self, params=None):
@@ -44,11 +46,13 @@ class FlavorsClientJSON(RestClient):
 
         resp, body = self.get(url)
         body = json.loads(body)
+        self.validate_response(schema.list_flavors_details, resp, body)
         return resp, body['flavors']
 
     def get_flavor_details(self, flavor_id):
         resp, body = self.get("flavors/%s" % str(flavor_id))
         body = json.loads(body)
+        self.validate_response(schema.get_flavor, resp, body)
         return resp, body['flavor']
 
     def create_flavor(self, name, ram, vcpus, disk, flavor_id, **kwargs):
@@ -72,6 +76,7 @@ class FlavorsClientJSON(RestClient):
         resp, body = self.post('flavors', post_body, self.headers)
 
         body = json.loads(body)
+        self.validate_response(schema.create_flavor, resp, body)
         return resp, body['flavor']
 
     def delete_flavor(self, flavor_id):
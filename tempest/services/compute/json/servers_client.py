@@ -18,6 +18,7 @@ import json
 import time
 import urllib
 
+from tempest.api_schema.compute import servers as schema
 from tempest.common.rest_client import RestClient
 from tempest.common import waiters
 from tempest import config
@@ -81,6 +82,7 @@ class ServersClientJSON(RestClient):
         resp, body = self.post('servers', post_body, self.headers)
 
         body = json.loads(body)
+        self.validate_response(schema.create_server, resp, body)
         # NOTE(maurosr): this deals with the case of multiple server create
         # with return reservation id set True
         if 'reservation_id' in body:
@@ -125,11 +127,14 @@ class ServersClientJSON(RestClient):
         """Returns the details of an existing server."""
         resp, body = self.get("servers/%s" % str(server_id))
         body = json.loads(body)
+        self.validate_response(schema.get_server, resp, body)
         return resp, body['server']
 
     def delete_server(self, server_id):
         """Deletes the given server."""
-        return self.delete("servers/%s" % str(server_id))
+        resp, body = self.delete("servers/%s" % str(server_id))
+        self.validate_response(schema.delete_server, resp, body)
+        return resp, body
 
     def list_servers(self, params=None):
         """Lists all servers for a user."""
@@ -140,6 +145,7 @@ class ServersClientJSON(RestClient):
 
         resp, body = self.get(url)
         body = json.loads(body)
+        self.validate_response(schema.list_servers, resp, body)
         return resp, body
 
     def list_servers_with_detail(self, params=None):
@@ -151,6 +157,7 @@ class ServersClientJSON(RestClient):
 
         resp, body = self.get(url)
         body = json.loads(body)
+        self.validate_response(schema.list_servers_detail, resp, body)
         return resp, body
 
     def wait_for_server_status(self, server_id, status, extra_timeout=0,
@@ -13,10 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import json
+import os
+import threading
 import urllib
 
 import jsonschema
+from jsonschema import validators
 
 from tempest.common import glance_http
 from tempest.common import rest_client
@@ -25,6 +29,11 @@ from tempest import exceptions
 
 CONF = config.CONF
 
+# Compiled schema validators, keyed by (endpoint, schema type). The schemas
+# are fetched at most once per process and endpoint.
+_validators = {}
+_validators_lock = threading.Lock()
+
 
 class ImageClientV2JSON(rest_client.RestClient):
 
@@ -51,15 +60,76 @@ class ImageClientV2JSON(rest_client.RestClient):
         body = json.loads(body)
         return resp, body
 
-    def _validate_schema(self, body, type='image'):
+    def _schema_cache_file(self, type):
+        cache_dir = CONF.image.schema_cache_dir
+        if not cache_dir:
+            return None
+        endpoint = hashlib.sha1(self.base_url).hexdigest()
+        return os.path.join(cache_dir, '%s-%s.json' % (endpoint, type))
+
+    def _load_schema(self, type):
+        """Loads a schema from the on-disk cache or fetches it from glance."""
+        path = self._schema_cache_file(type)
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
         if type == 'image':
             resp, schema = self.get_image_schema()
-        elif type == 'images':
-            resp, schema = self.get_images_schema()
         else:
+            resp, schema = self.get_images_schema()
+        if path is not None:
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError:
+                if not os.path.isdir(os.path.dirname(path)):
+                    raise
+            # NOTE: rename is atomic, so parallel workers never read a
+            # partially written schema
+            tmp_path = '%s.%d' % (path, os.getpid())
+            with open(tmp_path, 'w') as f:
+                json.dump(schema, f)
+            os.rename(tmp_path, path)
+        return schema
+
+    def get_schema_validator(self, type='image'):
+        """Returns a compiled validator for the image or images schema."""
+        if type not in ('image', 'images'):
             raise ValueError("%s is not a valid schema type" % type)
+        key = (self.base_url, type)
+        validator = _validators.get(key)
+        if validator is None:
+            schema = self._load_schema(type)
+            cls = validators.validator_for(schema,
+                                           default=jsonschema.Draft4Validator)
+            cls.check_schema(schema)
+            validator = cls(schema)
+            with _validators_lock:
+                validator = _validators.setdefault(key, validator)
+        return validator
 
-        jsonschema.validate(body, schema)
+    def _validate_schema(self, body, type='image'):
+        validator = self.get_schema_validator(type)
+        if type == 'images' and isinstance(body.get('images'), list):
+            self._validate_image_list(validator, body)
+        else:
+            validator.validate(body)
+
+    def _validate_image_list(self, validator, body):
+        """
+        Validates an image list one image at a time instead of validating
+        the whole document in one pass.
+        """
+        images_schema = validator.schema.get('properties', {}).get('images')
+        item_schema = (images_schema or {}).get('items')
+        if not isinstance(item_schema, dict):
+            validator.validate(body)
+            return
+        envelope = dict(body, images=[])
+        validator.validate(envelope)
+        item_validator = type(validator)(item_schema,
+                                         resolver=validator.resolver)
+        for image in body['images']:
+            item_validator.validate(image)
 
     @property
     def http(self):
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import json
 import re
 import time
@@ -21,6 +22,7 @@ import urllib
 from tempest.common import rest_client
 from tempest import config
 from tempest import exceptions
+from tempest.openstack.common import timeutils
 
 CONF = config.CONF
 
@@ -191,6 +193,71 @@ class OrchestrationClient(rest_client.RestClient):
                 raise exceptions.TimeoutException(message)
             time.sleep(self.build_interval)
 
+    def watch_stack_events(self, stack_identifier):
+        """
+        Returns a StackEventWatcher of the events of a stack after its
+        current ones, to be created before starting an action on the stack
+        and given to wait_for_stack_events().
+        """
+        watcher = StackEventWatcher(self, stack_identifier)
+        watcher.skip()
+        return watcher
+
+    def wait_for_stack_events(self, stack_identifier, status,
+                              failure_pattern='^.*_FAILED$', watcher=None):
+        """
+        Waits for a Stack to reach a given status by following its new
+        events, instead of getting the whole stack every build_interval.
+        The stack is got again when no new event showed up, for Heat
+        versions without stack events and actions completed before.
+
+        Only the events after the marker of watcher are considered, or if
+        it is None the events after those existing when the wait starts,
+        as the earlier ones may be of earlier actions of the stack.
+
+        Returns the StackEventWatcher holding the events of the stack.
+        """
+        start = int(time.time())
+        fail_regexp = re.compile(failure_pattern)
+        resp, body = self.get_stack(stack_identifier)
+        stack_name = body['stack_name']
+        stack_id = body['id']
+        if watcher is None:
+            watcher = self.watch_stack_events(stack_identifier)
+
+        while True:
+            try:
+                events = watcher.poll()
+            except exceptions.NotFound:
+                # the events of deleted stacks may not be listed anymore
+                events = []
+            stack_events = [e for e in events
+                            if e.get('physical_resource_id') == stack_id or
+                            e.get('logical_resource_id') == stack_name]
+            if stack_events:
+                stack_status = stack_events[-1]['resource_status']
+                reason = stack_events[-1]['resource_status_reason']
+            elif not events:
+                resp, body = self.get_stack(stack_identifier)
+                stack_status = body['stack_status']
+                reason = body['stack_status_reason']
+            else:
+                stack_status = None
+            if stack_status == status:
+                return watcher
+            if stack_status and fail_regexp.search(stack_status):
+                raise exceptions.StackBuildErrorException(
+                    stack_identifier=stack_identifier,
+                    stack_status=stack_status,
+                    stack_status_reason=reason)
+
+            if int(time.time()) - start >= self.build_timeout:
+                message = ('Stack %s failed to reach %s status within '
+                           'the required time (%s s).' %
+                           (stack_name, status, self.build_timeout))
+                raise exceptions.TimeoutException(message)
+            time.sleep(self.build_interval)
+
     def show_resource_metadata(self, stack_identifier, resource_name):
         """Returns the resource's metadata."""
         url = ('stacks/{stack_identifier}/resources/{resource_name}'
@@ -199,9 +266,11 @@ class OrchestrationClient(rest_client.RestClient):
         body = json.loads(body)
         return resp, body['metadata']
 
-    def list_events(self, stack_identifier):
+    def list_events(self, stack_identifier, params=None):
         """Returns list of all events for a stack."""
         url = 'stacks/{stack_identifier}/events'.format(**locals())
+        if params:
+            url += '?%s' % urllib.urlencode(params)
         resp, body = self.get(url)
         body = json.loads(body)
         return resp, body['events']
@@ -251,3 +320,63 @@ class OrchestrationClient(rest_client.RestClient):
             'parameters': parameters,
         }
         return self._validate_template(post_body)
+
+
+class StackEventWatcher(object):
+    """
+    Follows the events of a stack, fetching only the events after the
+    last one seen with the marker of the events list.
+    """
+
+    def __init__(self, client, stack_identifier, page_size=100):
+        self.client = client
+        self.stack_identifier = stack_identifier
+        self.page_size = page_size
+        self.events = []
+        self.marker = None
+        # NOTE: older Heat versions ignore the marker and return all events
+        self.seen = set()
+
+    def skip(self):
+        """Moves past the current events of the stack, without keeping them."""
+        self.poll()
+        self.events = []
+
+    def poll(self):
+        """Fetches the events not seen yet and returns them oldest first."""
+        new_events = []
+        while True:
+            params = {'limit': self.page_size, 'sort_dir': 'asc'}
+            if self.marker is not None:
+                params['marker'] = self.marker
+            resp, events = self.client.list_events(self.stack_identifier,
+                                                   params)
+            page = [e for e in events if e['id'] not in self.seen]
+            self.seen.update(e['id'] for e in page)
+            new_events.extend(page)
+            if events:
+                self.marker = events[-1]['id']
+            if len(events) < self.page_size or not page:
+                break
+        self.events.extend(new_events)
+        return new_events
+
+    def durations(self):
+        """
+        Returns a dict mapping the name of every resource, and of the
+        stack, to a dict mapping each of its actions, such as CREATE or
+        DELETE, to the seconds from its IN_PROGRESS event to its COMPLETE
+        or FAILED one.
+        """
+        started = {}
+        durations = collections.defaultdict(dict)
+        for event in self.events:
+            action, _, state = event['resource_status'].partition('_')
+            key = (event['resource_name'], action)
+            event_time = timeutils.parse_isotime(event['event_time'])
+            if state == 'IN_PROGRESS':
+                started[key] = event_time
+            elif key in started:
+                durations[key[0]][action] = timeutils.delta_seconds(
+                    started.pop(key), event_time)
+        return dict(durations)
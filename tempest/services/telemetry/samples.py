@@ -0,0 +1,147 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Analysis of many Ceilometer samples at once, with their timestamps and
+volumes held in NumPy arrays instead of lists of dicts.
+
+NumPy is optional and is not in the requirements: SampleSet raises
+ImportError if it is not installed and the tests using it should skip on
+numpy_available() returning False. Install numpy to run them.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def numpy_available():
+    return numpy is not None
+
+
+def _statistics(volumes, percentiles):
+    stats = {'count': len(volumes),
+             'min': float(volumes.min()),
+             'max': float(volumes.max()),
+             'sum': float(volumes.sum()),
+             'avg': float(volumes.mean())}
+    for percent in percentiles:
+        stats['p%g' % percent] = float(numpy.percentile(volumes, percent))
+    return stats
+
+
+class SampleSet(object):
+    """
+    The samples of a meter, sorted by timestamp.
+
+    :ivar timestamps: datetime64 array of the sample timestamps.
+    :ivar volumes: float array of the sample volumes.
+    :ivar resource_ids: array of the resource ids of the samples.
+    """
+
+    def __init__(self, timestamps, volumes, resource_ids):
+        if numpy is None:
+            raise ImportError("SampleSet requires numpy")
+        timestamps = numpy.asarray(timestamps, dtype='datetime64[us]')
+        order = numpy.argsort(timestamps, kind='mergesort')
+        self.timestamps = timestamps[order]
+        self.volumes = numpy.asarray(volumes, dtype=float)[order]
+        self.resource_ids = numpy.asarray(resource_ids)[order]
+
+    @classmethod
+    def from_samples(cls, samples):
+        """
+        Builds a SampleSet from an iterable of samples as returned by the
+        telemetry client, e.g. its iter_samples() generator.
+        """
+        timestamps = []
+        volumes = []
+        resource_ids = []
+        for sample in samples:
+            # NOTE: numpy parses the ISO 8601 timestamps itself
+            timestamps.append(sample['timestamp'].rstrip('Z'))
+            volumes.append(sample.get('counter_volume', sample.get('volume')))
+            resource_ids.append(sample['resource_id'])
+        return cls(timestamps, volumes, resource_ids)
+
+    def __len__(self):
+        return len(self.volumes)
+
+    @property
+    def seconds(self):
+        """The timestamps as float seconds since the first sample."""
+        if not len(self):
+            return numpy.zeros(0)
+        return (self.timestamps - self.timestamps[0]).astype(float) / 1e6
+
+    def group_by_resource(self):
+        """Returns a dict mapping every resource id to its SampleSet."""
+        groups = {}
+        for resource_id in numpy.unique(self.resource_ids):
+            mask = self.resource_ids == resource_id
+            groups[resource_id] = SampleSet(self.timestamps[mask],
+                                            self.volumes[mask],
+                                            self.resource_ids[mask])
+        return groups
+
+    def statistics(self, percentiles=()):
+        """
+        Returns the count, min, max, sum and avg of the volumes like the
+        Ceilometer statistics API, and a 'pNN' key for every percentile.
+        """
+        return _statistics(self.volumes, percentiles)
+
+    def period_statistics(self, period, percentiles=()):
+        """
+        Returns the statistics of every period seconds starting at the
+        first sample, like the Ceilometer statistics API with a period,
+        with period_start and period_end offsets in seconds.
+        """
+        if not len(self):
+            return []
+        buckets = (self.seconds // period).astype(int)
+        starts = numpy.concatenate(
+            ([0], numpy.flatnonzero(numpy.diff(buckets)) + 1))
+        ends = numpy.append(starts[1:], len(self))
+        result = []
+        for (start, end) in zip(starts, ends):
+            stats = _statistics(self.volumes[start:end], percentiles)
+            stats['period_start'] = buckets[start] * period
+            stats['period_end'] = stats['period_start'] + period
+            result.append(stats)
+        return result
+
+    def rolling(self, window, percentiles=()):
+        """
+        Returns a dict of arrays holding the min, max and avg, and a 'pNN'
+        key for every percentile, of every window consecutive volumes.
+        """
+        count = len(self) - window + 1
+        if count < 1:
+            return dict((key, numpy.zeros(0)) for key in
+                        ['min', 'max', 'avg'] +
+                        ['p%g' % percent for percent in percentiles])
+        stride = self.volumes.strides[0]
+        # a read only view of the windows, the volumes are not copied
+        windows = numpy.lib.stride_tricks.as_strided(
+            self.volumes, shape=(count, window), strides=(stride, stride))
+        result = {'min': windows.min(axis=1),
+                  'max': windows.max(axis=1),
+                  'avg': windows.mean(axis=1)}
+        for percent in percentiles:
+            result['p%g' % percent] = numpy.percentile(windows, percent,
+                                                       axis=1)
+        return result
@@ -87,16 +87,23 @@ class TelemetryClientBase(object):
             body = self.deserialize(body)
         return resp, body
 
-    def helper_list(self, uri, query=None, period=None):
-        uri_dict = {}
+    def helper_list(self, uri, query=None, period=None, limit=None):
+        """
+        :param query: a (field, op, value) tuple, or a list of them
+        """
+        uri_params = []
         if query:
-            uri_dict = {'q.field': query[0],
-                        'q.op': query[1],
-                        'q.value': query[2]}
+            if isinstance(query[0], basestring):
+                query = [query]
+            for (field, op, value) in query:
+                uri_params.extend([('q.field', field), ('q.op', op),
+                                   ('q.value', value)])
         if period:
-            uri_dict['period'] = period
-        if uri_dict:
-            uri += "?%s" % urllib.urlencode(uri_dict)
+            uri_params.append(('period', period))
+        if limit:
+            uri_params.append(('limit', limit))
+        if uri_params:
+            uri += "?%s" % urllib.urlencode(uri_params)
         return self.get(uri)
 
     def list_resources(self):
@@ -119,6 +126,44 @@ class TelemetryClientBase(object):
         uri = '%s/meters/%s' % (self.uri_prefix, meter_id)
         return self.helper_list(uri, query)
 
+    def iter_samples(self, meter_id, query=None, limit=1000):
+        """
+        Yields the samples of a meter, newest first, fetching them limit
+        at a time instead of in a single response.
+
+        Ceilometer has no page markers, so every page is queried for the
+        samples not newer than the oldest of the previous page, skipping
+        those already yielded. A page whose samples all share a timestamp
+        already yielded is queried again with twice the limit.
+        """
+        uri = '%s/meters/%s' % (self.uri_prefix, meter_id)
+        if query and isinstance(query[0], basestring):
+            query = [query]
+        query = list(query or [])
+        upper = None
+        seen = set()
+        page_limit = limit
+        while True:
+            page_query = query
+            if upper is not None:
+                page_query = query + [('timestamp', 'le', upper)]
+            resp, body = self.helper_list(uri, page_query, limit=page_limit)
+            new = [sample for sample in body
+                   if sample['message_id'] not in seen]
+            for sample in new:
+                yield sample
+            if len(body) < page_limit:
+                return
+            if not new:
+                # NOTE: the page is filled with samples of the timestamp
+                # it was queried up to, so it cannot be paged past
+                page_limit *= 2
+                continue
+            page_limit = limit
+            upper = body[-1]['timestamp']
+            seen = set(sample['message_id'] for sample in body
+                       if sample['timestamp'] == upper)
+
     def get_resource(self, resource_id):
         uri = '%s/resources/%s' % (self.uri_prefix, resource_id)
         return self.get(uri)
@@ -11,9 +11,10 @@
 #    limitations under the License.
 
 import socket
-import subprocess
 
+from tempest.common import icmp
 from tempest.common.utils import data_utils
+from tempest.common.utils.linux import remote_client
 from tempest import config
 import tempest.stress.stressaction as stressaction
 import tempest.test
@@ -25,13 +26,7 @@ class FloatingStress(stressaction.StressAction):
 
     # from the scenario manager
     def ping_ip_address(self, ip_address):
-        cmd = ['ping', '-c1', '-w1', ip_address]
-
-        proc = subprocess.Popen(cmd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        proc.wait()
-        success = proc.returncode == 0
+        success = icmp.ping_ip_address(ip_address, timeout=1)
         self.logger.info("%s(%s): %s", self.server_id, self.floating['ip'],
                          "pong!" if success else "no pong :(")
         return success
@@ -57,12 +52,28 @@ class FloatingStress(stressaction.StressAction):
                                             self.check_interval):
             raise RuntimeError("Cannot connect to the ssh port.")
 
+    def check_ssh_auth(self):
+        client = remote_client.RemoteClient(
+            self.floating['ip'], CONF.compute.image_ssh_user,
+            password=CONF.compute.image_ssh_password)
+        # fan_out bounds the check by check_timeout, whatever the ssh
+        # timeouts of the client are
+        [result] = remote_client.fan_out([client], 'validate_authentication',
+                                         timeout=self.check_timeout)
+        if result.error is not None:
+            raise RuntimeError("Cannot log into the machine: %s" %
+                               result.error)
+        self.logger.info("%s(%s): logged in after %.1fs", self.server_id,
+                         self.floating['ip'], result.duration)
+
     def check_icmp_echo(self):
-        def func():
-            return self.ping_ip_address(self.floating['ip'])
-        if not tempest.test.call_until_true(func, self.check_timeout,
-                                            self.check_interval):
+        ip_address = self.floating['ip']
+        elapsed = icmp.wait_for_reachable([ip_address], self.check_timeout,
+                                          self.check_interval)[ip_address]
+        if elapsed is None:
             raise RuntimeError("Cannot ping the machine.")
+        self.logger.info("%s(%s): pong after %.1fs", self.server_id,
+                         ip_address, elapsed)
 
     def _create_vm(self):
         self.name = name = data_utils.rand_name("instance")
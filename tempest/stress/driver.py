@@ -13,7 +13,10 @@
 #    limitations under the License.
 
 import multiprocessing
+from multiprocessing import pool
 import os
+import pipes
+import re
 import signal
 import time
 
@@ -25,6 +28,7 @@ from tempest import exceptions
 from tempest.openstack.common import importutils
 from tempest.openstack.common import log as logging
 from tempest.stress import cleanup
+from tempest.stress import metrics
 
 CONF = config.CONF
 
@@ -61,21 +65,133 @@ def _get_compute_nodes(controller, ssh_user, ssh_key=None):
     return nodes
 
 
-def _has_error_in_logs(logfiles, nodes, ssh_user, ssh_key=None,
-                       stop_on_error=False):
+LOG_MARKER = '#tempest-stress-log#'
+
+
+def load_log_whitelist(path):
     """
-    Detect errors in the nova log files on the controller and compute nodes.
+    Loads a whitelist of known errors in the format of etc/whitelist.yaml
+    (see tools/check_logs.py) and compiles one pattern per entry.
     """
-    grep = 'egrep "ERROR|TRACE" %s' % logfiles
-    ret = False
-    for node in nodes:
-        errors = do_ssh(grep, node, ssh_user, ssh_key)
-        if len(errors) > 0:
-            LOG.error('%s: %s' % (node, errors))
-            ret = True
-            if stop_on_error:
-                break
-    return ret
+    whitelist = {}
+    if not path:
+        return whitelist
+    # NOTE: PyYAML is not a requirement of tempest, it is only needed when
+    # a whitelist is configured, as for tools/check_logs.py
+    import yaml
+    with open(path) as stream:
+        loaded = yaml.safe_load(stream) or {}
+    for (name, entries) in loaded.iteritems():
+        whitelist[name] = [re.compile(".*%s.*%s.*" %
+                                      (w['module'].replace('.', '\\.'),
+                                       w['message']))
+                           for w in entries]
+    return whitelist
+
+
+class LogScanner(object):
+    """
+    Incrementally scans the log files on remote nodes for errors.
+
+    The byte offset reached in every file is remembered per node, so each
+    check only reads the data written since the previous check. All nodes
+    are checked concurrently, with a single remote command per node.
+    """
+
+    def __init__(self, logfiles, nodes, ssh_user, ssh_key=None,
+                 whitelist=None):
+        self.logfiles = logfiles
+        self.nodes = list(nodes)
+        self.whitelist = whitelist or {}
+        self.offsets = dict((node, {}) for node in self.nodes)
+        self.clients = dict((node, ssh.Client(node, ssh_user,
+                                              key_filename=ssh_key))
+                            for node in self.nodes)
+        self.pool = pool.ThreadPool(max(len(self.nodes), 1))
+
+    @staticmethod
+    def log_name(logfile):
+        """Returns the whitelist key of a log file, e.g. 'n-cpu'."""
+        name = os.path.splitext(os.path.basename(logfile))[0]
+        if name.startswith('screen-'):
+            name = name[len('screen-'):]
+        return name
+
+    def _build_command(self, node):
+        cases = ''.join("%s) offset=%d;; " % (pipes.quote(logfile), offset)
+                        for (logfile, offset)
+                        in self.offsets[node].iteritems())
+        return ('for f in %(logfiles)s; do '
+                '[ -f "$f" ] || continue; '
+                'size=$(stat -c %%s "$f"); '
+                'case "$f" in %(cases)s*) offset=0;; esac; '
+                '[ "$size" -lt "$offset" ] && offset=0; '
+                'echo "%(marker)s $size $f"; '
+                'tail -c +$((offset + 1)) "$f" | head -c $((size - offset)) '
+                '| egrep "ERROR|TRACE"; '
+                'done; true' % {'logfiles': self.logfiles,
+                                'cases': cases,
+                                'marker': LOG_MARKER})
+
+    def _classify(self, logfile, lines):
+        patterns = self.whitelist.get(self.log_name(logfile), [])
+        whitelisted = False
+        matches = []
+        for line in lines:
+            # NOTE: TRACE lines belong to the preceding ERROR line
+            if 'ERROR' in line or not matches:
+                whitelisted = any(p.match(line) for p in patterns)
+            matches.append((logfile, line, whitelisted))
+        return matches
+
+    def _parse_output(self, node, output):
+        matches = []
+        logfile = None
+        lines = []
+        for line in output.splitlines():
+            if line.startswith(LOG_MARKER):
+                if logfile is not None:
+                    matches.extend(self._classify(logfile, lines))
+                _, size, logfile = line.split(' ', 2)
+                self.offsets[node][logfile] = int(size)
+                lines = []
+            elif line:
+                lines.append(line)
+        if logfile is not None:
+            matches.extend(self._classify(logfile, lines))
+        return matches
+
+    def _scan_node(self, node):
+        try:
+            output = self.clients[node].exec_command(
+                self._build_command(node))
+        except (exceptions.SSHTimeout,
+                exceptions.SSHExecCommandFailed,
+                exceptions.TimeoutException):
+            LOG.exception('Log check failed on host:%s.' % node)
+            return []
+        return self._parse_output(node, output)
+
+    def has_errors(self):
+        """
+        Returns True if a not whitelisted error was logged on any node
+        since the previous check.
+        """
+        had_errors = False
+        results = self.pool.map(self._scan_node, self.nodes)
+        for (node, matches) in zip(self.nodes, results):
+            for (logfile, line, whitelisted) in matches:
+                if whitelisted:
+                    LOG.info('%s: %s (whitelisted): %s' %
+                             (node, logfile, line))
+                else:
+                    LOG.error('%s: %s: %s' % (node, logfile, line))
+                    had_errors = True
+        return had_errors
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
 
 
 def sigchld_handler(signal, frame):
@@ -156,6 +272,9 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
             shared_statistic = mp_manager.dict()
             shared_statistic['runs'] = 0
             shared_statistic['fails'] = 0
+            shared_statistic['in_flight'] = 0
+            shared_statistic['duration_sum'] = 0.0
+            shared_statistic['latencies'] = []
 
             p = multiprocessing.Process(target=test_run.execute,
                                         args=(shared_statistic,))
@@ -170,6 +289,16 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
     if stop_on_error:
         # NOTE(mkoderer): only the parent should register the handler
         signal.signal(signal.SIGCHLD, sigchld_handler)
+    metrics_server = None
+    if CONF.stress.metrics_port is not None:
+        metrics_server = metrics.MetricsServer(processes,
+                                               CONF.stress.metrics_host,
+                                               CONF.stress.metrics_port)
+        metrics_server.start()
+    if logfiles:
+        whitelist = load_log_whitelist(CONF.stress.target_log_whitelist)
+        log_scanner = LogScanner(logfiles, computes, ssh_user, ssh_key,
+                                 whitelist)
     end_time = time.time() + duration
     had_errors = False
     while True:
@@ -195,12 +324,15 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
 
         if not logfiles:
             continue
-        if _has_error_in_logs(logfiles, computes, ssh_user, ssh_key,
-                              stop_on_error):
+        if log_scanner.has_errors():
             had_errors = True
             break
 
+    if logfiles:
+        log_scanner.close()
     terminate_all_processes()
+    if metrics_server is not None:
+        metrics_server.stop()
 
     sum_fails = 0
     sum_runs = 0
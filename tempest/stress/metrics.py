@@ -0,0 +1,123 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import BaseHTTPServer
+import threading
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.9, 0.99)
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+
+def _quantile(values, q):
+    """Nearest-rank quantile of a sorted list."""
+    index = max(0, int(round(q * len(values))) - 1)
+    return values[min(index, len(values) - 1)]
+
+
+def aggregate(processes):
+    """
+    Sums up the shared statistics of the stress processes per action.
+
+    Each statistic is read with a single copy() so that a scrape costs the
+    workers nothing but one round trip to the multiprocessing manager.
+    """
+    actions = {}
+    for process in processes:
+        stats = process['statistic'].copy()
+        action = actions.setdefault(process['action'],
+                                    {'runs': 0, 'fails': 0, 'in_flight': 0,
+                                     'duration_sum': 0.0, 'latencies': []})
+        action['runs'] += stats.get('runs', 0)
+        action['fails'] += stats.get('fails', 0)
+        action['in_flight'] += stats.get('in_flight', 0)
+        action['duration_sum'] += stats.get('duration_sum', 0.0)
+        action['latencies'].extend(stats.get('latencies', ()))
+    return actions
+
+
+def render(processes):
+    """Returns the statistics in the Prometheus text exposition format."""
+    actions = sorted(aggregate(processes).items())
+    lines = []
+
+    def metric(name, kind, help, values):
+        lines.append('# HELP %s %s' % (name, help))
+        lines.append('# TYPE %s %s' % (name, kind))
+        for (labels, value) in values:
+            lines.append('%s{%s} %s' % (name, labels, repr(float(value))))
+
+    metric('tempest_stress_runs_total', 'counter',
+           'Number of finished runs per action.',
+           [('action="%s"' % a, s['runs']) for (a, s) in actions])
+    metric('tempest_stress_fails_total', 'counter',
+           'Number of failed runs per action.',
+           [('action="%s"' % a, s['fails']) for (a, s) in actions])
+    metric('tempest_stress_in_flight', 'gauge',
+           'Number of runs currently executing per action.',
+           [('action="%s"' % a, s['in_flight']) for (a, s) in actions])
+    lines.append('# HELP tempest_stress_run_duration_seconds Duration of the '
+                 'recent runs per action.')
+    lines.append('# TYPE tempest_stress_run_duration_seconds summary')
+    for (action, stats) in actions:
+        latencies = sorted(stats['latencies'])
+        for q in QUANTILES:
+            if latencies:
+                lines.append('tempest_stress_run_duration_seconds'
+                             '{action="%s",quantile="%s"} %r' %
+                             (action, q, _quantile(latencies, q)))
+        lines.append('tempest_stress_run_duration_seconds_sum'
+                     '{action="%s"} %r' % (action, stats['duration_sum']))
+        lines.append('tempest_stress_run_duration_seconds_count'
+                     '{action="%s"} %r' % (action, float(stats['runs'])))
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsServer(object):
+    """
+    Serves the statistics of the stress processes over HTTP from a
+    background thread of the driver process.
+    """
+
+    def __init__(self, processes, host, port):
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = render(processes)
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                LOG.debug(format, *args)
+
+        self.httpd = BaseHTTPServer.HTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def start(self):
+        self.thread.start()
+        LOG.info("Serving stress metrics on port %d" % self.port)
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -12,11 +12,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import signal
 import sys
+import time
 
 from tempest.openstack.common import log as logging
 
+# Number of recent run durations each process publishes for quantiles
+LATENCY_WINDOW = 100
+
 
 class StressAction(object):
 
@@ -65,17 +70,26 @@ class StressAction(object):
         """
         signal.signal(signal.SIGHUP, self._shutdown_handler)
         signal.signal(signal.SIGTERM, self._shutdown_handler)
+        latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        shared_statistic.setdefault('duration_sum', 0.0)
 
         while self.max_runs is None or (shared_statistic['runs'] <
                                         self.max_runs):
             self.logger.debug("Trigger new run (run %d)" %
                               shared_statistic['runs'])
+            shared_statistic['in_flight'] = 1
+            start_time = time.time()
             try:
                 self.run()
             except Exception:
                 shared_statistic['fails'] += 1
                 self.logger.exception("Failure in run")
             finally:
+                duration = time.time() - start_time
+                latencies.append(duration)
+                shared_statistic['latencies'] = list(latencies)
+                shared_statistic['duration_sum'] += duration
+                shared_statistic['in_flight'] = 0
                 shared_statistic['runs'] += 1
                 if self.stop_on_error and (shared_statistic['fails'] > 1):
                     self.logger.warn("Stop process due to"
@@ -14,12 +14,13 @@
 #    under the License.
 
 import atexit
+import copy
 import functools
+import hashlib
 import json
 import os
 import sys
 import time
-import urllib
 import uuid
 
 import fixtures
@@ -28,6 +29,8 @@ import testresources
 import testtools
 
 from tempest import clients
+from tempest.common import discovery
+from tempest.common import fuzz
 from tempest.common import generate_json
 from tempest.common import isolated_creds
 from tempest import config
@@ -178,6 +181,8 @@ def requires_ext(*args, **kwargs):
 def is_extension_enabled(extension_name, service):
     """A function that will check the list of enabled extensions from config
 
+    A list with the special entry discover checks the extensions the
+    service actually lists, see tempest.common.discovery.
     """
     config_dict = {
         'compute': CONF.compute_feature_enabled.api_extensions,
@@ -188,6 +193,8 @@ def is_extension_enabled(extension_name, service):
     }
     if config_dict[service][0] == 'all':
         return True
+    if config_dict[service][0] == discovery.DISCOVER:
+        return discovery.is_extension_discovered(extension_name, service)
     if extension_name in config_dict[service]:
         return True
     return False
@@ -387,9 +394,18 @@ class BaseTestCase(BaseDeps):
                 'dhcp': dhcp}
 
 
+# Parsed negative test descriptions keyed by file name
+_negative_descriptions = {}
+# Generated payloads keyed by id() of the description they belong to; the
+# description is kept alongside so the id can not be reused
+_negative_payloads = {}
+
+
 class NegativeAutoTest(BaseTestCase):
 
     _resources = {}
+    # Responses of batch runs keyed by test class and description file
+    _batch_results = {}
 
     @classmethod
     def setUpClass(cls):
@@ -401,15 +417,80 @@ class NegativeAutoTest(BaseTestCase):
     def load_schema(file):
         """
         Loads a schema from a file on a specified location.
+        Every file is parsed only once per process. If [negative] cache_dir
+        is set, the description and its generated payloads are also kept
+        on disk, keyed by the hash of the file content. The returned
+        description is shared and must not be modified.
 
         :param file: the file name
         """
+        if file in _negative_descriptions:
+            return _negative_descriptions[file]
         #NOTE(mkoderer): must be extended for xml support
         fn = os.path.join(
             os.path.abspath(os.path.dirname(os.path.dirname(__file__))),
             "etc", "schemas", file)
         LOG.debug("Open schema file: %s" % (fn))
-        return json.load(open(fn))
+        with open(fn) as f:
+            content = f.read()
+        cache_file = NegativeAutoTest._cache_file(content)
+        if cache_file is not None and os.path.exists(cache_file):
+            with open(cache_file) as f:
+                cached = json.load(f)
+            description = cached["description"]
+            payloads = {"valid": cached["valid"],
+                        "invalid": [tuple(i) for i in cached["invalid"]]}
+            _negative_payloads[id(description)] = (description, payloads)
+        else:
+            description = json.loads(content)
+            if cache_file is not None:
+                NegativeAutoTest._write_cache(
+                    cache_file, description,
+                    NegativeAutoTest.get_payloads(description))
+        return _negative_descriptions.setdefault(file, description)
+
+    @staticmethod
+    def _cache_file(content):
+        cache_dir = CONF.negative.cache_dir
+        if not cache_dir:
+            return None
+        digest = hashlib.sha1(content).hexdigest()
+        return os.path.join(cache_dir, "%s.json" % digest)
+
+    @staticmethod
+    def _write_cache(cache_file, description, payloads):
+        try:
+            os.makedirs(os.path.dirname(cache_file))
+        except OSError:
+            if not os.path.isdir(os.path.dirname(cache_file)):
+                raise
+        # NOTE: rename is atomic, so parallel workers never read a
+        # partially written cache file
+        tmp_file = "%s.%d" % (cache_file, os.getpid())
+        with open(tmp_file, "w") as f:
+            json.dump({"description": description,
+                       "valid": payloads["valid"],
+                       "invalid": payloads["invalid"]}, f)
+        os.rename(tmp_file, cache_file)
+
+    @staticmethod
+    def get_payloads(description):
+        """
+        Returns the valid payload and the list of invalid payloads for the
+        json-schema of a description, generating them only once.
+
+        :param description: A description as returned by load_schema
+        """
+        key = id(description)
+        if key not in _negative_payloads:
+            generate_json.validate_negative_test_schema(description)
+            schema = description.get("json-schema", None)
+            payloads = {"valid": None, "invalid": []}
+            if schema is not None:
+                payloads["valid"] = generate_json.generate_valid(schema)
+                payloads["invalid"] = generate_json.generate_invalid(schema)
+            _negative_payloads[key] = (description, payloads)
+        return _negative_payloads[key][1]
 
     @staticmethod
     def generate_scenario(description_file):
@@ -434,8 +515,7 @@ class NegativeAutoTest(BaseTestCase):
         """
         description = NegativeAutoTest.load_schema(description_file)
         LOG.debug(description)
-        generate_json.validate_negative_test_schema(description)
-        schema = description.get("json-schema", None)
+        payloads = NegativeAutoTest.get_payloads(description)
         resources = description.get("resources", [])
         scenario_list = []
         expected_result = None
@@ -449,11 +529,10 @@ class NegativeAutoTest(BaseTestCase):
                                                           str(uuid.uuid4())),
                                              "expected_result": expected_result
                                              }))
-        if schema is not None:
-            for invalid in generate_json.generate_invalid(schema):
-                scenario_list.append((invalid[0],
-                                      {"schema": invalid[1],
-                                       "expected_result": invalid[2]}))
+        for invalid in payloads["invalid"]:
+            scenario_list.append((invalid[0],
+                                  {"schema": invalid[1],
+                                   "expected_result": invalid[2]}))
         LOG.debug(scenario_list)
         return scenario_list
 
@@ -479,10 +558,30 @@ class NegativeAutoTest(BaseTestCase):
                 the data is used to generate query strings appended to the url,
                 otherwise for the body of the http call.
 
+            If [negative] batch_concurrency is set, the first call sends the
+            requests of all scenarios of the test class concurrently and
+            every scenario then checks its own response.
+
         """
         description = NegativeAutoTest.load_schema(description_file)
         LOG.info("Executing %s" % description["name"])
         LOG.debug(description)
+        # NOTE: testscenarios sets the scenarios of the tests it generates
+        # to None, only their class still has them
+        if (CONF.negative.batch_concurrency > 0 and
+                getattr(type(self), "scenarios", None)):
+            result = self._get_batch_result(description_file, description)
+            if isinstance(result, Exception):
+                raise result
+            resp, resp_body = result
+        else:
+            method, url, resources, body = self._request_arguments(
+                description)
+            resp, resp_body = self.client.send_request(method, url,
+                                                       resources, body=body)
+        self._check_negative_response(resp.status, resp_body)
+
+    def _request_arguments(self, description):
         method = description["http-method"]
         url = description["url"]
 
@@ -493,26 +592,45 @@ class NegativeAutoTest(BaseTestCase):
             # Note(mkoderer): The resources list already contains an invalid
             # entry (see get_resource).
             # We just send a valid json-schema with it
-            valid = None
-            schema = description.get("json-schema", None)
-            if schema:
-                valid = generate_json.generate_valid(schema)
+            valid = NegativeAutoTest.get_payloads(description)["valid"]
             new_url, body = self._http_arguments(valid, url, method)
         elif hasattr(self, "schema"):
             new_url, body = self._http_arguments(self.schema, url, method)
+        return method, new_url, resources, body
 
-        resp, resp_body = self.client.send_request(method, new_url,
-                                                   resources, body=body)
-        self._check_negative_response(resp.status, resp_body)
+    def _get_batch_result(self, description_file, description):
+        """
+        Returns the response to the scenario of this test, sending the
+        requests of all scenarios of the class in one batch on first use.
+        """
+        key = (type(self), description_file)
+        if key not in self._batch_results:
+            names = []
+            requests = []
+            for (name, parameters) in type(self).scenarios:
+                # NOTE: the same way testscenarios creates the test of a
+                # scenario, so that overridden get_resource methods apply
+                scenario = copy.copy(self)
+                for attr in ("resource", "schema", "expected_result"):
+                    scenario.__dict__.pop(attr, None)
+                scenario.__dict__.update(parameters)
+                names.append(name)
+                requests.append(scenario._request_arguments(description))
+            LOG.info("Sending %d requests of %s concurrently" %
+                     (len(requests), description["name"]))
+            responses = self.client.send_requests(
+                requests, concurrency=CONF.negative.batch_concurrency)
+            self._batch_results[key] = dict(zip(names, responses))
+        # testscenarios appends the scenario name to the test id
+        for name in self._batch_results[key]:
+            if self.id().endswith("(%s)" % name):
+                return self._batch_results[key][name]
+        method, url, resources, body = self._request_arguments(description)
+        return self.client.send_request(method, url, resources, body=body)
 
     def _http_arguments(self, json_dict, url, method):
         LOG.debug("dict: %s url: %s method: %s" % (json_dict, url, method))
-        if not json_dict:
-            return url, None
-        elif method in ["GET", "HEAD", "PUT", "DELETE"]:
-            return "%s?%s" % (url, urllib.urlencode(json_dict)), None
-        else:
-            return url, json.dumps(json_dict)
+        return fuzz.http_arguments(json_dict, url, method)
 
     def _check_negative_response(self, result, body):
         expected_result = getattr(self, "expected_result", None)
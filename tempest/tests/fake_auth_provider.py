@@ -18,3 +18,6 @@ class FakeAuthProvider(object):
 
     def auth_request(self, method, url, headers=None, body=None, filters=None):
         return url, headers, body
+
+    def get_token(self):
+        return 'fake_token'
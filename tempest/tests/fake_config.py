@@ -18,9 +18,16 @@ class FakeConfig(object):
     class fake_compute(object):
         build_interval = 10
         build_timeout = 10
+        response_validation = 'full'
+        response_validation_sample_rate = 10
 
     class fake_identity(object):
         disable_ssl_certificate_validation = True
 
+    class fake_image(object):
+        catalog_type = 'image'
+        schema_cache_dir = None
+
     compute = fake_compute()
     identity = fake_identity()
+    image = fake_image()
@@ -0,0 +1,107 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import urlparse
+
+import mock
+
+from tempest.common import fuzz
+from tempest.tests import base
+
+
+class FakeClient(object):
+    """Answers 400 naming the first invalid query parameter."""
+
+    def __init__(self):
+        self.requests = []
+
+    def send_requests(self, requests, concurrency=10):
+        self.requests.extend(requests)
+        responses = []
+        for (method, url, resources, body) in requests:
+            query = urlparse.parse_qs(urlparse.urlparse(url).query,
+                                      keep_blank_values=True)
+            invalid = sorted(k for (k, v) in query.iteritems()
+                             if v != ['0'])
+            message = "Invalid value '%s' for %s" % (query[invalid[0]][0],
+                                                     invalid[0])
+            body = json.dumps({"badRequest": {"message": message,
+                                              "code": 400}})
+            responses.append((mock.Mock(status=400), body))
+        return responses
+
+
+class TestFuzz(base.TestCase):
+
+    description = {
+        "name": "list-flavors-with-detail",
+        "http-method": "GET",
+        "url": "flavors/detail",
+        "json-schema": {
+            "type": "object",
+            "properties": {
+                "minRam": {"type": "integer"},
+                "minDisk": {"type": "integer"},
+                "limit": {"type": "integer", "minimum": 0}
+            }
+        }
+    }
+
+    def test_generate_cases(self):
+        schema = self.description["json-schema"]
+        single = list(fuzz.generate_cases(schema, 1))
+        pairs = list(fuzz.generate_cases(schema, 2))
+        # minRam and minDisk get 2 mutations each, limit 3
+        self.assertEqual(7, len(single))
+        self.assertEqual(2 * 2 + 2 * 3 + 2 * 3, len(pairs))
+        for case in pairs:
+            self.assertEqual(2, len(case.mutations))
+            invalid = [k for (k, v) in case.payload.iteritems() if v != 0]
+            self.assertTrue(len(invalid) <= 2)
+        self.assertEqual([], list(fuzz.generate_cases(schema, 4)))
+
+    def test_signature(self):
+        body = json.dumps({"badRequest": {"message": "Invalid minRam '-1'",
+                                          "code": 400}})
+        other = json.dumps({"badRequest": {"message": "Invalid minRam 'x'",
+                                           "code": 400}})
+        resp = mock.Mock(status=400)
+        self.assertEqual((400, "Invalid minRam _"),
+                         fuzz.signature((resp, body)))
+        self.assertEqual(fuzz.signature((resp, body)),
+                         fuzz.signature((resp, other)))
+        self.assertEqual(("exception", "ValueError"),
+                         fuzz.signature(ValueError()))
+
+    def test_run(self):
+        client = FakeClient()
+        fuzzer = fuzz.Fuzzer(client, self.description, strength=2,
+                             batch_size=4)
+        signatures = fuzzer.run()
+        self.assertEqual(7 + 16, fuzzer.sent)
+        self.assertEqual(3, len(signatures))
+        self.assertEqual(3, len(fuzzer.unique_cases()))
+        self.assertEqual(23, sum(len(c) for c in signatures.values()))
+        for case in fuzzer.unique_cases():
+            self.assertEqual(1, len(case.mutations))
+
+    def test_run_is_repeatable(self):
+        first = FakeClient()
+        fuzz.Fuzzer(first, self.description, seed=42).run(max_cases=10)
+        second = FakeClient()
+        fuzz.Fuzzer(second, self.description, seed=42).run(max_cases=10)
+        self.assertEqual(10, len(first.requests))
+        self.assertEqual(first.requests, second.requests)
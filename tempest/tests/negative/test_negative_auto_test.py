@@ -13,7 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+
+import fixtures
 import mock
+import testscenarios
 
 import tempest.test as test
 
@@ -62,3 +66,100 @@ class TestNegativeAutoTest(test.BaseTestCase):
         self._check_prop_entries(scenarios, "prop_minRam")
         self._check_prop_entries(scenarios, "prop_minDisk")
         self._check_resource_entries(scenarios, "inv_res")
+
+
+class TestNegativeAutoTestCache(test.BaseTestCase):
+
+    _schema_file = 'compute/flavors/flavors_list.json'
+
+    def setUp(self):
+        super(TestNegativeAutoTestCache, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.conf = mock.MagicMock()
+        self.conf.negative.cache_dir = self.cache_dir
+        self.useFixture(fixtures.MonkeyPatch('tempest.test.CONF', self.conf))
+        self.useFixture(fixtures.MonkeyPatch(
+            'tempest.test._negative_descriptions', {}))
+        self.useFixture(fixtures.MonkeyPatch(
+            'tempest.test._negative_payloads', {}))
+
+    def test_load_schema_is_cached(self):
+        description = test.NegativeAutoTest.load_schema(self._schema_file)
+        self.assertIs(description,
+                      test.NegativeAutoTest.load_schema(self._schema_file))
+        payloads = test.NegativeAutoTest.get_payloads(description)
+        self.assertIs(payloads,
+                      test.NegativeAutoTest.get_payloads(description))
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_load_schema_from_disk_cache(self):
+        description = test.NegativeAutoTest.load_schema(self._schema_file)
+        scenarios = test.NegativeAutoTest.generate_scenario(self._schema_file)
+        test._negative_descriptions.clear()
+        test._negative_payloads.clear()
+
+        with mock.patch('tempest.common.generate_json.generate_invalid') as g:
+            cached = test.NegativeAutoTest.load_schema(self._schema_file)
+            cached_scenarios = test.NegativeAutoTest.generate_scenario(
+                self._schema_file)
+            self.assertFalse(g.called)
+        self.assertEqual(description, cached)
+        self.assertEqual([s[0] for s in scenarios],
+                         [s[0] for s in cached_scenarios])
+        self.assertEqual([s[1].get('schema') for s in scenarios],
+                         [s[1].get('schema') for s in cached_scenarios])
+
+
+class TestNegativeAutoTestBatch(test.BaseTestCase):
+
+    _schema_file = 'compute/flavors/flavors_list.json'
+
+    class FakeNegativeTest(test.NegativeAutoTest):
+        def test_fake(self):
+            pass
+
+    def setUp(self):
+        super(TestNegativeAutoTestBatch, self).setUp()
+        conf = mock.MagicMock()
+        conf.negative.cache_dir = None
+        conf.negative.batch_concurrency = 4
+        self.useFixture(fixtures.MonkeyPatch('tempest.test.CONF', conf))
+        self.useFixture(fixtures.MonkeyPatch(
+            'tempest.test.NegativeAutoTest._batch_results', {}))
+        cls = self.FakeNegativeTest
+        cls.scenarios = test.NegativeAutoTest.generate_scenario(
+            self._schema_file)
+        cls.client = mock.MagicMock()
+        self.addCleanup(delattr, cls, 'scenarios')
+        self.addCleanup(delattr, cls, 'client')
+
+    def _scenario_tests(self):
+        return list(testscenarios.generate_scenarios(
+            self.FakeNegativeTest('test_fake')))
+
+    def test_execute_batch(self):
+        client = self.FakeNegativeTest.client
+        scenarios = self.FakeNegativeTest.scenarios
+        client.send_requests.return_value = [
+            (mock.Mock(status=400), 'fake') for _ in scenarios]
+        for scenario in self._scenario_tests():
+            scenario.execute(self._schema_file)
+        self.assertEqual(1, client.send_requests.call_count)
+        self.assertFalse(client.send_request.called)
+        requests = client.send_requests.call_args[0][0]
+        self.assertTrue(len(scenarios) > 1)
+        self.assertEqual(len(scenarios), len(requests))
+        urls = set()
+        for (method, url, resources, body) in requests:
+            self.assertEqual('GET', method)
+            self.assertTrue(url.startswith('flavors/detail?'))
+            urls.add(url)
+        self.assertEqual(len(scenarios), len(urls))
+
+    def test_execute_batch_failure(self):
+        client = self.FakeNegativeTest.client
+        scenarios = self.FakeNegativeTest.scenarios
+        client.send_requests.return_value = [
+            (mock.Mock(status=200), 'fake') for _ in scenarios]
+        scenario = self._scenario_tests()[0]
+        self.assertRaises(AssertionError, scenario.execute, self._schema_file)
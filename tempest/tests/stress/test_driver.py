@@ -0,0 +1,68 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+
+from tempest.stress import driver
+from tempest.tests import base
+
+
+class TestLogScanner(base.TestCase):
+
+    def setUp(self):
+        super(TestLogScanner, self).setUp()
+        self.client_mock = self.patch('tempest.common.ssh.Client')
+        whitelist = {'n-cpu': [re.compile('.*nova\\.compute.*Known.*')]}
+        self.scanner = driver.LogScanner('/logs/*.log', ['node1'], 'root',
+                                         whitelist=whitelist)
+        self.addCleanup(self.scanner.close)
+
+    def _set_output(self, output):
+        exec_command = self.client_mock.return_value.exec_command
+        exec_command.return_value = output
+        return exec_command
+
+    def test_log_name(self):
+        self.assertEqual('n-cpu',
+                         driver.LogScanner.log_name('/logs/screen-n-cpu.log'))
+        self.assertEqual('nova', driver.LogScanner.log_name('/logs/nova.log'))
+
+    def test_offsets_are_tracked(self):
+        exec_command = self._set_output(
+            '%s 120 /logs/screen-n-cpu.log\n' % driver.LOG_MARKER)
+        self.assertFalse(self.scanner.has_errors())
+        self.assertEqual({'/logs/screen-n-cpu.log': 120},
+                         self.scanner.offsets['node1'])
+        self.scanner.has_errors()
+        command = exec_command.call_args[0][0]
+        self.assertIn('/logs/screen-n-cpu.log) offset=120;;', command)
+
+    def test_whitelisted_errors(self):
+        self._set_output(
+            '%s 300 /logs/screen-n-cpu.log\n'
+            '2014 ERROR nova.compute.manager [-] Known problem\n'
+            '2014 TRACE nova.compute.manager Traceback\n' % driver.LOG_MARKER)
+        self.assertFalse(self.scanner.has_errors())
+
+    def test_not_whitelisted_errors(self):
+        marker = driver.LOG_MARKER
+        self._set_output(
+            '%s 300 /logs/screen-n-cpu.log\n'
+            '2014 ERROR nova.compute.manager [-] Known problem\n'
+            '%s 80 /logs/screen-n-api.log\n'
+            '2014 ERROR nova.api [-] Known problem\n' % (marker, marker))
+        self.assertTrue(self.scanner.has_errors())
+        self.assertEqual({'/logs/screen-n-cpu.log': 300,
+                          '/logs/screen-n-api.log': 80},
+                         self.scanner.offsets['node1'])
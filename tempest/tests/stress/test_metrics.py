@@ -0,0 +1,61 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import urllib2
+
+from tempest.stress import metrics
+from tempest.tests import base
+
+
+class TestStressMetrics(base.TestCase):
+
+    def setUp(self):
+        super(TestStressMetrics, self).setUp()
+        self.processes = [
+            {'action': 'ServerCreateDestroyTest',
+             'statistic': {'runs': 3, 'fails': 1, 'in_flight': 1,
+                           'duration_sum': 6.0, 'latencies': [1.0, 2.0, 3.0]}},
+            {'action': 'ServerCreateDestroyTest',
+             'statistic': {'runs': 1, 'fails': 0, 'in_flight': 0,
+                           'duration_sum': 4.0, 'latencies': [4.0]}},
+            {'action': 'VolumeCreateDeleteTest',
+             'statistic': {'runs': 0, 'fails': 0, 'in_flight': 1,
+                           'duration_sum': 0.0, 'latencies': []}},
+        ]
+
+    def test_render(self):
+        lines = metrics.render(self.processes).splitlines()
+        server = 'action="ServerCreateDestroyTest"'
+        volume = 'action="VolumeCreateDeleteTest"'
+        self.assertIn('tempest_stress_runs_total{%s} 4.0' % server, lines)
+        self.assertIn('tempest_stress_fails_total{%s} 1.0' % server, lines)
+        self.assertIn('tempest_stress_in_flight{%s} 1.0' % server, lines)
+        self.assertIn('tempest_stress_in_flight{%s} 1.0' % volume, lines)
+        self.assertIn('tempest_stress_run_duration_seconds'
+                      '{%s,quantile="0.5"} 2.0' % server, lines)
+        self.assertIn('tempest_stress_run_duration_seconds'
+                      '{%s,quantile="0.99"} 4.0' % server, lines)
+        self.assertIn('tempest_stress_run_duration_seconds_sum'
+                      '{%s} 10.0' % server, lines)
+        self.assertNotIn('tempest_stress_run_duration_seconds'
+                         '{%s,quantile="0.5"}' % volume, '\n'.join(lines))
+
+    def test_server(self):
+        server = metrics.MetricsServer(self.processes, '127.0.0.1', 0)
+        server.start()
+        self.addCleanup(server.thread.join)
+        self.addCleanup(server.stop)
+        response = urllib2.urlopen('http://127.0.0.1:%d/metrics' %
+                                   server.port)
+        self.assertEqual(metrics.render(self.processes), response.read())
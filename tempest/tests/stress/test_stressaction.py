@@ -61,3 +61,11 @@ class TestStressAction(tempest.test.BaseTestCase):
         stressAction.execute(stats)
         self.assertEqual(stats['runs'], 1)
         self.assertEqual(stats['fails'], 1)
+
+    def testStressTestRunStatistics(self):
+        stressAction = FakeStressAction(manager=None, max_runs=3)
+        stats = self._bulid_stats_dict()
+        stressAction.execute(stats)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertEqual(len(stats['latencies']), 3)
+        self.assertAlmostEqual(stats['duration_sum'], sum(stats['latencies']))
@@ -0,0 +1,73 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from tempest.common import cleanup
+from tempest import exceptions
+from tempest.tests import base
+
+
+class TestCleanupService(base.TestCase):
+
+    def _wait(self, resource_id):
+        if resource_id == 'stuck':
+            raise exceptions.TimeoutException()
+
+    def test_wait_for_deletions(self):
+        step = cleanup.wait_for_deletions(self._wait, ['1', 'stuck', '2'],
+                                          'server')
+        self.assertEqual(['server stuck'], step())
+
+    def test_submit_runs_steps_in_order(self):
+        calls = []
+        service = cleanup.CleanupService()
+        service.submit('Test', lambda: calls.append(1),
+                       lambda: calls.append(2))
+        self.assertEqual([1, 2], calls)
+        self.assertEqual([], service.join())
+
+    def test_submit_raises_in_foreground(self):
+        service = cleanup.CleanupService()
+
+        def fail():
+            raise ValueError('boom')
+        self.assertRaises(ValueError, service.submit, 'Test', fail)
+
+    def test_background(self):
+        service = cleanup.CleanupService(background=True, concurrency=2)
+        release = threading.Event()
+        calls = []
+
+        def wait():
+            release.wait()
+            calls.append('wait')
+            return cleanup.wait_for_deletions(self._wait, ['stuck'],
+                                              'volume')()
+
+        def fail():
+            calls.append('fail')
+            raise ValueError('boom')
+        # submit returns while the first step is still waiting
+        service.submit('First', wait, lambda: calls.append('creds'))
+        service.submit('Second', fail)
+        self.assertNotIn('wait', calls)
+        release.set()
+        leaks = service.join()
+        self.assertEqual(['creds', 'fail', 'wait'], sorted(calls))
+        self.assertTrue(calls.index('wait') < calls.index('creds'))
+        self.assertEqual([('First', 'volume stuck'),
+                          ('Second', 'ValueError: boom')],
+                         sorted(leaks))
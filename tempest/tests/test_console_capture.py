@@ -0,0 +1,65 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gzip
+import StringIO
+
+from tempest.common import console_capture
+from tempest.tests import base
+
+
+class FakeServer(object):
+
+    def __init__(self, server_id, output):
+        self.id = server_id
+        self.output = output
+        self.lengths = []
+
+    def get_console_output(self, length=None):
+        if isinstance(self.output, Exception):
+            raise self.output
+        self.lengths.append(length)
+        return '\n'.join(self.output.splitlines()[-length:])
+
+
+def _decompress(content):
+    data = ''.join(content.iter_bytes())
+    return gzip.GzipFile(fileobj=StringIO.StringIO(data)).read()
+
+
+class TestConsoleCapture(base.TestCase):
+
+    def test_capture_tail(self):
+        server = FakeServer('1', '\n'.join(str(i) for i in range(100)))
+        [(captured, data)] = console_capture.capture([server], lines=2)
+        self.assertIs(server, captured)
+        content = console_capture.as_content(data)
+        self.assertEqual('application/x-gzip', str(content.content_type))
+        self.assertEqual('98\n99', _decompress(content))
+        self.assertEqual([2], server.lengths)
+
+    def test_capture_error(self):
+        server = FakeServer('1', Exception('gone'))
+        [(_, data)] = console_capture.capture([server], lines=2)
+        self.assertEqual('Failed to get the console output: gone',
+                         _decompress(console_capture.as_content(data)))
+
+    def test_capture_in_order(self):
+        servers = [FakeServer(str(i), 'output %d' % i) for i in range(3)]
+        captures = console_capture.capture(servers, lines=10)
+        self.assertEqual(servers, [server for (server, _) in captures])
+        self.assertEqual(['output 0', 'output 1', 'output 2'],
+                         [_decompress(console_capture.as_content(data))
+                          for (_, data) in captures])
@@ -0,0 +1,90 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import fixtures
+
+from tempest.common import debug
+from tempest.tests import base
+
+
+class TestDebug(base.TestCase):
+
+    def setUp(self):
+        super(TestDebug, self).setUp()
+        self.calls = []
+        self.patch('tempest.common.commands.sudo_cmd_call',
+                   side_effect=self._sudo_cmd_call)
+
+    def _sudo_cmd_call(self, cmd):
+        self.calls.append(cmd)
+        if cmd == 'ip netns list':
+            return 'qrouter-1\nqdhcp-2\n'
+        return 'output of %s\n' % cmd
+
+    def test_collect_snapshot(self):
+        snapshot = debug.collect_snapshot(concurrency=4)
+        # ns list, then 5 commands on the host and in every namespace
+        self.assertEqual(16, len(self.calls))
+        self.assertEqual(16, len(snapshot))
+        self.assertEqual(['Host ns list', 'Host Addr', 'Host Route'],
+                         snapshot.keys()[:3])
+        self.assertEqual('output of ip netns exec qdhcp-2 iptables -v -S '
+                         '-t mangle\n', snapshot['ns(qdhcp-2) table(mangle)'])
+
+    def test_write_read_and_diff_snapshots(self):
+        baseline = debug.collect_snapshot(concurrency=4)
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'snapshot.json.gz')
+        debug.write_snapshot(baseline, path)
+        self.assertEqual(baseline, debug.read_snapshot(path))
+        snapshot = debug.read_snapshot(path)
+        snapshot['Host Route'] = 'default via 10.0.0.1\n'
+        snapshot['ns(qrouter-3) Addr'] = 'inet 10.0.0.2\n'
+        diffs = debug.diff_snapshots(baseline, snapshot)
+        self.assertEqual(['Host Route', 'ns(qrouter-3) Addr'], diffs.keys())
+        self.assertIn('+default via 10.0.0.1\n', diffs['Host Route'])
+        self.assertIn('-output of ip r\n', diffs['Host Route'])
+
+    def test_log_ip_ns_snapshot_errors(self):
+        temp_dir = self.useFixture(fixtures.TempDir()).path
+        conf = self.patch('tempest.common.debug.CONF')
+        conf.debug.enable = True
+        # a file where the directory should be and a missing baseline
+        conf.debug.snapshot_dir = os.path.join(temp_dir, 'file')
+        open(conf.debug.snapshot_dir, 'w').close()
+        conf.debug.baseline_snapshot = os.path.join(temp_dir, 'missing')
+        log = self.patch('tempest.common.debug.LOG')
+        debug.log_ip_ns()
+        self.assertEqual(2, log.exception.call_count)
+        # the full snapshot is logged without the baseline
+        self.assertEqual(16, log.info.call_count)
+
+    def test_log_ip_ns_snapshot_names(self):
+        conf = self.patch('tempest.common.debug.CONF')
+        conf.debug.enable = True
+        conf.debug.snapshot_dir = self.useFixture(fixtures.TempDir()).path
+        conf.debug.baseline_snapshot = None
+        self.patch('tempest.common.debug.LOG')
+        test_id = 'tempest.scenario.test_x.TestX.test_y[gate,smoke]'
+        debug.log_ip_ns(test_id)
+        debug.log_ip_ns(test_id)
+        names = os.listdir(conf.debug.snapshot_dir)
+        # both snapshots are kept even when taken in the same second
+        self.assertEqual(2, len(names))
+        for name in names:
+            self.assertTrue(name.startswith(
+                'ip-ns-tempest.scenario.test_x.TestX.test_y_gate_smoke_-'))
@@ -0,0 +1,85 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+
+import fixtures
+import mock
+
+from tempest.common import discovery
+from tempest import test
+from tempest.tests import base
+
+
+class TestExtensionDiscovery(base.TestCase):
+
+    def setUp(self):
+        super(TestExtensionDiscovery, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.conf = mock.MagicMock()
+        self.conf.compute_feature_enabled.api_extensions = ['discover']
+        self.conf.compute_feature_enabled.api_v3 = False
+        self.conf.network_feature_enabled.api_extensions = ['discover']
+        self.conf.volume_feature_enabled.api_extensions = ['all']
+        self.conf.object_storage_feature_enabled.discoverable_apis = [
+            'discover']
+        self.conf.discovery.extensions_cache_file = os.path.join(
+            self.cache_dir, 'extensions.json')
+        self.conf.discovery.extensions_cache_ttl = 3600
+        self.patch('tempest.common.discovery.CONF', new=self.conf)
+        self.patch('tempest.test.CONF', new=self.conf)
+        self.patch('tempest.common.discovery._extensions', new=None)
+        self.manager = self.patch('tempest.clients.Manager').return_value
+        self.manager.extensions_client.list_extensions.return_value = (
+            None, [{'name': 'Hosts', 'alias': 'os-hosts'}])
+        self.manager.network_client.list_extensions.side_effect = (
+            Exception('no network endpoint'))
+        self.manager.account_client.list_extensions.return_value = (
+            None, {'swift': {}, 'tempurl': {}})
+
+    def test_is_extension_enabled(self):
+        self.assertTrue(test.is_extension_enabled('Hosts', 'compute'))
+        self.assertTrue(test.is_extension_enabled('os-hosts', 'compute'))
+        self.assertFalse(test.is_extension_enabled('os-consoles', 'compute'))
+        self.assertTrue(test.is_extension_enabled('tempurl', 'object'))
+        self.assertFalse(test.is_extension_enabled('crossdomain', 'object'))
+        # Failed discovery and services not set to discover enable all
+        self.assertTrue(test.is_extension_enabled('router', 'network'))
+        self.assertTrue(test.is_extension_enabled('anything', 'volume'))
+        self.assertEqual(
+            1, self.manager.extensions_client.list_extensions.call_count)
+        self.assertFalse(
+            self.manager.volumes_extension_client.list_extensions.called)
+
+    def test_cache_file_is_shared(self):
+        discovery.get_extensions()
+        with open(self.conf.discovery.extensions_cache_file) as f:
+            self.assertEqual({'compute': ['Hosts', 'os-hosts'],
+                              'network': None,
+                              'object': ['swift', 'tempurl']},
+                             json.load(f))
+        # Another worker only reads the file
+        self.patch('tempest.common.discovery._extensions', new=None)
+        self.assertFalse(test.is_extension_enabled('os-consoles', 'compute'))
+        self.assertEqual(
+            1, self.manager.extensions_client.list_extensions.call_count)
+
+    def test_expired_cache_file(self):
+        discovery.get_extensions()
+        self.patch('tempest.common.discovery._extensions', new=None)
+        self.conf.discovery.extensions_cache_ttl = -1
+        discovery.get_extensions()
+        self.assertEqual(
+            2, self.manager.extensions_client.list_extensions.call_count)
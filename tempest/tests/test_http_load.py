@@ -0,0 +1,99 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import BaseHTTPServer
+import itertools
+import SocketServer
+import threading
+
+from tempest.common import http_load
+from tempest.tests import base
+
+
+class RoundRobinHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Answers with the members in turn over keep-alive connections."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = next(self.server.members)
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RoundRobinServer(SocketServer.ThreadingMixIn,
+                       BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class TestHttpLoad(base.TestCase):
+
+    def test_generate_load_reuses_connections(self):
+        server = RoundRobinServer(('127.0.0.1', 0), RoundRobinHandler)
+        server.members = itertools.cycle(['server1\n', 'server2\n'])
+        server.lock = threading.Lock()
+        server.connections = set()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+
+        result = http_load.generate_load(
+            'http://127.0.0.1:%d/' % server.server_address[1],
+            requests=100, concurrency=4)
+        self.assertEqual(100, result.requests)
+        self.assertFalse(result.errors)
+        self.assertEqual({200: 100}, dict(result.statuses))
+        self.assertEqual({'server1\n': 50, 'server2\n': 50},
+                         dict(result.responses))
+        self.assertEqual(4, len(server.connections))
+
+    def test_percentile(self):
+        result = http_load.LoadResult()
+        self.assertIsNone(result.percentile(50))
+        for latency in range(1, 101):
+            result.add_response(200, 'server1\n', latency / 100.0)
+        self.assertEqual(0.5, result.percentile(50))
+        self.assertEqual(0.95, result.percentile(95))
+        self.assertEqual(1.0, result.percentile(100))
+
+    def test_distribution_errors(self):
+        members = ['server1\n', 'server2\n']
+        even = {'server1\n': 52, 'server2\n': 48}
+        uneven = {'server1\n': 70, 'server2\n': 30}
+        single = {'server1\n': 100}
+        self.assertEqual([], http_load.distribution_errors(
+            even, members, 'ROUND_ROBIN'))
+        self.assertEqual(2, len(http_load.distribution_errors(
+            uneven, members, 'ROUND_ROBIN')))
+        self.assertEqual([], http_load.distribution_errors(
+            uneven, members, 'LEAST_CONNECTIONS'))
+        self.assertEqual(1, len(http_load.distribution_errors(
+            single, members, 'LEAST_CONNECTIONS')))
+        self.assertEqual([], http_load.distribution_errors(
+            single, members, 'SOURCE_IP'))
+        self.assertEqual(1, len(http_load.distribution_errors(
+            even, members, 'SOURCE_IP')))
+        self.assertEqual(1, len(http_load.distribution_errors(
+            dict(even, error=1), members, 'LEAST_CONNECTIONS')))
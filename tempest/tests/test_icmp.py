@@ -0,0 +1,103 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import errno
+import socket
+import struct
+
+from tempest.common import icmp
+from tempest.tests import base
+
+
+class FakeSocket(object):
+    """Answers the echo requests sent to the reachable addresses."""
+
+    def __init__(self, reachable, raw=False):
+        self.reachable = reachable
+        self.raw = raw
+        self.replies = []
+        self.sent = []
+
+    def sendto(self, packet, destination):
+        address = destination[0]
+        self.sent.append(address)
+        if address not in self.reachable:
+            return
+        reply = struct.pack('!B', icmp.ICMP_ECHO_REPLY) + packet[1:]
+        if self.raw:
+            # A minimal IP header of 5 32-bit words
+            reply = struct.pack('!B', 0x45) + '\0' * 19 + reply
+        self.replies.append((reply, (address, 0)))
+
+    def recvfrom(self, size):
+        return self.replies.pop(0)
+
+    def close(self):
+        pass
+
+
+class TestIcmp(base.TestCase):
+
+    def setUp(self):
+        super(TestIcmp, self).setUp()
+        select = self.patch('select.select')
+        select.side_effect = lambda r, w, x, timeout: (
+            [s for s in r if s.replies], [], [])
+
+    def test_echo_request(self):
+        packet = icmp.echo_request(0x1234, 7)
+        self.assertEqual(0, icmp.checksum(packet))
+        self.assertEqual((icmp.ICMP_ECHO_REQUEST, 0, 0x1234, 7),
+                         struct.unpack('!BBxxHH', packet[:8]))
+        self.assertIsNone(icmp.parse_echo_reply(packet, raw=False))
+
+    def test_wait_for_reachable(self):
+        for raw in (False, True):
+            sock = FakeSocket(['10.0.0.1', '10.0.0.2'], raw=raw)
+            prober = icmp.Prober(sock, raw)
+            results = prober.wait(['10.0.0.1', '10.0.0.2', '10.0.0.3'],
+                                  timeout=0)
+            self.assertIsNotNone(results['10.0.0.1'])
+            self.assertIsNotNone(results['10.0.0.2'])
+            self.assertIsNone(results['10.0.0.3'])
+            self.assertEqual(['10.0.0.1', '10.0.0.2', '10.0.0.3'], sock.sent)
+
+    def test_wait_for_unreachable(self):
+        sock = FakeSocket(['10.0.0.1'])
+        prober = icmp.Prober(sock)
+        results = prober.wait(['10.0.0.1', '10.0.0.2'], reachable=False,
+                              timeout=0, interval=0.01)
+        self.assertIsNone(results['10.0.0.1'])
+        self.assertIsNotNone(results['10.0.0.2'])
+
+    def test_concurrent_raw_probers(self):
+        # raw sockets see the replies to the requests of all the probers
+        first = FakeSocket(['10.0.0.1'], raw=True)
+        second = FakeSocket(['10.0.0.1'], raw=True)
+        second.replies = first.replies
+        icmp.Prober(first, raw=True).send('10.0.0.1')
+        second_prober = icmp.Prober(second, raw=True)
+        second_prober.send('10.0.0.1')
+        # the reply to the first prober is not taken for the second one's
+        first.replies.pop()
+        self.assertEqual({}, second_prober.receive(1))
+
+    def test_get_prober_falls_back_to_ping(self):
+        self.assertIsInstance(icmp.get_prober(['10.0.0.1', 'fd00::1']),
+                              icmp.CommandProber)
+        self.patch('tempest.common.icmp.open_socket',
+                   side_effect=socket.error(errno.EPERM, 'not permitted'))
+        self.assertIsInstance(icmp.get_prober(['10.0.0.1']),
+                              icmp.CommandProber)
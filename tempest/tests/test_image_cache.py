@@ -0,0 +1,153 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import os
+import subprocess
+
+import fixtures
+
+from tempest.common import image_cache
+from tempest.tests import base
+
+
+class FakeImage(object):
+
+    def __init__(self, image_id, data, properties, is_public):
+        self.id = image_id
+        self.checksum = hashlib.md5(data).hexdigest()
+        self.properties = properties
+        self.is_public = is_public
+
+
+class FakeImages(object):
+    """Filters the images on their checksum only, like older Glance."""
+
+    def __init__(self):
+        self.images = {}
+        self.deleted = []
+
+    def list(self, filters):
+        return [i for i in self.images.values()
+                if i.checksum == filters['checksum']]
+
+    def create(self, name, container_format, disk_format, is_public,
+               properties, data):
+        image = FakeImage(str(len(self.images) + 1), data.read(),
+                          properties, is_public)
+        self.images[image.id] = image
+        return image
+
+    def delete(self, image_id):
+        self.deleted.append(image_id)
+        del self.images[image_id]
+
+
+class FakeImageClient(object):
+
+    def __init__(self):
+        self.images = FakeImages()
+
+
+class TestImageCache(base.TestCase):
+
+    def setUp(self):
+        super(TestImageCache, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'image.img')
+        with open(self.path, 'wb') as f:
+            f.write('image data')
+        self.lock_path = self.useFixture(fixtures.TempDir()).path
+        self.client = FakeImageClient()
+        self.cache = image_cache.ImageCache(lock_path=self.lock_path)
+
+    def test_file_checksum_cached_by_mtime(self):
+        expected = hashlib.md5('image data').hexdigest()
+        md5 = self.patch('hashlib.md5', side_effect=hashlib.md5)
+        checksum = image_cache.file_checksum(self.path)
+        self.assertEqual(expected, checksum)
+        self.assertEqual(checksum, image_cache.file_checksum(self.path))
+        self.assertEqual(1, md5.call_count)
+        os.utime(self.path, (0, 0))
+        image_cache.file_checksum(self.path)
+        self.assertEqual(2, md5.call_count)
+
+    def test_get_image_uploads_once(self):
+        first = self.cache.get_image(self.client, 'aki', 'aki', self.path)
+        second = self.cache.get_image(self.client, 'aki', 'aki', self.path)
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(self.client.images.images))
+        # the same data with other properties is another image
+        ami = self.cache.get_image(self.client, 'ami', 'ami', self.path,
+                                   {'kernel_id': first})
+        self.assertNotEqual(first, ami)
+        self.assertEqual(2, self.cache.stats['uploaded'])
+        self.assertEqual(1, self.cache.stats['hits'])
+
+    def test_get_image_reuses_tagged_public_image(self):
+        checksum = image_cache.file_checksum(self.path)
+        tag = image_cache.image_tag(checksum, 'aki', {})
+        images = self.client.images.images
+        images['private'] = FakeImage('private', 'image data',
+                                      {image_cache.TAG_PROPERTY: tag}, False)
+        images['untagged'] = FakeImage('untagged', 'image data', {}, True)
+        images['tagged'] = FakeImage('tagged', 'image data',
+                                     {image_cache.TAG_PROPERTY: tag}, True)
+        self.assertEqual('tagged', self.cache.get_image(self.client, 'aki',
+                                                        'aki', self.path))
+        self.assertEqual(0, self.cache.stats['uploaded'])
+        # images not uploaded during the run are never deleted
+        self.cache.release('tagged')
+        self.cache.delete_all()
+        self.assertEqual([], self.client.images.deleted)
+
+    def test_delete_all_skips_referenced_images(self):
+        aki = self.cache.get_image(self.client, 'aki', 'aki', self.path)
+        ari = self.cache.get_image(self.client, 'ari', 'ari', self.path)
+        self.cache.release(aki)
+        self.cache.delete_all()
+        self.assertEqual([aki], self.client.images.deleted)
+        self.assertIn(ari, self.client.images.images)
+
+    def test_delete_all_skips_images_of_other_workers(self):
+        aki = self.cache.get_image(self.client, 'aki', 'aki', self.path)
+        self.cache.release(aki)
+        # another live worker found the image, a dead one left its marker
+        markers_dir = os.path.join(self.lock_path,
+                                   'tempest-image-cache-users', aki)
+        open(os.path.join(markers_dir, str(os.getppid())), 'w').close()
+        self.cache.delete_all()
+        self.assertEqual([], self.client.images.deleted)
+        self.assertEqual([str(os.getppid()), 'uploaded'],
+                         sorted(os.listdir(markers_dir)))
+        # the last worker deletes the image uploaded by the first one
+        other = image_cache.ImageCache(lock_path=self.lock_path)
+        self.assertEqual(aki, other.get_image(self.client, 'aki', 'aki',
+                                              self.path))
+        other.release(aki)
+        os.remove(os.path.join(markers_dir, str(os.getppid())))
+        dead = subprocess.Popen(['true'])
+        dead.wait()
+        open(os.path.join(markers_dir, str(dead.pid)), 'w').close()
+        other.delete_all()
+        self.assertEqual([aki], self.client.images.deleted)
+        self.assertFalse(os.path.exists(markers_dir))
+
+    def test_delete_all_without_lock_path(self):
+        cache = image_cache.ImageCache()
+        aki = cache.get_image(self.client, 'aki', 'aki', self.path)
+        cache.release(aki)
+        cache.delete_all()
+        self.assertEqual([], self.client.images.deleted)
@@ -0,0 +1,95 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import fixtures
+import jsonschema
+import mock
+
+from tempest import config
+from tempest.services.image.v2.json import image_client
+from tempest.tests import base
+from tempest.tests import fake_auth_provider
+from tempest.tests import fake_config
+
+IMAGE_SCHEMA = {
+    'name': 'image',
+    'properties': {
+        'id': {'type': 'string'},
+        'name': {'type': 'string'},
+    },
+}
+
+IMAGES_SCHEMA = {
+    'name': 'images',
+    'properties': {
+        'images': {'type': 'array', 'items': IMAGE_SCHEMA},
+        'schema': {'type': 'string'},
+    },
+}
+
+
+class TestImageClientV2Schemas(base.TestCase):
+
+    def setUp(self):
+        super(TestImageClientV2Schemas, self).setUp()
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakeConfig)
+        self.patch('tempest.services.image.v2.json.image_client._validators',
+                   new={})
+        self.patch('tempest.services.image.v2.json.image_client.'
+                   'ImageClientV2JSON.base_url',
+                   new_callable=mock.PropertyMock,
+                   return_value='http://glance:9292')
+        self.image_schema = self.patch(
+            'tempest.services.image.v2.json.image_client.'
+            'ImageClientV2JSON.get_image_schema',
+            return_value=(None, IMAGE_SCHEMA))
+        self.images_schema = self.patch(
+            'tempest.services.image.v2.json.image_client.'
+            'ImageClientV2JSON.get_images_schema',
+            return_value=(None, IMAGES_SCHEMA))
+        self.client = image_client.ImageClientV2JSON(
+            fake_auth_provider.FakeAuthProvider())
+
+    def test_schema_fetched_once(self):
+        self.client._validate_schema({'name': 'foo'})
+        self.client._validate_schema({'name': 'bar'})
+        other_client = image_client.ImageClientV2JSON(
+            fake_auth_provider.FakeAuthProvider())
+        other_client._validate_schema({'name': 'baz'})
+        self.image_schema.assert_called_once_with()
+        self.assertRaises(jsonschema.ValidationError,
+                          self.client._validate_schema, {'name': 1})
+
+    def test_schema_persisted(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.stubs.Set(fake_config.FakeConfig.image, 'schema_cache_dir',
+                       cache_dir)
+        self.client.get_schema_validator('image')
+        image_client._validators.clear()
+        self.client.get_schema_validator('image')
+        self.image_schema.assert_called_once_with()
+
+    def test_validate_image_list(self):
+        body = {'images': [{'id': '1', 'name': 'foo'},
+                           {'id': '2', 'name': 'bar'}],
+                'schema': '/v2/schemas/images'}
+        self.client._validate_schema(body, type='images')
+        body['images'].append({'id': 3})
+        self.assertRaises(jsonschema.ValidationError,
+                          self.client._validate_schema, body, type='images')
+        self.images_schema.assert_called_once_with()
+
+    def test_invalid_schema_type(self):
+        self.assertRaises(ValueError, self.client._validate_schema, {},
+                          type='foo')
@@ -0,0 +1,115 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from multiprocessing import pool
+import threading
+
+import mock
+
+from tempest.common.utils.linux import remote_client
+from tempest import exceptions
+from tempest.tests import base
+
+
+class TestFanOut(base.TestCase):
+
+    def setUp(self):
+        super(TestFanOut, self).setUp()
+        # fan_out does not join its pool, the tests do so that no worker
+        # outlives them and runs along the next tests
+        self.pools = []
+        thread_pool = pool.ThreadPool
+
+        def make_pool(*args):
+            self.pools.append(thread_pool(*args))
+            return self.pools[-1]
+
+        self.patch('multiprocessing.pool.ThreadPool', side_effect=make_pool)
+        self.addCleanup(lambda: [p.join() for p in self.pools])
+
+    def _client(self, host):
+        client = mock.MagicMock()
+        client.ssh_client.host = host
+        return client
+
+    def test_fan_out_method_name(self):
+        clients = [self._client('10.0.0.%d' % i) for i in range(5)]
+        for client in clients:
+            client.get_partitions.return_value = client.ssh_client.host
+        results = remote_client.fan_out(clients, 'get_partitions')
+        self.assertEqual(5, len(results))
+        for (client, result) in zip(clients, results):
+            self.assertEqual(client.ssh_client.host, result.host)
+            self.assertEqual(client.ssh_client.host, result.value)
+            self.assertIsNone(result.error)
+            self.assertTrue(result.duration >= 0)
+
+    def test_fan_out_runs_concurrently(self):
+        clients = [self._client('10.0.0.%d' % i) for i in range(4)]
+        # The checks only return in time if all of them run at once
+        lock = threading.Lock()
+        running = []
+        all_running = threading.Event()
+        timed_out = []
+
+        def check(client):
+            with lock:
+                running.append(client)
+                if len(running) == len(clients):
+                    all_running.set()
+            if not all_running.wait(5):
+                timed_out.append(client)
+            return True
+
+        results = remote_client.fan_out(clients, check, timeout=10)
+        self.assertTrue(all(r.value for r in results))
+        self.assertEqual([], timed_out)
+
+    def test_fan_out_errors_and_timeouts(self):
+        stuck = threading.Event()
+        # released before the pool is joined
+        self.addCleanup(stuck.set)
+        clients = [self._client('bad'), self._client('slow')]
+        clients[0].ping_host.side_effect = exceptions.SSHExecCommandFailed(
+            command='ping', exit_status=1, strerror='')
+        clients[1].ping_host.side_effect = lambda host: stuck.wait()
+
+        results = remote_client.fan_out(
+            clients, lambda c: c.ping_host('10.0.0.1'), timeout=0.2)
+        self.assertIsInstance(results[0].error,
+                              exceptions.SSHExecCommandFailed)
+        self.assertIsInstance(results[1].error,
+                              exceptions.TimeoutException)
+
+    def test_fan_out_same_host(self):
+        clients = [self._client('10.0.0.1') for _ in range(3)]
+        results = remote_client.fan_out(clients, lambda c: clients.index(c))
+        self.assertEqual([0, 1, 2], [r.value for r in results])
+
+
+class TestPingHosts(base.TestCase):
+
+    def test_ping_hosts(self):
+        self.patch('tempest.common.utils.linux.remote_client.CONF')
+        self.patch('tempest.common.utils.linux.remote_client.Client')
+        client = remote_client.RemoteClient('10.0.0.9', 'cirros')
+        client.ssh_client.exec_command.return_value = (
+            "10.0.0.2 failed\n10.0.0.1 ok\n")
+        self.assertEqual({'10.0.0.1': True, '10.0.0.2': False,
+                          '10.0.0.3': False},
+                         client.ping_hosts(['10.0.0.1', '10.0.0.2',
+                                            '10.0.0.3']))
+        command = client.ssh_client.exec_command.call_args[0][0]
+        self.assertEqual(1, client.ssh_client.exec_command.call_count)
+        self.assertIn('for host in 10.0.0.1 10.0.0.2 10.0.0.3;', command)
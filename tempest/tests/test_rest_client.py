@@ -15,6 +15,9 @@
 import httplib2
 import json
 
+from tempest.api_schema.compute import flavors
+from tempest.api_schema.compute import images
+from tempest.api_schema.compute import servers
 from tempest.common import rest_client
 from tempest import config
 from tempest import exceptions
@@ -93,6 +96,31 @@ class TestRestClientNotFoundHandling(BaseRestClientTestClass):
                           self.url, {}, {})
 
 
+class TestNegativeRestClientSendRequests(BaseRestClientTestClass):
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestNegativeRestClientSendRequests, self).setUp()
+        self.negative_client = rest_client.NegativeRestClient(
+            fake_auth_provider.FakeAuthProvider())
+        self.useFixture(mockpatch.PatchObject(self.negative_client,
+                                              '_get_region',
+                                              side_effect=self._get_region()))
+        self.useFixture(mockpatch.PatchObject(self.negative_client,
+                                              '_log_response'))
+
+    def test_send_requests(self):
+        requests = [('GET', 'fake/%s', ['1'], None),
+                    ('POST', 'fake/%s', ['2'], '{}'),
+                    ('BOGUS', 'fake/%s', ['3'], None)]
+        results = self.negative_client.send_requests(requests, concurrency=2)
+        self.assertEqual(3, len(results))
+        self.assertEqual('GET', results[0][1]['method'])
+        self.assertEqual('fake/1', results[0][1]['uri'])
+        self.assertEqual('POST', results[1][1]['method'])
+        self.assertIsInstance(results[2], AssertionError)
+        self.assertEqual([], self.negative_client.send_requests([]))
+
+
 class TestRestClientHeadersJSON(TestRestClientHTTPMethods):
     TYPE = "json"
 
@@ -230,3 +258,74 @@ class TestRestClientParseRespJSON(TestRestClientParseRespXML):
         data = {"one_top_key": "not_list_or_dict_value"}
         body = self.rest_client._parse_resp(json.dumps(data))
         self.assertEqual(data, body)
+
+
+class TestRestClientValidateResponse(BaseRestClientTestClass):
+
+    schema = {
+        'status_code': [200],
+        'response_body': {
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'string'}
+            },
+            'required': ['id']
+        }
+    }
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestRestClientValidateResponse, self).setUp()
+        self.resp = httplib2.Response({'status': '200'})
+
+    def test_valid_response(self):
+        self.rest_client.validate_response(self.schema, self.resp,
+                                           {'id': 'fake'})
+
+    def test_invalid_status(self):
+        resp = httplib2.Response({'status': '202'})
+        self.assertRaises(exceptions.InvalidHttpSuccessCode,
+                          self.rest_client.validate_response,
+                          self.schema, resp, {'id': 'fake'})
+
+    def test_invalid_body(self):
+        self.assertRaises(exceptions.InvalidHTTPResponseBody,
+                          self.rest_client.validate_response,
+                          self.schema, self.resp, {'id': 1})
+
+    def test_validator_is_compiled_once(self):
+        body_schema = self.schema['response_body']
+        validator = rest_client.get_response_validator(body_schema)
+        self.assertIs(validator,
+                      rest_client.get_response_validator(body_schema))
+
+    def test_off(self):
+        self.rest_client.response_validation = 'off'
+        self.rest_client.validate_response(self.schema, self.resp, {'id': 1})
+
+    def test_sampled(self):
+        self.stubs.Set(rest_client, '_response_counter', iter(range(6)))
+        self.rest_client.response_validation = 'sampled'
+        self.rest_client.response_validation_sample_rate = 3
+        failures = 0
+        for _ in range(6):
+            try:
+                self.rest_client.validate_response(self.schema, self.resp,
+                                                   {'id': 1})
+            except exceptions.InvalidHTTPResponseBody:
+                failures += 1
+        self.assertEqual(2, failures)
+
+    def test_unknown_mode(self):
+        self.rest_client.response_validation = 'some'
+        self.assertRaises(exceptions.InvalidConfiguration,
+                          self.rest_client.validate_response,
+                          self.schema, self.resp, {'id': 'fake'})
+
+    def test_compute_schemas(self):
+        for module in (flavors, images, servers):
+            for schema in vars(module).values():
+                if isinstance(schema, dict) and 'status_code' in schema:
+                    body_schema = schema.get('response_body')
+                    if body_schema:
+                        rest_client.get_response_validator(body_schema)
@@ -0,0 +1,153 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from tempest.api.network import common as net_common
+from tempest.scenario import manager
+from tempest.tests import base
+
+
+class NotFound(Exception):
+    pass
+
+
+class FakeNetworkClient(object):
+
+    def __init__(self, workers=1, original=None):
+        self.original = original or self
+        if original is None:
+            self.deleted = []
+            self.running = 0
+            self.workers = workers
+            self.all_running = threading.Event()
+            self.lock = threading.Lock()
+            self.timed_out = False
+
+    def delete_network(self, network_id):
+        # the deletions only go on once all workers are deleting at once
+        original = self.original
+        with original.lock:
+            original.running += 1
+            if original.running == original.workers:
+                original.all_running.set()
+        if not original.all_running.wait(10):
+            original.timed_out = True
+        with original.lock:
+            original.deleted.append((self, network_id))
+
+
+class FakeManager(object):
+
+    def __init__(self, network_client):
+        self.network_client = network_client
+
+    def _get_network_client(self):
+        return FakeNetworkClient(original=self.network_client)
+
+
+class FakeApiResource(object):
+
+    def __init__(self, api, resource_id, error=None):
+        self.manager = FakeManager(None)
+        self.manager.api = api
+        self.id = resource_id
+        self.error = error
+
+    def delete(self):
+        self.manager.api.append(self.id)
+        if self.error is not None:
+            raise self.error
+
+
+class TestDeletionWaves(base.TestCase):
+
+    def setUp(self):
+        super(TestDeletionWaves, self).setUp()
+        self.network_client = FakeNetworkClient(workers=3)
+        self.test_class = type('FakeScenarioTest',
+                               (manager.OfficialClientTest,),
+                               {'network_client': self.network_client})
+        self.test_class.manager = FakeManager(self.network_client)
+
+    def _network(self, network_id):
+        return net_common.DeletableNetwork(client=self.network_client,
+                                           id=network_id)
+
+    def test_deletion_waves(self):
+        first, second, third = [self._network(str(i)) for i in range(3)]
+        server = FakeApiResource([], 'server')
+        waves = self.test_class._deletion_waves([first, second, server,
+                                                 third])
+        self.assertEqual([[third], [server], [second, first]], waves)
+
+    def test_delete_wave_clones_network_client(self):
+        networks = [self._network(str(i)) for i in range(6)]
+        self.test_class._delete_wave(networks, concurrency=3)
+        self.assertFalse(self.network_client.timed_out)
+        deleted = self.network_client.deleted
+        self.assertEqual([str(i) for i in range(6)],
+                         sorted(i for (_, i) in deleted))
+        # every worker deleted through a network client of its own
+        self.assertEqual(3, len(set(id(c) for (c, _) in deleted)))
+        for network in networks:
+            self.assertIs(self.network_client, network.client)
+
+    def test_delete_wave_serial_per_client(self):
+        api = []
+        things = [FakeApiResource(api, str(i)) for i in range(3)]
+        things.insert(1, FakeApiResource(api, 'gone', NotFound()))
+        self.test_class._delete_wave(things)
+        self.assertEqual(['0', 'gone', '1', '2'], api)
+
+    def test_delete_wave_raises_after_deleting_others(self):
+        api = []
+        other_api = []
+        things = [FakeApiResource(api, 'broken', ValueError('boom')),
+                  FakeApiResource(api, '1'),
+                  FakeApiResource(other_api, '2')]
+        self.assertRaises(ValueError, self.test_class._delete_wave, things)
+        self.assertEqual(['broken'], api)
+        self.assertEqual(['2'], other_api)
+
+
+class TestMapNetworkCalls(base.TestCase):
+
+    def setUp(self):
+        super(TestMapNetworkCalls, self).setUp()
+        test_class = type('FakeNetworkScenarioTest',
+                          (manager.NetworkScenarioTest,),
+                          {'runTest': lambda self: None})
+        self.test = test_class()
+        self.test.network_client = FakeNetworkClient()
+        self.test.manager = FakeManager(self.test.network_client)
+
+    def test_map_network_calls_order(self):
+        results = self.test._map_network_calls(
+            lambda client, item: item * 2, range(10), concurrency=3)
+        self.assertEqual([i * 2 for i in range(10)], results)
+
+    def test_map_network_calls_registers_results_before_raising(self):
+        def create(client, item):
+            if item == 3:
+                raise ValueError('boom')
+            return item
+
+        registered = []
+        self.assertRaises(ValueError, self.test._map_network_calls,
+                          create, range(6), concurrency=3,
+                          on_result=lambda item, result: registered.append(
+                              result))
+        self.assertEqual([0, 1, 2, 4, 5], registered)
@@ -0,0 +1,81 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import imp
+import os
+
+import fixtures
+import subunit
+from subunit import iso8601
+
+from tempest.tests import base
+
+schedule_tests = imp.load_source('schedule_tests', 'tools/schedule_tests.py')
+
+
+def _time(seconds):
+    return (datetime.datetime(2014, 1, 1, tzinfo=iso8601.UTC) +
+            datetime.timedelta(seconds=seconds))
+
+
+class TestScheduleTests(base.TestCase):
+
+    def _write_stream(self, tests):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'stream')
+        with open(path, 'wb') as f:
+            output = subunit.StreamResultToBytes(f)
+            for (test_id, worker, start, stop) in tests:
+                output.status(test_id=test_id, test_status='inprogress',
+                              test_tags=set([worker]),
+                              timestamp=_time(start))
+                output.status(test_id=test_id, test_status='success',
+                              test_tags=set([worker]),
+                              timestamp=_time(stop))
+        return path
+
+    def test_test_class(self):
+        self.assertEqual('tempest.api.test_a.TestA',
+                         schedule_tests.test_class(
+                             'tempest.api.test_a.TestA.test_b[gate,smoke]'))
+        self.assertEqual('tempest.api.test_a.TestA',
+                         schedule_tests.test_class(
+                             'tempest.api.test_a.TestA.test_b(json)'))
+
+    def test_subunit_costs(self):
+        path = self._write_stream([
+            ('a.A.test_1', 'worker-0', 10, 11),
+            ('a.A.test_2', 'worker-0', 11, 13),
+            # 5 seconds of A teardown and B setup charged to B
+            ('a.B.test_1', 'worker-0', 18, 19),
+            ('a.C.test_1', 'worker-1', 10, 14),
+        ])
+        records = schedule_tests.read_subunit(path)
+        self.assertEqual({'a.A': 3.0, 'a.B': 6.0, 'a.C': 4.0},
+                         schedule_tests.subunit_costs(records))
+        self.assertEqual({'worker-0': 9.0, 'worker-1': 4.0},
+                         schedule_tests.makespans(records))
+
+    def test_partition(self):
+        groups = schedule_tests.group_tests([
+            'a.A.test_1', 'a.A.test_2', 'a.B.test_1', 'a.C.test_1',
+            'a.D.test_1', 'a.E.test_1'])
+        costs = {'a.A': 7.0, 'a.B': 5.0, 'a.C': 4.0, 'a.D': 3.0}
+        partitions = schedule_tests.partition(groups, costs, 2)
+        # E has no history and costs the mean of the others
+        self.assertEqual([(11.0, ['a.A.test_1', 'a.A.test_2', 'a.C.test_1']),
+                          (12.75, ['a.B.test_1', 'a.E.test_1', 'a.D.test_1'])],
+                         partitions)
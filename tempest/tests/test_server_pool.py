@@ -0,0 +1,112 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+
+from tempest.common import server_pool
+from tempest import exceptions
+from tempest.tests import base
+
+
+class FakeServersClient(object):
+    """Keeps the servers in a dict, waiting for a status sets it."""
+
+    user = 'demo'
+    tenant_name = 'demo'
+
+    def __init__(self):
+        self.servers = {}
+        self.created = 0
+        self.rebuilt = []
+
+    def create_server(self, name, image_ref, flavor_ref, **kwargs):
+        self.created += 1
+        server = {'id': str(self.created), 'name': name, 'status': 'BUILD',
+                  'metadata': {}, 'image': image_ref, 'flavor': flavor_ref}
+        self.servers[server['id']] = server
+        return {'status': '202'}, copy.deepcopy(server)
+
+    def wait_for_server_status(self, server_id, status):
+        self.servers[server_id]['status'] = status
+
+    def get_server(self, server_id):
+        if server_id not in self.servers:
+            raise exceptions.NotFound()
+        return {'status': '200'}, copy.deepcopy(self.servers[server_id])
+
+    def rebuild(self, server_id, image_ref, **kwargs):
+        self.rebuilt.append(server_id)
+        self.servers[server_id].update(kwargs, status='REBUILD')
+        return {'status': '202'}, None
+
+    def delete_server(self, server_id):
+        if server_id not in self.servers:
+            raise exceptions.NotFound()
+        del self.servers[server_id]
+        return {'status': '204'}, None
+
+    def wait_for_server_termination(self, server_id):
+        pass
+
+
+class TestServerPool(base.TestCase):
+
+    def setUp(self):
+        super(TestServerPool, self).setUp()
+        self.client = FakeServersClient()
+        self.pool = server_pool.ServerPool(self.client, 2)
+
+    def test_lease_boots_once_and_misses_when_empty(self):
+        first = self.pool.lease('1', 'image')
+        second = self.pool.lease('1', 'image')
+        self.assertEqual(2, self.client.created)
+        self.assertEqual('ACTIVE', first[1]['status'])
+        self.assertNotEqual(first[1]['id'], second[1]['id'])
+        self.assertIsNone(self.pool.lease('1', 'image'))
+        self.pool.lease('2', 'image')
+        self.assertEqual(4, self.client.created)
+        self.assertEqual(3, self.pool.stats['hits'])
+        self.assertEqual(1, self.pool.stats['misses'])
+
+    def test_release_recycles_unchanged_server(self):
+        resp, server = self.pool.lease('1', 'image')
+        self.pool.release(server['id'])
+        self.assertEqual([], self.client.rebuilt)
+        self.assertEqual(1, self.pool.stats['recycled'])
+        self.assertEqual(2, len(self.pool.free[('1', 'image')]))
+
+    def test_release_rebuilds_changed_server(self):
+        resp, server = self.pool.lease('1', 'image')
+        self.client.servers[server['id']]['metadata'] = {'key': 'value'}
+        self.pool.release(server['id'])
+        self.assertEqual([server['id']], self.client.rebuilt)
+        self.assertEqual({}, self.client.servers[server['id']]['metadata'])
+        # The rebuilt server is waited for on its next lease
+        resp, leased = self.pool.lease('1', 'image')
+        self.assertEqual(server['id'], leased['id'])
+        self.assertEqual('ACTIVE', leased['status'])
+
+    def test_release_deleted_server(self):
+        resp, server = self.pool.lease('1', 'image')
+        self.client.delete_server(server['id'])
+        self.pool.release(server['id'])
+        self.assertEqual(1, self.pool.stats['lost'])
+        self.assertEqual(1, len(self.pool.free[('1', 'image')]))
+
+    def test_delete_all(self):
+        self.pool.lease('1', 'image')
+        self.pool.lease('2', 'image')
+        self.pool.delete_all()
+        self.assertEqual({}, self.client.servers)
@@ -13,6 +13,7 @@
 #    under the License.
 
 import contextlib
+import cStringIO
 import socket
 
 import mock
@@ -25,6 +26,10 @@ from tempest.tests import base
 
 class TestSshClient(base.TestCase):
 
+    def setUp(self):
+        super(TestSshClient, self).setUp()
+        self.patch('tempest.common.ssh._connections', new={})
+
     def test_pkey_calls_paramiko_RSAKey(self):
         with contextlib.nested(
             mock.patch('paramiko.RSAKey.from_private_key'),
@@ -200,3 +205,104 @@ class TestSshClient(base.TestCase):
         chan_mock.recv_stderr.assert_called_once_with(1024)
         chan_mock.recv_exit_status.assert_called_once_with()
         closed_prop.assert_called_once_with()
+
+    def test_get_cached_connection(self):
+        gsc_mock = self.patch('tempest.common.ssh.Client._get_ssh_connection')
+        alive_mock = self.patch('tempest.common.ssh._is_alive')
+        first, second = mock.MagicMock(), mock.MagicMock()
+        gsc_mock.side_effect = [first, second]
+        alive_mock.return_value = True
+
+        client = ssh.Client('localhost', 'root', timeout=2)
+        self.assertIs(first, client._get_cached_connection())
+        # Another client for the same host and user shares the connection
+        other = ssh.Client('localhost', 'root', timeout=2)
+        self.assertIs(first, other._get_cached_connection())
+        gsc_mock.assert_called_once_with()
+
+        # A dead connection is closed and replaced
+        alive_mock.return_value = False
+        self.assertIs(second, client._get_cached_connection())
+        first.close.assert_called_once_with()
+
+        client.close()
+        second.close.assert_called_once_with()
+        self.assertEqual({}, ssh._connections)
+
+    def test_connection_auth_reconnects(self):
+        gsc_mock = self.patch('tempest.common.ssh.Client._get_ssh_connection')
+        self.patch('tempest.common.ssh._is_alive', return_value=True)
+        first, second = mock.MagicMock(), mock.MagicMock()
+        gsc_mock.side_effect = [first, second]
+
+        client = ssh.Client('localhost', 'root', timeout=2)
+        self.assertIs(first, client._get_cached_connection())
+        # A live cached connection is not trusted, e.g. after a rebuild
+        client.test_connection_auth()
+        self.assertEqual(2, gsc_mock.call_count)
+        first.close.assert_called_once_with()
+        self.assertIs(second, client._get_cached_connection())
+
+    def test_open_session_timeout(self):
+        self.patch('tempest.common.ssh._is_alive', return_value=True)
+        gsc_mock = self.patch('tempest.common.ssh.Client._get_ssh_connection')
+        transport = gsc_mock.return_value.get_transport.return_value
+        client = ssh.Client('localhost', 'root', channel_timeout=5)
+        client._open_session()
+        transport.open_session.assert_called_once_with(timeout=5.0)
+
+    def test_connection_key(self):
+        client = ssh.Client('localhost', 'root', key_filename='/key')
+        self.assertNotEqual(client._connection_key(),
+                            ssh.Client('localhost', 'admin',
+                                       key_filename='/key')._connection_key())
+        self.assertNotEqual(client._connection_key(),
+                            ssh.Client('localhost', 'root',
+                                       key_filename='/key2')._connection_key())
+        self.assertEqual(client._connection_key(),
+                         ssh.Client('localhost', 'root',
+                                    key_filename='/key')._connection_key())
+
+    def _mock_channel(self, out_chunks, err_chunks=(), exit_status=0):
+        select_mock = self.patch('select.poll')
+        select_mock.return_value.poll.return_value = [1]
+        chan_mock = mock.MagicMock()
+        open_mock = self.patch('tempest.common.ssh.Client._open_session')
+        open_mock.return_value = chan_mock
+        out_chunks = list(out_chunks)
+        err_chunks = list(err_chunks)
+        chan_mock.recv_ready.side_effect = lambda: bool(out_chunks)
+        chan_mock.recv.side_effect = lambda size: out_chunks.pop(0)
+        chan_mock.recv_stderr_ready.side_effect = lambda: bool(err_chunks)
+        chan_mock.recv_stderr.side_effect = lambda size: err_chunks.pop(0)
+        type(chan_mock).closed = mock.PropertyMock(return_value=True)
+        chan_mock.recv_exit_status.return_value = exit_status
+        return chan_mock
+
+    def test_exec_command_stream(self):
+        chan_mock = self._mock_channel(['foo', 'bar'])
+        client = ssh.Client('localhost', 'root', timeout=2)
+        out = cStringIO.StringIO()
+        self.assertIsNone(client.exec_command_stream("test", stdout=out,
+                                                     buf_size=4096))
+        self.assertEqual('foobar', out.getvalue())
+        chan_mock.recv.assert_called_with(4096)
+        chan_mock.close.assert_called_once_with()
+
+    def test_exec_command_stream_until(self):
+        chan_mock = self._mock_channel(['booting...\nlog', 'in: ', 'ignored'])
+        client = ssh.Client('localhost', 'root', timeout=2)
+        chunks = []
+        match = client.exec_command_stream("test", stdout=chunks.append,
+                                           until='login:')
+        self.assertEqual('login:', match.group(0))
+        self.assertEqual(['booting...\nlog', 'in: '], chunks)
+        chan_mock.recv_exit_status.assert_not_called()
+        chan_mock.close.assert_called_once_with()
+
+    def test_exec_command_stream_fails(self):
+        self._mock_channel([], ['no such ', 'file'], exit_status=2)
+        client = ssh.Client('localhost', 'root', timeout=2)
+        with testtools.ExpectedException(exceptions.SSHExecCommandFailed,
+                                         '(?s).*no such file'):
+            client.exec_command_stream("test")
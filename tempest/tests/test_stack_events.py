@@ -0,0 +1,117 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tempest import exceptions
+from tempest.services.orchestration.json import orchestration_client
+from tempest.tests import base
+
+
+def _event(event_id, name, status, second):
+    return {'id': str(event_id), 'resource_name': name,
+            'logical_resource_id': name,
+            'physical_resource_id': 'stack-id' if name == 'stack' else None,
+            'resource_status': status, 'resource_status_reason': 'reason',
+            'event_time': '2014-01-01T00:00:%02dZ' % second}
+
+
+class TestStackEvents(base.TestCase):
+
+    def setUp(self):
+        super(TestStackEvents, self).setUp()
+        self.sleep = self.patch('time.sleep')
+        self.client = orchestration_client.OrchestrationClient.__new__(
+            orchestration_client.OrchestrationClient)
+        self.client.build_interval = 1
+        self.client.build_timeout = 10
+        self.client.list_events = self._list_events
+        self.client.get_stack = self._get_stack
+        self.get_stack_calls = 0
+        self.list_params = []
+        # the events which become visible at each poll
+        self.polls = [
+            [_event(1, 'stack', 'CREATE_IN_PROGRESS', 0),
+             _event(2, 'server', 'CREATE_IN_PROGRESS', 1),
+             _event(3, 'volume', 'CREATE_IN_PROGRESS', 1)],
+            [],
+            [_event(4, 'volume', 'CREATE_COMPLETE', 4),
+             _event(5, 'server', 'CREATE_COMPLETE', 9),
+             _event(6, 'stack', 'CREATE_COMPLETE', 10)],
+        ]
+        self.visible = []
+        self.stack_status = 'CREATE_IN_PROGRESS'
+
+    def _get_stack(self, stack_identifier):
+        self.get_stack_calls += 1
+        return {}, {'stack_name': 'stack', 'id': 'stack-id',
+                    'stack_status': self.stack_status,
+                    'stack_status_reason': ''}
+
+    def _list_events(self, stack_identifier, params):
+        self.list_params.append(params)
+        if 'marker' not in params:
+            self.visible.extend(self.polls.pop(0))
+        elif self.visible[-1]['id'] == params['marker'] and self.polls:
+            self.visible.extend(self.polls.pop(0))
+        ids = [e['id'] for e in self.visible]
+        start = ids.index(params['marker']) + 1 if 'marker' in params else 0
+        return {}, self.visible[start:start + params['limit']]
+
+    def test_wait_for_stack_events(self):
+        # a watcher created along with the stack sees all its events
+        watcher = self.client.wait_for_stack_events(
+            'stack/stack-id', 'CREATE_COMPLETE',
+            watcher=orchestration_client.StackEventWatcher(self.client,
+                                                           'stack/stack-id'))
+        self.assertEqual(6, len(watcher.events))
+        # the stack is only got again when there were no new events
+        self.assertEqual(2, self.get_stack_calls)
+        self.assertEqual(['3', '3'],
+                         [p['marker'] for p in self.list_params[1:]])
+        self.assertEqual({'stack': {'CREATE': 10.0},
+                          'server': {'CREATE': 8.0},
+                          'volume': {'CREATE': 3.0}}, watcher.durations())
+
+    def test_wait_for_stack_events_failed(self):
+        self.polls[2][-1]['resource_status'] = 'CREATE_FAILED'
+        self.assertRaises(exceptions.StackBuildErrorException,
+                          self.client.wait_for_stack_events,
+                          'stack/stack-id', 'CREATE_COMPLETE')
+
+    def test_wait_for_stack_events_after_earlier_actions(self):
+        # the stack failed to create, then its deletion was requested
+        self.polls = [
+            [_event(1, 'stack', 'CREATE_IN_PROGRESS', 0),
+             _event(2, 'stack', 'CREATE_FAILED', 1)],
+            [],
+            [_event(3, 'stack', 'DELETE_IN_PROGRESS', 2),
+             _event(4, 'stack', 'DELETE_COMPLETE', 3)],
+        ]
+        self.stack_status = 'DELETE_IN_PROGRESS'
+        watcher = self.client.wait_for_stack_events('stack/stack-id',
+                                                    'DELETE_COMPLETE')
+        self.assertEqual(['3', '4'], [e['id'] for e in watcher.events])
+
+    def test_wait_for_stack_events_completed_before(self):
+        self.polls = [[_event(1, 'stack', 'CREATE_COMPLETE', 0)], []]
+        self.stack_status = 'CREATE_COMPLETE'
+        self.client.wait_for_stack_events('stack/stack-id', 'CREATE_COMPLETE')
+        self.assertFalse(self.sleep.called)
+
+    def test_watcher_pages(self):
+        watcher = orchestration_client.StackEventWatcher(
+            self.client, 'stack/stack-id', page_size=2)
+        self.assertEqual(['1', '2', '3'], [e['id'] for e in watcher.poll()])
+        self.assertEqual([], watcher.poll())
+        self.assertEqual(['4', '5', '6'], [e['id'] for e in watcher.poll()])
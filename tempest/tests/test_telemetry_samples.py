@@ -0,0 +1,109 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import testtools
+
+from tempest.services.telemetry.json import telemetry_client
+from tempest.services.telemetry import samples
+from tempest.tests import base
+
+
+def _sample(i, resource_id='r1', volume=None):
+    return {'message_id': str(i), 'resource_id': resource_id,
+            'timestamp': '2014-01-01T00:%02d:%02d' % (i // 60, i % 60),
+            'counter_volume': float(i if volume is None else volume)}
+
+
+class TestIterSamples(base.TestCase):
+
+    def setUp(self):
+        super(TestIterSamples, self).setUp()
+        self.client = telemetry_client.TelemetryClientJSON.__new__(
+            telemetry_client.TelemetryClientJSON)
+        self.client.uri_prefix = 'v2'
+        # newest first, with two samples on the page boundary timestamp
+        self.samples = [_sample(i) for i in range(9, -1, -1)]
+        self.samples.insert(3, dict(_sample(7), message_id='7b'))
+        self.queries = []
+        self.limits = []
+        self.patch('tempest.services.telemetry.telemetry_client_base.'
+                   'TelemetryClientBase.helper_list',
+                   side_effect=self._helper_list)
+
+    def _helper_list(self, uri, query, limit):
+        self.queries.append(query)
+        self.limits.append(limit)
+        found = [s for s in self.samples
+                 if all(s['timestamp'] <= value
+                        for (field, op, value) in query
+                        if field == 'timestamp')]
+        return {'status': '200'}, found[:limit]
+
+    def test_iter_samples_pages(self):
+        found = list(self.client.iter_samples('cpu', ('resource_id', 'eq',
+                                                      'r1'), limit=4))
+        self.assertEqual([s['message_id'] for s in self.samples],
+                         [s['message_id'] for s in found])
+        self.assertEqual(('resource_id', 'eq', 'r1'), self.queries[0][0])
+        self.assertEqual(('timestamp', 'le', '2014-01-01T00:00:07'),
+                         self.queries[1][1])
+
+    def test_iter_samples_same_timestamp_page(self):
+        # more samples share a timestamp than fit in a page
+        self.samples = [_sample(9)]
+        self.samples.extend(dict(_sample(5), message_id='5%s' % c)
+                            for c in 'abcde')
+        self.samples.extend([_sample(1), _sample(0)])
+        found = list(self.client.iter_samples('cpu', limit=2))
+        self.assertEqual([s['message_id'] for s in self.samples],
+                         [s['message_id'] for s in found])
+        self.assertEqual([2, 2, 2, 4, 2, 4, 8], self.limits)
+
+
+@testtools.skipUnless(samples.numpy_available(), 'numpy is not installed')
+class TestSampleSet(base.TestCase):
+
+    def setUp(self):
+        super(TestSampleSet, self).setUp()
+        raw = [_sample(i, 'r%d' % (i % 2)) for i in range(10)]
+        # out of order, as returned by the API
+        self.samples = samples.SampleSet.from_samples(reversed(raw))
+
+    def test_from_samples(self):
+        self.assertEqual(10, len(self.samples))
+        self.assertEqual(range(10), list(self.samples.volumes))
+        self.assertEqual(range(10), list(self.samples.seconds))
+
+    def test_group_by_resource(self):
+        groups = self.samples.group_by_resource()
+        self.assertEqual(['r0', 'r1'], sorted(groups))
+        self.assertEqual([1, 3, 5, 7, 9], list(groups['r1'].volumes))
+
+    def test_statistics(self):
+        stats = self.samples.statistics(percentiles=[50])
+        self.assertEqual({'count': 10, 'min': 0.0, 'max': 9.0, 'sum': 45.0,
+                          'avg': 4.5, 'p50': 4.5}, stats)
+        periods = self.samples.period_statistics(4)
+        self.assertEqual([4, 4, 2], [p['count'] for p in periods])
+        self.assertEqual([1.5, 5.5, 8.5], [p['avg'] for p in periods])
+        self.assertEqual([0, 4, 8], [p['period_start'] for p in periods])
+
+    def test_rolling(self):
+        rolling = self.samples.rolling(3, percentiles=[50])
+        self.assertEqual(range(8), list(rolling['min']))
+        self.assertEqual(range(2, 10), list(rolling['max']))
+        self.assertEqual(range(1, 9), list(rolling['avg']))
+        self.assertEqual(range(1, 9), list(rolling['p50']))
+        self.assertEqual(0, len(self.samples.rolling(11)['min']))
@@ -0,0 +1,90 @@
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tempest.common import waiters
+from tempest import exceptions
+from tempest.tests import base
+
+
+class TestWaitForServersStatus(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitForServersStatus, self).setUp()
+        self.patch('tempest.common.waiters.CONF', new=mock.MagicMock())
+        self.sleep = self.patch('time.sleep')
+        self.client = mock.Mock(service='compute', build_interval=1,
+                                build_timeout=10)
+
+    def _servers(self, *statuses):
+        servers = [{'id': str(i), 'status': status}
+                   for (i, status) in enumerate(statuses)]
+        # A server of another test, which is not waited for
+        servers.append({'id': 'other', 'status': 'ERROR'})
+        return None, {'servers': servers}
+
+    def test_wait_for_servers_status(self):
+        self.client.list_servers_with_detail.side_effect = [
+            self._servers('BUILD', 'BUILD'),
+            self._servers('ACTIVE', 'BUILD'),
+            self._servers('ACTIVE', 'ACTIVE'),
+        ]
+        waiters.wait_for_servers_status(self.client, ['0', '1'], 'ACTIVE')
+        self.assertEqual(3, self.client.list_servers_with_detail.call_count)
+        # Two build intervals and the final ready wait
+        self.assertEqual(3, self.sleep.call_count)
+
+    def test_wait_for_servers_status_already_ready(self):
+        self.client.list_servers_with_detail.return_value = self._servers(
+            'ACTIVE', 'ACTIVE')
+        waiters.wait_for_servers_status(self.client, ['0', '1'], 'ACTIVE')
+        # Nothing changed state, so there is no ready wait either
+        self.assertFalse(self.sleep.called)
+
+    def test_wait_for_servers_status_error(self):
+        self.client.list_servers_with_detail.return_value = self._servers(
+            'ACTIVE', 'ERROR')
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_servers_status, self.client,
+                          ['0', '1'], 'ACTIVE')
+
+    def test_wait_for_servers_status_timeout(self):
+        self.client.build_timeout = 0
+        self.client.list_servers_with_detail.return_value = self._servers(
+            'BUILD')
+        self.assertRaises(exceptions.TimeoutException,
+                          waiters.wait_for_servers_status, self.client,
+                          ['0'], 'ACTIVE')
+
+    def test_wait_for_servers_status_later_error(self):
+        self.client.list_servers_with_detail.side_effect = [
+            self._servers('BUILD', 'BUILD'),
+            self._servers('BUILD', 'ERROR'),
+        ]
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_servers_status, self.client,
+                          ['0', '1'], 'ACTIVE')
+        self.assertEqual(2, self.client.list_servers_with_detail.call_count)
+
+    def test_wait_for_servers_status_deleted(self):
+        self.client.list_servers_with_detail.side_effect = [
+            self._servers('BUILD', 'BUILD'),
+            self._servers('BUILD'),
+        ]
+        self.assertRaises(exceptions.NotFound,
+                          waiters.wait_for_servers_status, self.client,
+                          ['0', '1'], 'ACTIVE')
+        self.assertEqual(2, self.client.list_servers_with_detail.call_count)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Partition a list of tests across parallel workers using their historical
+durations. Tests of a class are kept on the same worker so setUpClass runs
+once, and the classes are bin-packed longest processing time first.
+
+The durations come from previous subunit v2 streams, where the time between
+two tests of a worker (setUpClass and tearDownClass included) is charged to
+the class of the second, or else from the testrepository times.dbm. The
+partitions are written as one load list per worker, to be run with e.g.:
+
+  python -m subunit.run discover -t ./ ./tempest/test_discover \\
+      --load-list worker-0.txt
+
+Given the subunit stream of the partitioned run, the predicted and actual
+makespans are reported.
+"""
+
+import anydbm
+import argparse
+import collections
+import heapq
+import os
+import re
+import sys
+
+import subunit
+import testtools
+
+# Attributes and scenario names appended to the test ids
+TEST_ID_SUFFIX = re.compile(r"(\[[^\]]*\]|\([^)]*\))$")
+
+
+def test_class(test_id):
+    """Returns the class part of a test id, like testr's group_regex."""
+    return TEST_ID_SUFFIX.sub("", test_id).rsplit(".", 1)[0]
+
+
+def read_subunit(path):
+    """
+    Returns the (test id, worker, start, stop) tuple of every timed test
+    of a subunit v2 stream.
+    """
+    records = []
+
+    def on_test(test):
+        start, stop = test['timestamps']
+        if test['status'] in (None, 'exists') or start is None or stop is None:
+            return
+        workers = [t for t in test['tags'] if t.startswith('worker-')]
+        records.append((test['id'], workers[0] if workers else None,
+                        start, stop))
+
+    with open(path, 'rb') as f:
+        stream = subunit.ByteStreamToStreamResult(f, non_subunit_name='stdout')
+        result = testtools.StreamToDict(on_test)
+        result.startTestRun()
+        try:
+            stream.run(result)
+        finally:
+            result.stopTestRun()
+    return records
+
+
+def _seconds(delta):
+    return delta.days * 86400 + delta.seconds + delta.microseconds / 1e6
+
+
+def subunit_costs(records):
+    """
+    Returns the cost in seconds of every test class, charging each test
+    with the time since the previous test of its worker stopped.
+    """
+    costs = collections.defaultdict(float)
+    by_worker = collections.defaultdict(list)
+    for (test_id, worker, start, stop) in records:
+        by_worker[worker].append((start, stop, test_id))
+    for tests in by_worker.values():
+        tests.sort()
+        previous_stop = None
+        for (start, stop, test_id) in tests:
+            since = start if previous_stop is None else previous_stop
+            costs[test_class(test_id)] += _seconds(stop - since)
+            previous_stop = stop
+    return dict(costs)
+
+
+def times_db_costs(path):
+    """Returns the cost of every test class from a testr times.dbm."""
+    costs = collections.defaultdict(float)
+    db = anydbm.open(path, 'r')
+    try:
+        for test_id in db.keys():
+            costs[test_class(test_id)] += float(db[test_id])
+    finally:
+        db.close()
+    return dict(costs)
+
+
+def group_tests(test_ids):
+    """Returns an ordered dict mapping every class to its test ids."""
+    groups = collections.OrderedDict()
+    for test_id in test_ids:
+        groups.setdefault(test_class(test_id), []).append(test_id)
+    return groups
+
+
+def partition(groups, costs, workers):
+    """
+    Assigns the classes of groups to workers longest processing time
+    first. Classes without history cost the mean of the known ones.
+    Returns the list of (load, test ids) of every worker.
+    """
+    known = [costs[c] for c in groups if c in costs]
+    default = sum(known) / len(known) if known else 1.0
+    classes = sorted(groups, key=lambda c: (-costs.get(c, default), c))
+    # (load, worker index) of the least loaded worker first
+    heap = [(0.0, i) for i in range(workers)]
+    tests = [[] for i in range(workers)]
+    loads = [0.0] * workers
+    for test_class_name in classes:
+        load, i = heapq.heappop(heap)
+        loads[i] = load + costs.get(test_class_name, default)
+        tests[i].extend(groups[test_class_name])
+        heapq.heappush(heap, (loads[i], i))
+    return zip(loads, tests)
+
+
+def makespans(records):
+    """Returns the wall time in seconds of every worker of a run."""
+    spans = {}
+    for (test_id, worker, start, stop) in records:
+        first, last = spans.get(worker, (start, stop))
+        spans[worker] = (min(first, start), max(last, stop))
+    return dict((w, _seconds(last - first))
+                for (w, (first, last)) in spans.items())
+
+
+def main(opts):
+    if opts.actual:
+        predicted = []
+        for path in sorted(os.listdir(opts.output_dir)):
+            with open(os.path.join(opts.output_dir, path)) as f:
+                predicted.append((path, float(f.readline()[1:])))
+        actual = {}
+        for path in opts.actual:
+            # NOTE: the streams of separately run partitions have no
+            # worker tags
+            for (worker, span) in makespans(read_subunit(path)).items():
+                actual[worker or path] = span
+        print("predicted makespan: %8.1fs" % max(p for (_, p) in predicted))
+        print("actual makespan:    %8.1fs" % max(actual.values()))
+        for (path, load) in predicted:
+            print("  %s: predicted %8.1fs" % (path, load))
+        for (worker, span) in sorted(actual.items()):
+            print("  %s: actual    %8.1fs" % (worker, span))
+        return 0
+
+    if opts.subunit:
+        records = []
+        for path in opts.subunit:
+            records.extend(read_subunit(path))
+        costs = subunit_costs(records)
+    elif os.path.exists(opts.times):
+        costs = times_db_costs(opts.times)
+    else:
+        print("No timing history found, classes get equal weights")
+        costs = {}
+
+    test_ids = [l.strip() for l in open(opts.test_list) if l.strip()]
+    partitions = partition(group_tests(test_ids), costs, opts.workers)
+    if not os.path.isdir(opts.output_dir):
+        os.makedirs(opts.output_dir)
+    for (i, (load, tests)) in enumerate(partitions):
+        path = os.path.join(opts.output_dir, 'worker-%d.txt' % i)
+        with open(path, 'w') as f:
+            # NOTE: --load-list ignores the lines which are not test ids
+            f.write("#%f\n" % load)
+            f.write("".join("%s\n" % t for t in tests))
+        print("%s: %d tests, predicted %.1fs" % (path, len(tests), load))
+    print("predicted makespan: %.1fs" % max(p for (p, _) in partitions))
+    return 0
+
+
+parser = argparse.ArgumentParser(
+    description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('-l', '--test-list', default='/dev/stdin',
+                    help="File listing the test ids to partition, as "
+                         "printed by testr list-tests")
+parser.add_argument('-w', '--workers', type=int, default=4,
+                    help="Number of workers")
+parser.add_argument('-s', '--subunit', action='append',
+                    help="Subunit v2 stream of a previous run, may be "
+                         "repeated")
+parser.add_argument('-t', '--times', default='.testrepository/times.dbm',
+                    help="testrepository timing database, used when no "
+                         "subunit stream is given")
+parser.add_argument('-o', '--output-dir', default='partitions',
+                    help="Directory to write the load list of every "
+                         "worker to")
+parser.add_argument('-a', '--actual', action='append',
+                    help="Subunit v2 stream of the partitioned run, or of "
+                         "one of its workers if repeated, to compare its "
+                         "makespan with the prediction read from the "
+                         "output directory")
+
+if __name__ == "__main__":
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+# Copyright 2014 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measure how many commands per second tempest.common.ssh.Client runs against
+a local paramiko test server, with and without connection reuse.
+"""
+
+import argparse
+import socket
+import sys
+import threading
+import time
+
+import paramiko
+
+from tempest.common import ssh
+
+USER = 'tempest'
+PASSWORD = 'secret'
+
+
+class EchoServer(paramiko.ServerInterface):
+    """Accepts password auth and answers every exec request with 'ok'."""
+
+    def check_auth_password(self, username, password):
+        if (username, password) == (USER, PASSWORD):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(target=self._reply, args=(channel,)).start()
+        return True
+
+    @staticmethod
+    def _reply(channel):
+        # NOTE: the client only sends EOF once the exec request was
+        # acknowledged, so closing the channel before that would race.
+        while channel.recv(1024):
+            pass
+        channel.sendall('ok\n')
+        channel.send_exit_status(0)
+        channel.close()
+
+
+def serve(listener, host_key):
+    while True:
+        try:
+            sock, _ = listener.accept()
+        except socket.error:
+            return
+        transport = paramiko.Transport(sock)
+        transport.add_server_key(host_key)
+        transport.start_server(server=EchoServer())
+
+
+def start_server():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(100)
+    host_key = paramiko.RSAKey.generate(1024)
+    thread = threading.Thread(target=serve, args=(listener, host_key))
+    thread.daemon = True
+    thread.start()
+    return listener
+
+
+def run(client, commands, reuse):
+    start = time.time()
+    for _ in xrange(commands):
+        client.exec_command('true')
+        if not reuse:
+            client.close()
+    return commands / (time.time() - start)
+
+
+def main(opts):
+    listener = start_server()
+    host, port = listener.getsockname()
+    # NOTE: paramiko.SSHClient.connect() accepts "host:port" only through
+    # the port argument, which Client does not expose, so patch it in.
+    connect = paramiko.SSHClient.connect
+
+    def connect_with_port(self, hostname, **kwargs):
+        return connect(self, hostname, port=port, **kwargs)
+
+    paramiko.SSHClient.connect = connect_with_port
+    client = ssh.Client(host, USER, password=PASSWORD)
+    try:
+        fresh = run(client, opts.commands, reuse=False)
+        cached = run(client, opts.commands, reuse=True)
+    finally:
+        ssh.close_all()
+        listener.close()
+    print("new connection per command: %8.1f commands/s" % fresh)
+    print("cached connection:          %8.1f commands/s" % cached)
+    print("speedup:                    %8.1fx" % (cached / fresh))
+    return 0
+
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('-n', '--commands', type=int, default=200,
+                    help="Number of commands to run in each mode")
+
+if __name__ == "__main__":
+    sys.exit(main(parser.parse_args()))
@@ -96,7 +96,7 @@ def verify_extensions(os, service, results):
     if not results.get(service):
         results[service] = {}
     extensions_opt = get_enabled_extensions(service)
-    if extensions_opt[0] == 'all':
+    if extensions_opt[0] in ('all', 'discover'):
         results[service]['extensions'] = 'all'
         return results
     # Verify that all configured extensions are actually enabled